@@ -0,0 +1,49 @@
+"""add symptom_logs.search_vector for full-text search
+
+Revision ID: a7c4e9b1d5f2
+Revises: f3a8d1c6b2e4
+Create Date: 2026-10-18 13:02:44.910356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e9b1d5f2'
+down_revision: Union[str, None] = 'f3a8d1c6b2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A stored generated column is computed for every existing row, so this
+    # rewrites symptom_logs under an exclusive lock; run it off-peak.
+    op.add_column(
+        'symptom_logs',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(notes, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_symptom_logs_search',
+            'symptom_logs',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_symptom_logs_search', table_name='symptom_logs', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('symptom_logs', 'search_vector')
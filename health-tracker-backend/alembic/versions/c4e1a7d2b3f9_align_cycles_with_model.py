@@ -0,0 +1,47 @@
+"""align cycles with model
+
+Revision ID: c4e1a7d2b3f9
+Revises: 9b09b761ae7c
+Create Date: 2026-10-18 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7d2b3f9'
+down_revision: Union[str, None] = '9b09b761ae7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _cycle_columns() -> set:
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns('cycles')}
+
+
+def upgrade() -> None:
+    # The app used to run create_all() on import, so databases created that
+    # way already have the model's columns. Only migrate the initial layout.
+    columns = _cycle_columns()
+    if 'cycle_start_date' not in columns:
+        return
+
+    op.alter_column('cycles', 'cycle_start_date', new_column_name='last_period_date')
+    op.drop_column('cycles', 'cycle_end_date')
+    op.add_column('cycles', sa.Column('cycle_length', sa.Integer(), nullable=False, server_default='28'))
+    op.add_column('cycles', sa.Column('period_length', sa.Integer(), nullable=False, server_default='5'))
+    op.alter_column('cycles', 'cycle_length', server_default=None)
+    op.alter_column('cycles', 'period_length', server_default=None)
+    op.execute('DELETE FROM cycles WHERE user_id IS NULL')
+    op.alter_column('cycles', 'user_id', existing_type=sa.UUID(), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('cycles', 'user_id', existing_type=sa.UUID(), nullable=True)
+    op.drop_column('cycles', 'period_length')
+    op.drop_column('cycles', 'cycle_length')
+    op.add_column('cycles', sa.Column('cycle_end_date', sa.Date(), nullable=True))
+    op.alter_column('cycles', 'last_period_date', new_column_name='cycle_start_date')
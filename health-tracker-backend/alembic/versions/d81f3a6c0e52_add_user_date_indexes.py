@@ -0,0 +1,46 @@
+"""add user/date composite indexes
+
+Revision ID: d81f3a6c0e52
+Revises: c4e1a7d2b3f9
+Create Date: 2026-10-18 11:41:09.532877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f3a6c0e52'
+down_revision: Union[str, None] = 'c4e1a7d2b3f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# symptom_logs(user_id, log_date) is already served by unique_user_log_date
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build; it
+    # cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cycles_user_last_period',
+            'cycles',
+            ['user_id', sa.text('last_period_date DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_ai_insights_user_created',
+            'ai_insights',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_ai_insights_user_created', table_name='ai_insights', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_cycles_user_last_period', table_name='cycles', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,75 @@
+"""add user_cycle_stats read model
+
+Revision ID: e5b2c9f47a18
+Revises: d81f3a6c0e52
+Create Date: 2026-10-18 12:06:52.104388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2c9f47a18'
+down_revision: Union[str, None] = 'd81f3a6c0e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_cycle_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('cycle_count', sa.Integer(), nullable=False),
+        sa.Column('length_sum', sa.Integer(), nullable=False),
+        sa.Column('length_sum_sq', sa.Integer(), nullable=False),
+        sa.Column('min_length', sa.Integer(), nullable=True),
+        sa.Column('max_length', sa.Integer(), nullable=True),
+        sa.Column('skipped_count', sa.Integer(), nullable=False),
+        sa.Column('last_period_date', sa.Date(), nullable=True),
+        sa.Column('next_predicted_date', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    # Backfill over each user's latest six cycles, matching
+    # crud_cycle_stats.refresh_cycle_stats; check_cycle_stats.py verifies it.
+    op.execute(
+        """
+        INSERT INTO user_cycle_stats (
+            user_id, cycle_count, length_sum, length_sum_sq, min_length,
+            max_length, skipped_count, last_period_date, next_predicted_date
+        )
+        SELECT
+            user_id,
+            count(*),
+            sum(cycle_length),
+            sum(cycle_length * cycle_length),
+            min(cycle_length),
+            max(cycle_length),
+            count(*) FILTER (WHERE cycle_length > 45),
+            max(last_period_date),
+            max(last_period_date) + trunc(round(avg(cycle_length), 1))::int
+        FROM (
+            SELECT
+                user_id,
+                cycle_length,
+                last_period_date,
+                row_number() OVER (
+                    PARTITION BY user_id
+                    ORDER BY last_period_date DESC, id DESC
+                ) AS position
+            FROM cycles
+        ) ranked
+        WHERE position <= 6
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_cycle_stats')
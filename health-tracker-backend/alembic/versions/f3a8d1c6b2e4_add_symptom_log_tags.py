@@ -0,0 +1,44 @@
+"""add symptom_logs.tags with a GIN index
+
+Revision ID: f3a8d1c6b2e4
+Revises: e5b2c9f47a18
+Create Date: 2026-10-18 12:41:17.385204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d1c6b2e4'
+down_revision: Union[str, None] = 'e5b2c9f47a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tags come from the keyword matcher in Python, so existing rows are filled
+# by backfill_symptom_tags.py after this runs; until then they stay NULL and
+# readers extract tags from notes on the fly.
+
+
+def upgrade() -> None:
+    # nullable with no default: a catalog-only change, no table rewrite
+    op.add_column('symptom_logs', sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_symptom_logs_tags',
+            'symptom_logs',
+            ['tags'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_symptom_logs_tags', table_name='symptom_logs', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('symptom_logs', 'tags')
@@ -1,18 +1,19 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.auth_cache import user_cache
+from app.core.database import get_async_db
 from app.core.security import decode_token
 from app.crud import user as user_crud
 from app.models.models import User
 
 security = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     """Get current authenticated user"""
     token = credentials.credentials
@@ -33,12 +34,15 @@ def get_current_user(
             detail="Invalid token format",
         )
     
-    user = user_crud.get_user_by_id(db, user_uuid)
+    user = user_cache.get(user_uuid)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+        user = await user_crud.get_user_by_id(db, user_uuid)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        user_cache.set(user)
     
     if not user.is_active:
         raise HTTPException(
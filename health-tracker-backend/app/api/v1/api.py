@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, cycles, symptoms, stats, ai, health
+from app.core.config import settings
+
+from app.api.v1.endpoints import auth, users, cycles, symptoms, stats, ai, health, internal, dashboard, imports, exports
 
 api_router = APIRouter()
 
@@ -25,3 +27,12 @@ api_router.include_router(
 from app.api.v1.endpoints import ai
 
 api_router.include_router(ai.router)
+
+api_router.include_router(dashboard.router)
+
+api_router.include_router(imports.router)
+
+api_router.include_router(exports.router)
+
+if settings.INTERNAL_ENDPOINTS:
+    api_router.include_router(internal.router)
@@ -92,11 +92,18 @@
 #     except Exception as e:
 #         raise HTTPException(status_code=500, detail=str(e))
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
+from datetime import datetime
+from uuid import UUID
+import asyncio
+import json
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import paginate, set_next_cursor
 from app.api.deps import get_current_user
 from app.models.models import User, AIInsight
 from app.schemas.ai import (
@@ -107,17 +114,61 @@ from app.schemas.ai import (
     AIQuestionResponse,
     AICyclePredictionResponse,
 )
-from app.services.ai_service_gemini import ai_service
+from app.services.ai_service_gemini import AIService, get_ai_service
+from app.services.ai_cache import ai_cache
+from app.services.cycle_prediction import forecast_for_user, predict_from_forecast
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
 
+def require_ai_service() -> AIService:
+    """The AI service, or 503 when Gemini is not configured"""
+    try:
+        return get_ai_service()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _event_stream(chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Relay model chunks as Server-Sent Events, each data line a JSON string"""
+
+    async def events():
+        try:
+            async for chunk in chunks:
+                yield f"data: {json.dumps(chunk)}\n\n"
+        except asyncio.TimeoutError:
+            yield f"event: error\ndata: {json.dumps('AI service timed out')}\n\n"
+            return
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+            return
+        yield "event: done\ndata: null\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/analyze", response_model=AIAnalysisResponse)
 async def analyze_health_data(
     request: AIAnalysisRequest,
+    stream: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    ai_service: AIService = Depends(require_ai_service),
 ):
+    if stream:
+        return _event_stream(
+            await ai_service.stream_analysis(
+                db=db,
+                user_id=current_user.id,
+                days=request.days,
+                analysis_type=request.analysis_type,
+            )
+        )
+
     try:
         insight = await ai_service.analyze_health_data(
             db=db,
@@ -126,6 +177,8 @@ async def analyze_health_data(
             analysis_type=request.analysis_type,
         )
         return {"insight": insight, "stored_insight_id": None}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="AI service timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -133,9 +186,20 @@ async def analyze_health_data(
 @router.post("/ask", response_model=AIQuestionResponse)
 async def ask_ai_question(
     request: AIQuestionRequest,
+    stream: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    ai_service: AIService = Depends(require_ai_service),
 ):
+    if stream:
+        return _event_stream(
+            await ai_service.stream_question(
+                db=db,
+                user_id=current_user.id,
+                question=request.question,
+            )
+        )
+
     try:
         answer = await ai_service.ask_question(
             db=db,
@@ -143,33 +207,57 @@ async def ask_ai_question(
             question=request.question,
         )
         return {"question": request.question, "answer": answer}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="AI service timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/insights", response_model=List[AIInsightResponse])
-def get_insights(
-    skip: int = 0,
-    limit: int = 20,
+async def get_insights(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return (
-        db.query(AIInsight)
-        .filter(AIInsight.user_id == current_user.id)
-        .order_by(AIInsight.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    result = await db.execute(
+        paginate(
+            select(AIInsight).where(AIInsight.user_id == current_user.id),
+            (AIInsight.created_at, AIInsight.id),
+            (datetime.fromisoformat, UUID),
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+    )
+    return set_next_cursor(
+        response,
+        list(result.scalars().all()),
+        limit,
+        key=lambda insight: (insight.created_at, insight.id),
     )
 
 
 @router.get("/predict-cycle", response_model=AICyclePredictionResponse)
 async def predict_next_cycle(
+    explain: bool = Query(False, description="Add an AI explanation (slower)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    try:
-        return await ai_service.predict_next_cycle(db=db, user_id=current_user.id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # ✅ The forecast itself is local; Gemini is only needed to explain it
+    if explain:
+        ai_service = require_ai_service()
+        try:
+            return await ai_service.predict_next_cycle(db=db, user_id=current_user.id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    forecast = await forecast_for_user(db, user_id=current_user.id)
+    return {**predict_from_forecast(forecast), "analysis": ""}
+
+
+@router.get("/cache-stats")
+async def cache_stats(current_user: User = Depends(get_current_user)):
+    return ai_cache.stats()
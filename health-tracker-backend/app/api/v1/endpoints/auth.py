@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.schemas.user import UserCreate, UserLogin, Token, PasswordChange
 from app.crud import user as user_crud
-from app.core.security import create_access_token, create_refresh_token, verify_password
+from app.core.security import create_access_token, create_refresh_token, verify_password_async
 from app.api.deps import get_current_user
 from app.models.models import User
 
 router = APIRouter()
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = user_crud.get_user_by_email(db, user_in.email)
+    existing_user = await user_crud.get_user_by_email(db, user_in.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -22,7 +22,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     
     # Create user
     try:
-        user = user_crud.create_user(db, user_in)
+        user = await user_crud.create_user(db, user_in)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,9 +40,9 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user"""
-    user = user_crud.authenticate(db, credentials.email, credentials.password)
+    user = await user_crud.authenticate(db, credentials.email, credentials.password)
     
     if not user:
         raise HTTPException(
@@ -68,21 +68,24 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_data: PasswordChange,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password"""
+    # current_user may be a cached snapshot without the hash, so reload it
+    user = await user_crud.get_user_by_id(db, current_user.id)
+
     # Verify old password
-    if not verify_password(password_data.old_password, current_user.hashed_password):
+    if not user or not await verify_password_async(password_data.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
         )
     
     # Update password
-    success = user_crud.update_password(db, current_user.id, password_data.new_password)
+    success = await user_crud.update_password(db, current_user.id, password_data.new_password)
     
     if not success:
         raise HTTPException(
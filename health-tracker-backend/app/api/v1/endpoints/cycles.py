@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import date
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import date_range, paginate, set_next_cursor
 from app.api.deps import get_current_user
+from app.crud.crud_cycle_stats import refresh_cycle_stats
 from app.models.models import User, Cycle
+from app.schemas.cycle import CycleCalendar, CyclePrediction
+from app.services.ai_cache import ai_cache
+from app.services.calendar_cache import calendar_cache
+from app.services.cycle_calendar import MAX_CALENDAR_DAYS, get_calendar
+from app.services.cycle_prediction import DEFAULT_FORECAST_PERIODS, forecast_for_user
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/cycles", tags=["Cycles"])
@@ -33,16 +41,38 @@ class CycleResponse(BaseModel):
 
 # ==================== ROUTES ====================
 
+# Newest first, at most `limit` cycles per request: pass the X-Next-Cursor
+# header back as ?cursor= for older ones. from/to (inclusive) select cycles
+# by their start date.
 @router.get("/", response_model=List[CycleResponse])
-def get_cycles(
+async def get_cycles(
+    response: Response,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    cycles = (
-        db.query(Cycle)
-        .filter(Cycle.user_id == current_user.id)
-        .order_by(Cycle.last_period_date.desc())
-        .all()
+    result = await db.execute(
+        paginate(
+            select(Cycle).where(
+                Cycle.user_id == current_user.id,
+                *date_range(Cycle.last_period_date, date_from, date_to),
+            ),
+            (Cycle.last_period_date, Cycle.id),
+            (date.fromisoformat, UUID),
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+    )
+    cycles = set_next_cursor(
+        response,
+        list(result.scalars().all()),
+        limit,
+        key=lambda cycle: (cycle.last_period_date, cycle.id),
     )
 
     # ✅ Map DB → Frontend format
@@ -58,6 +88,41 @@ def get_cycles(
     ]
 
 
+@router.get("/forecast", response_model=CyclePrediction)
+async def get_forecast(
+    periods: int = Query(DEFAULT_FORECAST_PERIODS, ge=1, le=24),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Upcoming periods, their likely ranges and fertile windows. No AI call."""
+    forecast = await forecast_for_user(db, user_id=current_user.id, periods=periods)
+    if forecast is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Add your cycle data to get predictions.",
+        )
+    return forecast
+
+
+@router.get("/calendar", response_model=CycleCalendar)
+async def get_cycle_calendar(
+    date_from: date = Query(..., alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Phase and logged symptoms for each day, e.g. to render a month view"""
+    date_to = date_to or date_from
+    if not 0 <= (date_to - date_from).days < MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'to' must be on or after 'from', spanning at most {MAX_CALENDAR_DAYS} days",
+        )
+    return await get_calendar(
+        db, user_id=current_user.id, date_from=date_from, date_to=date_to
+    )
+
+
 # @router.post("/", response_model=CycleResponse, status_code=status.HTTP_201_CREATED)
 # def create_cycle(
 #     cycle_data: CycleCreate,
@@ -84,10 +149,10 @@ def get_cycles(
 #     )
 
 @router.post("/", response_model=CycleResponse, status_code=201)
-def create_cycle(
+async def create_cycle(
     cycle_data: CycleCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     cycle = Cycle(
         user_id=current_user.id,
@@ -97,8 +162,12 @@ def create_cycle(
     )
 
     db.add(cycle)
-    db.commit()
-    db.refresh(cycle)
+    await db.flush()
+    await refresh_cycle_stats(db, user_id=current_user.id)
+    await db.commit()
+    await db.refresh(cycle)
+    ai_cache.invalidate_user(current_user.id)
+    calendar_cache.invalidate_user(current_user.id)
 
     return CycleResponse(
         id=cycle.id,
@@ -110,18 +179,16 @@ def create_cycle(
 
 
 @router.delete("/{cycle_id}")
-def delete_cycle(
+async def delete_cycle(
     cycle_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    cycle = (
-        db.query(Cycle)
-        .filter(
+    cycle = await db.scalar(
+        select(Cycle).where(
             Cycle.id == cycle_id,
             Cycle.user_id == current_user.id,
         )
-        .first()
     )
 
     if not cycle:
@@ -130,6 +197,10 @@ def delete_cycle(
             detail="Cycle not found",
         )
 
-    db.delete(cycle)
-    db.commit()
+    await db.delete(cycle)
+    await db.flush()
+    await refresh_cycle_stats(db, user_id=current_user.id)
+    await db.commit()
+    ai_cache.invalidate_user(current_user.id)
+    calendar_cache.invalidate_user(current_user.id)
     return {"message": "Cycle deleted successfully"}
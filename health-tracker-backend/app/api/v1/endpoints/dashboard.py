@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.api.deps import get_current_user
+from app.api.v1.endpoints.cycles import CycleResponse
+from app.api.v1.endpoints.symptoms import SymptomLogResponse
+from app.crud.crud_cycle_stats import STATS_WINDOW, stats_from_cycles
+from app.models.models import User, Cycle, SymptomLog
+from app.schemas.cycle import CyclePrediction as CycleForecast
+from app.services.cycle_prediction import forecast_cycles, predict_from_forecast
+from app.services.risk_engine import assess, build_features, log_tags
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+# ==================== SCHEMAS ====================
+
+class CyclePrediction(BaseModel):
+    predicted_start_date: Optional[str]
+    average_cycle_length: Optional[float]
+    confidence: str
+    message: Optional[str] = None
+    forecast: Optional[CycleForecast] = None
+
+
+class DashboardResponse(BaseModel):
+    cycles: List[CycleResponse]
+    cycle_count: int
+    recent_logs: List[SymptomLogResponse]
+    symptom_log_count: int
+    today_log: Optional[SymptomLogResponse]
+    hormonal_risk: dict
+    prediction: CyclePrediction
+
+
+# ==================== ROUTES ====================
+
+# Everything the dashboard shows, from two queries: the user's latest cycles
+# and their most recent logs (each with its total count as a window column).
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    recent_logs: int = Query(30, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cycle_rows = (
+        await db.execute(
+            select(Cycle, func.count().over())
+            .where(Cycle.user_id == current_user.id)
+            .order_by(Cycle.last_period_date.desc(), Cycle.id.desc())
+            .limit(max(settings.DASHBOARD_CYCLES, STATS_WINDOW))
+        )
+    ).all()
+    cycles = [cycle for cycle, _ in cycle_rows]
+    cycle_count = cycle_rows[0][1] if cycle_rows else 0
+    # same numbers as user_cycle_stats, without a third query
+    stats = stats_from_cycles(current_user.id, cycles)
+    # the forecast /cycles/forecast and /ai/predict-cycle give; cycles older
+    # than the window weigh too little there to move it
+    history = [(c.last_period_date, c.cycle_length) for c in reversed(cycles)]
+    forecast = forecast_cycles([history]).prediction(0)
+
+    rows = (
+        await db.execute(
+            select(SymptomLog, func.count().over())
+            .where(SymptomLog.user_id == current_user.id)
+            .order_by(SymptomLog.log_date.desc(), SymptomLog.id.desc())
+            .limit(recent_logs)
+        )
+    ).all()
+    logs = [log for log, _ in rows]
+    log_count = rows[0][1] if rows else 0
+
+    today = date.today()
+    today_log = next((log for log in logs if log.log_date == today), None)
+    if today_log is None and logs and logs[-1].log_date > today:
+        # only future-dated entries fit in the window; look today up directly
+        today_log = await db.scalar(
+            select(SymptomLog).where(
+                SymptomLog.user_id == current_user.id,
+                SymptomLog.log_date == today,
+            )
+        )
+
+    return DashboardResponse(
+        cycles=[
+            CycleResponse(
+                id=c.id,
+                user_id=c.user_id,
+                cycle_start_date=c.last_period_date,
+                cycle_length=c.cycle_length,
+                period_length=c.period_length,
+            )
+            for c in cycles
+        ],
+        cycle_count=cycle_count,
+        recent_logs=logs,
+        symptom_log_count=log_count,
+        today_log=today_log,
+        hormonal_risk=assess(
+            build_features(stats, [log_tags(log.tags, log.notes) for log in logs]), ["hormonal"]
+        )["hormonal"],
+        prediction=predict_from_forecast(forecast),
+    )
@@ -0,0 +1,56 @@
+from typing import Optional, Sequence
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_user
+from app.core.database import get_async_session_factory
+from app.models.models import User
+from app.services.exporter import (
+    SECTIONS,
+    ExportFormat,
+    ExportSection,
+    export_filename,
+    export_rows,
+)
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _stream(session_factory, user_id: UUID, sections: Sequence[ExportSection], fmt: ExportFormat):
+    # the session lives as long as the response body, not the request handler
+    async def body():
+        async with session_factory() as db:
+            async for chunk in export_rows(db, user_id=user_id, sections=sections, fmt=fmt):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(sections, fmt)}"'
+        },
+    )
+
+
+# Whole account as NDJSON, one {"type": ...} record per line
+@router.get("")
+async def export_account(
+    current_user: User = Depends(get_current_user),
+    session_factory=Depends(get_async_session_factory),
+):
+    return _stream(session_factory, current_user.id, SECTIONS, "ndjson")
+
+
+# One section; the CSV uses the same columns the importer reads
+@router.get("/{section}")
+async def export_section(
+    section: ExportSection,
+    fmt: Optional[ExportFormat] = Query("ndjson", alias="format"),
+    current_user: User = Depends(get_current_user),
+    session_factory=Depends(get_async_session_factory),
+):
+    return _stream(session_factory, current_user.id, [section], fmt)
@@ -0,0 +1,69 @@
+import tempfile
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.api.deps import get_current_user
+from app.models.models import User
+from app.services.ai_cache import ai_cache
+from app.services.calendar_cache import calendar_cache
+from app.services.importer import ImportFormat, ImportKind, ImportReport, import_rows
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+# Send the export as the raw request body, e.g.
+#   curl -T history.csv -H "Content-Type: text/csv" .../import/symptom-logs
+# The body is spooled to disk past 1 MB and imported batch by batch.
+@router.post("/{kind}", response_model=ImportReport)
+async def import_history(
+    kind: ImportKind,
+    request: Request,
+    fmt: Optional[ImportFormat] = Query(None, alias="format"),
+    overwrite: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = fmt or CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=",
+        )
+
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Import is limited to {settings.IMPORT_MAX_BYTES} bytes",
+                )
+            spool.write(chunk)
+        spool.seek(0)
+
+        report = await import_rows(
+            db,
+            user_id=current_user.id,
+            kind=kind,
+            stream=spool,
+            fmt=fmt,
+            overwrite=overwrite,
+        )
+
+    if report.inserted or report.updated:
+        ai_cache.invalidate_user(current_user.id)
+        calendar_cache.invalidate_user(current_user.id)
+
+    return report
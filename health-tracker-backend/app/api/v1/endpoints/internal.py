@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+
+from app.core.database import get_async_engine, get_engine
+from app.core.db_metrics import pool_status, query_metrics
+
+# No auth: only mounted with INTERNAL_ENDPOINTS on (see api.py)
+router = APIRouter(prefix="/internal", tags=["Internal"], include_in_schema=False)
+
+
+# async so it stays answerable when the request threadpool is saturated
+@router.get("/db-pool")
+async def db_pool():
+    return {
+        "async": pool_status(get_async_engine().sync_engine),
+        "sync": pool_status(get_engine()),
+    }
+
+
+# statements per request by route: count, DB time and the slowest seen
+@router.get("/db-queries")
+async def db_queries():
+    return query_metrics.snapshot()
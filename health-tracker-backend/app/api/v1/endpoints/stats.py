@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_current_user
+from app.core.database import get_async_db
 from app.models.models import User
 from app.schemas.stats import (
     AverageCycleResponse,
+    CycleSummaryResponse,
     LastCycleResponse,
+    RollingAverageResponse,
     SymptomsSummaryResponse,
+    SymptomTagsResponse,
 )
 from app.crud.crud_stats import (
     get_average_cycle_length,
+    get_cycle_summary,
     get_last_cycle,
+    get_rolling_averages,
+    get_symptom_tag_counts,
     get_symptoms_summary,
 )
 
@@ -18,26 +25,59 @@ router = APIRouter()
 
 
 @router.get("/average-cycle", response_model=AverageCycleResponse)
-def average_cycle(
-    db: Session = Depends(get_db),
+async def average_cycle(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    avg = get_average_cycle_length(db=db, user_id=current_user.id)
+    avg = await get_average_cycle_length(db=db, user_id=current_user.id)
     return {"average_cycle_length_days": avg}
 
 
 @router.get("/last-cycle", response_model=LastCycleResponse | None)
-def last_cycle(
-    db: Session = Depends(get_db),
+async def last_cycle(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    return get_last_cycle(db=db, user_id=current_user.id)
+    return await get_last_cycle(db=db, user_id=current_user.id)
 
 
 @router.get("/symptoms-summary", response_model=SymptomsSummaryResponse)
-def symptoms_summary(
-    db: Session = Depends(get_db),
+async def symptoms_summary(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    total = get_symptoms_summary(db=db, user_id=current_user.id)
+    total = await get_symptoms_summary(db=db, user_id=current_user.id)
     return {"total_logs": total}
+
+
+# Cycle lengths here are observed: the days between consecutive period
+# start dates, not the lengths entered with each cycle.
+@router.get("/summary", response_model=CycleSummaryResponse)
+async def cycle_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_cycle_summary(db=db, user_id=current_user.id)
+
+
+@router.get("/rolling-average", response_model=RollingAverageResponse)
+async def rolling_average(
+    window: int = Query(3, ge=2, le=24),
+    limit: int = Query(24, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    points = await get_rolling_averages(
+        db=db, user_id=current_user.id, window=window, limit=limit
+    )
+    return {"window": window, "points": points}
+
+
+# Tags are the symptom keywords extracted from notes when a log is written
+@router.get("/symptom-tags", response_model=SymptomTagsResponse)
+async def symptom_tags(
+    days: int = Query(90, ge=1, le=3660),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_symptom_tag_counts(db=db, user_id=current_user.id, days=days)
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date, datetime
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import date_range, paginate, set_next_cursor
 from app.api.deps import get_current_user
+from app.crud import crud_symptom
 from app.models.models import User, SymptomLog
-from pydantic import BaseModel
+from app.services.ai_cache import ai_cache
+from app.services.calendar_cache import calendar_cache
+from pydantic import BaseModel, Field
 
 router = APIRouter(
     prefix="/symptom-logs",
@@ -23,6 +29,10 @@ class SymptomLogCreate(BaseModel):
     notes: str
 
 
+class SymptomLogBatch(BaseModel):
+    logs: List[SymptomLogCreate] = Field(..., min_length=1, max_length=366)
+
+
 class SymptomLogUpdate(BaseModel):
     log_date: Optional[date] = None
     notes: Optional[str] = None
@@ -33,32 +43,58 @@ class SymptomLogResponse(BaseModel):
     user_id: UUID
     log_date: date
     notes: str
+    tags: Optional[List[str]] = None  # symptom keywords found in notes
     created_at: Optional[datetime]  # ✅ Allow datetime from DB
 
     class Config:
         from_attributes = True
 
 
+class SymptomLogSearchHit(BaseModel):
+    id: UUID
+    log_date: date
+    notes: str
+    rank: float
+    snippet: str  # HTML-escaped notes, matched words wrapped in <mark>...</mark>
+
+
 # -------------------------
 # GET ALL SYMPTOMS (with pagination)
 # -------------------------
 
+# Pass the X-Next-Cursor header back as ?cursor= for the next page;
+# skip is kept for clients that still page by offset. from/to (inclusive)
+# narrow the list to a date range, e.g. one month.
 @router.get("", response_model=List[SymptomLogResponse])
-def get_symptom_logs(
-    skip: int = 0,
-    limit: int = 20,
+async def get_symptom_logs(
+    response: Response,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    logs = (
-        db.query(SymptomLog)
-        .filter(SymptomLog.user_id == current_user.id)
-        .order_by(SymptomLog.log_date.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    result = await db.execute(
+        paginate(
+            select(SymptomLog).where(
+                SymptomLog.user_id == current_user.id,
+                *date_range(SymptomLog.log_date, date_from, date_to),
+            ),
+            (SymptomLog.log_date, SymptomLog.id),
+            (date.fromisoformat, UUID),
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+    )
+    return set_next_cursor(
+        response,
+        list(result.scalars().all()),
+        limit,
+        key=lambda log: (log.log_date, log.id),
     )
-    return logs
 
 
 # -------------------------
@@ -66,86 +102,121 @@ def get_symptom_logs(
 # -------------------------
 
 @router.post("", response_model=SymptomLogResponse, status_code=status.HTTP_201_CREATED)
-def create_symptom_log(
+async def create_symptom_log(
     log_data: SymptomLogCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    # One log per day rule
-    existing = (
-        db.query(SymptomLog)
-        .filter(
-            SymptomLog.user_id == current_user.id,
-            SymptomLog.log_date == log_data.log_date,
-        )
-        .first()
+    # One log per day rule, enforced by the unique constraint so concurrent
+    # submissions for the same day cannot race past the check
+    log = await crud_symptom.create_symptom(
+        db, user_id=current_user.id, symptom_in=log_data
     )
 
-    if existing:
+    if not log:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A symptom log already exists for this date",
         )
 
-    log = SymptomLog(
-        user_id=current_user.id,
-        log_date=log_data.log_date,
-        notes=log_data.notes,
+    ai_cache.invalidate_user(current_user.id)
+    calendar_cache.invalidate_user(current_user.id)
+
+    return log
+
+
+# -------------------------
+# BATCH UPSERT (offline catch-up)
+# -------------------------
+
+@router.post("/batch", response_model=List[SymptomLogResponse])
+async def upsert_symptom_logs(
+    batch: SymptomLogBatch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    logs = await crud_symptom.upsert_symptoms(
+        db, user_id=current_user.id, symptoms_in=batch.logs
     )
+    ai_cache.invalidate_user(current_user.id)
+    calendar_cache.invalidate_user(current_user.id)
 
-    db.add(log)
-    db.commit()
-    db.refresh(log)
+    return logs
 
-    return log
+
+# -------------------------
+# SEARCH NOTES
+# (declared before /{log_id} so "search" is not parsed as an id)
+# -------------------------
+
+# Full-text search on Postgres (stemmed, websearch syntax: "phrase", or,
+# -word); other databases fall back to matching every word as a substring.
+@router.get("/search", response_model=List[SymptomLogSearchHit])
+async def search_symptom_logs(
+    q: str = Query(..., min_length=1, max_length=200),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    order: crud_symptom.SearchOrder = "rank",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await crud_symptom.search_symptoms(
+        db,
+        user_id=current_user.id,
+        q=q,
+        date_from=date_from,
+        date_to=date_to,
+        order=order,
+        skip=skip,
+        limit=limit,
+    )
 
 
 # -------------------------
-# GET SINGLE SYMPTOM LOG
+# GET TODAY'S SYMPTOM LOG
+# (declared before /{log_id} so "today" is not parsed as an id)
 # -------------------------
 
-@router.get("/{log_id}", response_model=SymptomLogResponse)
-def get_symptom_log(
-    log_id: UUID,
+@router.get("/today", response_model=SymptomLogResponse)
+async def get_today_log(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    log = (
-        db.query(SymptomLog)
-        .filter(
-            SymptomLog.id == log_id,
+    today = date.today()
+
+    log = await db.scalar(
+        select(SymptomLog).where(
             SymptomLog.user_id == current_user.id,
+            SymptomLog.log_date == today,
         )
-        .first()
     )
 
     if not log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Symptom log not found",
+            detail="No symptom log found for today",
         )
 
     return log
 
 
 # -------------------------
-# UPDATE SYMPTOM LOG
+# GET SINGLE SYMPTOM LOG
 # -------------------------
 
-@router.put("/{log_id}", response_model=SymptomLogResponse)
-def update_symptom_log(
+@router.get("/{log_id}", response_model=SymptomLogResponse)
+async def get_symptom_log(
     log_id: UUID,
-    log_data: SymptomLogUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    log = (
-        db.query(SymptomLog)
-        .filter(
+    log = await db.scalar(
+        select(SymptomLog).where(
             SymptomLog.id == log_id,
             SymptomLog.user_id == current_user.id,
         )
-        .first()
     )
 
     if not log:
@@ -154,34 +225,33 @@ def update_symptom_log(
             detail="Symptom log not found",
         )
 
-    update_data = log_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(log, field, value)
-
-    db.commit()
-    db.refresh(log)
-
     return log
 
 
 # -------------------------
-# DELETE SYMPTOM LOG
+# UPDATE SYMPTOM LOG
 # -------------------------
 
-@router.delete("/{log_id}")
-def delete_symptom_log(
+@router.put("/{log_id}", response_model=SymptomLogResponse)
+async def update_symptom_log(
     log_id: UUID,
+    log_data: SymptomLogUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    log = (
-        db.query(SymptomLog)
-        .filter(
-            SymptomLog.id == log_id,
-            SymptomLog.user_id == current_user.id,
+    try:
+        log = await crud_symptom.update_symptom(
+            db,
+            user_id=current_user.id,
+            symptom_id=log_id,
+            values=log_data.model_dump(exclude_unset=True),
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A symptom log already exists for this date",
         )
-        .first()
-    )
 
     if not log:
         raise HTTPException(
@@ -189,36 +259,33 @@ def delete_symptom_log(
             detail="Symptom log not found",
         )
 
-    db.delete(log)
-    db.commit()
+    ai_cache.invalidate_user(current_user.id)
+    calendar_cache.invalidate_user(current_user.id)
 
-    return {"message": "Symptom log deleted successfully"}
+    return log
 
 
 # -------------------------
-# GET TODAY'S SYMPTOM LOG
+# DELETE SYMPTOM LOG
 # -------------------------
 
-@router.get("/today", response_model=SymptomLogResponse)
-def get_today_log(
+@router.delete("/{log_id}")
+async def delete_symptom_log(
+    log_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    today = date.today()
-
-    log = (
-        db.query(SymptomLog)
-        .filter(
-            SymptomLog.user_id == current_user.id,
-            SymptomLog.log_date == today,
-        )
-        .first()
+    deleted = await crud_symptom.delete_symptom(
+        db, user_id=current_user.id, symptom_id=log_id
     )
 
-    if not log:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="No symptom log found for today",
+            detail="Symptom log not found",
         )
 
-    return log
+    ai_cache.invalidate_user(current_user.id)
+    calendar_cache.invalidate_user(current_user.id)
+
+    return {"message": "Symptom log deleted successfully"}
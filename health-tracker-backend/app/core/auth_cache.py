@@ -0,0 +1,65 @@
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.core.cache import build_backend
+from app.core.config import settings
+from app.models.models import User
+
+
+class UserCache:
+    """
+    Short-lived snapshot of the authenticated user, so get_current_user can
+    skip the users lookup. Only identity and the active flag are kept; the
+    password hash never enters the cache.
+    """
+
+    def __init__(self, backend, ttl: int, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+
+    def _key(self, user_id: UUID) -> str:
+        return f"auth:user:{user_id}"
+
+    def get(self, user_id: UUID) -> Optional[User]:
+        if not self.enabled:
+            return None
+        raw = self.backend.get(self._key(user_id))
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        return User(
+            id=UUID(data["id"]),
+            email=data["email"],
+            is_active=data["is_active"],
+            created_at=(
+                datetime.fromisoformat(data["created_at"])
+                if data["created_at"]
+                else None
+            ),
+        )
+
+    def set(self, user: User) -> None:
+        if not self.enabled:
+            return
+        data = {
+            "id": str(user.id),
+            "email": user.email,
+            "is_active": user.is_active,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+        }
+        self.backend.set(self._key(user.id), json.dumps(data), self.ttl)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self.backend.delete(self._key(user_id))
+
+
+# ✅ Singleton
+user_cache = UserCache(
+    build_backend(settings.AUTH_CACHE_URL, settings.AUTH_CACHE_MAX_ENTRIES),
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    enabled=settings.AUTH_CACHE_ENABLED,
+)
@@ -9,17 +9,34 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str = "health_tracker"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = no limit
+    DB_REPEATED_QUERY_THRESHOLD: int = 5  # same statement this often in one request: likely N+1
     
     # Security
     SECRET_KEY: str = "super-secret-key"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_USE_PROCESSES: bool = False  # threads suffice, bcrypt drops the GIL
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_URL: str = ""  # shared backend for multi-worker deployments
     
     # API
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "Health Tracker API"
     DEBUG: bool = True
+    # /internal/* (pool and query diagnostics, SQL text included) has no
+    # auth; mount it only where the API is not publicly reachable
+    INTERNAL_ENDPOINTS: bool = False
     
     # CORS - UPDATE THIS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -31,11 +48,43 @@ class Settings(BaseSettings):
     
     # Gemini AI
     GEMINI_API_KEY: str = ""
+    AI_MAX_CONCURRENCY: int = 8  # Gemini calls in flight per worker
+    AI_WORKER_THREADS: int = 8  # raised to AI_MAX_CONCURRENCY if lower
+    AI_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    AI_CACHE_TTL_SECONDS: int = 3600
+    AI_CACHE_MAX_ENTRIES: int = 1024
+    AI_CACHE_URL: str = ""  # e.g. redis://localhost:6379/0, empty = in-process
+
+    # Bulk import
+    IMPORT_BATCH_SIZE: int = 1000  # rows per multi-row INSERT
+    IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # Data export
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round-trip
+
+    # Dashboard
+    # latest cycles loaded and returned; the forecast weighs a cycle 24 back
+    # at 1/16, so a longer history barely moves it
+    DASHBOARD_CYCLES: int = 24
+
+    # Cycle calendar
+    CALENDAR_CACHE_TTL_SECONDS: int = 3600
+    # in-process entries are only dropped by writes in the same worker; other
+    # workers and the CLI scripts' changes show up after this long at most
+    CALENDAR_CACHE_LOCAL_TTL_SECONDS: int = 300
+    CALENDAR_CACHE_MAX_ENTRIES: int = 10000  # one entry per user and month
+    CALENDAR_CACHE_URL: str = ""  # e.g. redis://localhost:6379/0; set it when running several workers
     
     @property
     def DATABASE_URL(self) -> str:
         password = quote_plus(self.POSTGRES_PASSWORD)
         return f"postgresql://{self.POSTGRES_USER}:{password}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        # psycopg 3 serves both the sync and the asyncio stacks
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
     
     class Config:
         env_file = ".env"
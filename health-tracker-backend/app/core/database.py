@@ -1,12 +1,12 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
-
-DATABASE_URL = settings.DATABASE_URL
-
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.core.db_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
 # ✅ Define Base FIRST
 Base = declarative_base()
@@ -14,8 +14,67 @@ Base = declarative_base()
 # ✅ Import models AFTER Base is defined
 from app.models import models  # IMPORTANT
 
-# ✅ Now create tables
-Base.metadata.create_all(bind=engine)
+# Schema changes go through Alembic (`alembic upgrade head`); nothing here
+# touches the database at import time. Engines are built on first use.
+
+
+def _connect_args() -> dict:
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return connect_args
+
+
+def _pool_kwargs() -> dict:
+    return dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """Sync engine for scripts, Alembic and code outside the event loop"""
+    return create_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        **_pool_kwargs(),
+    )
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Async engine used by the API endpoints"""
+    return create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **_pool_kwargs(),
+    )
+
+
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+_async_session_factory = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def SessionLocal() -> Session:
+    return _session_factory(bind=get_engine())
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    return _async_session_factory(bind=get_async_engine())
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of whichever engines were created"""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+
 
 # Dependency
 def get_db():
@@ -24,3 +83,14 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_session_factory():
+    """For streaming responses, which must open their own session: a yield
+    dependency is closed before the response body is sent"""
+    return AsyncSessionLocal
@@ -0,0 +1,337 @@
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import Histogram, LoopHistogram, PrometheusText, route_path
+
+logger = logging.getLogger(__name__)
+
+# Statements per request
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+SLOWEST_STATEMENT_CHARS = 200
+# response headers in debug mode, see QueryStats.headers
+DB_HEADERS = ["X-DB-Queries", "X-DB-Time-Ms", "X-DB-Slowest-Ms", "X-DB-Slowest-Statement", "X-DB-Repeated"]
+
+
+class PoolStats:
+    """Checkout counters and latency for the application's connection pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.queued = 0  # had to wait because every connection was in use
+        self.failed = 0  # queued and gave up after pool_timeout
+        self.checkout_ms = Histogram()
+        self.wait_ms = Histogram()  # only checkouts that were queued
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, queued: bool, failed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.queued += queued
+            self.failed += failed
+        self.checkout_ms.observe(elapsed_ms)
+        if queued:
+            self.wait_ms.observe(elapsed_ms)
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout and notes queueing and timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        saturated = (
+            self._max_overflow >= 0
+            and self.checkedout() >= self.size() + self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self._record(start, queued=True, failed=True)
+            raise
+        self._record(start, queued=saturated, failed=False)
+        return connection
+
+    def _record(self, start: float, queued: bool, failed: bool) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats.record(elapsed_ms, queued, failed)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine) -> Dict:
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+    }
+
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+
+    if isinstance(pool, _InstrumentedPoolMixin):
+        stats = pool.stats
+        status.update(
+            checkouts=stats.checkouts,
+            queued_checkouts=stats.queued,
+            failed_checkouts=stats.failed,
+            checkout_latency_ms=stats.checkout_ms.snapshot(),
+            wait_time_ms=stats.wait_ms.snapshot(),
+        )
+
+    return status
+
+
+# ---- per-request statements ----
+
+class QueryStats:
+    """Statements run while a collector is active: one request, or a budget check"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Dict[str, int] = {}  # a plain dict: a Counter costs more to create
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least `threshold` times, most repeated first: likely N+1"""
+        if self.count < threshold:
+            return []
+        return [(statement, n) for statement, n in self.most_common() if n >= threshold]
+
+    def most_common(self) -> List[Tuple[str, int]]:
+        return sorted(self.statements.items(), key=lambda item: item[1], reverse=True)
+
+    def headers(self, threshold: int) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            (b"x-db-queries", str(self.count).encode()),
+            (b"x-db-time-ms", f"{self.total_ms:.2f}".encode()),
+        ]
+        if self.slowest_statement:
+            headers += [
+                (b"x-db-slowest-ms", f"{self.slowest_ms:.2f}".encode()),
+                (b"x-db-slowest-statement", _short(self.slowest_statement).encode("latin-1", "replace")),
+            ]
+        repeated = self.repeated(threshold)
+        if repeated:
+            headers.append((b"x-db-repeated", str(repeated[0][1]).encode()))
+        return headers
+
+
+def _short(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()[:SLOWEST_STATEMENT_CHARS]
+
+
+# Every active collector sees every statement, so a budget check still counts
+# the statements of the requests it wraps
+_collectors: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_collectors", default=())
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fails with AssertionError when the block runs more than max_queries
+    statements, e.g. around a test client call to one endpoint
+    """
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {n}x {_short(statement)}" for statement, n in stats.most_common())
+        raise AssertionError(f"{stats.count} queries, budget is {max_queries}:\n{listing}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    for stats in _collectors.get():
+        stats.record(statement, elapsed_ms)
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_queries(target=Engine) -> None:
+    """Time statements on every engine (or just `target`); idempotent"""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+
+
+class RouteQueryStats:
+    def __init__(self):
+        self.requests = 0
+        self.repeated = 0  # requests that ran some statement threshold or more times
+        self.queries = LoopHistogram(QUERY_COUNT_BUCKETS)
+        self.db_ms = LoopHistogram()
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+
+class QueryMetrics:
+    """
+    Per-route totals of what QueryStatsMiddleware saw, for /internal/db-queries
+    and /metrics. Written from the event loop only, like RequestMetrics.
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, RouteQueryStats] = {}
+
+    def record(self, route: str, stats: QueryStats, repeated: bool) -> None:
+        totals = self.routes.get(route)
+        if totals is None:
+            totals = self.routes[route] = RouteQueryStats()
+        totals.requests += 1
+        totals.repeated += repeated
+        if stats.slowest_statement and stats.slowest_ms >= totals.slowest_ms:
+            totals.slowest_ms = stats.slowest_ms
+            totals.slowest_statement = _short(stats.slowest_statement)
+        totals.queries.observe(stats.count)
+        totals.db_ms.observe(stats.total_ms)
+
+    def snapshot(self) -> Dict:
+        return {
+            route: {
+                "requests": totals.requests,
+                "repeated_statement_requests": totals.repeated,
+                "queries": totals.queries.snapshot(),
+                "db_time_ms": totals.db_ms.snapshot(),
+                "slowest_ms": round(totals.slowest_ms, 3),
+                "slowest_statement": totals.slowest_statement,
+            }
+            for route, totals in sorted(self.routes.items())
+        }
+
+
+# ✅ Singleton
+query_metrics = QueryMetrics()
+
+
+def route_label(scope) -> str:
+    """"GET /api/v1/cycles/{cycle_id}": the route template, not the raw path"""
+    return f"{scope['method']} {route_path(scope)}"
+
+
+def render_queries(out: PrometheusText, metrics: QueryMetrics = query_metrics) -> None:
+    routes = [
+        (dict(zip(("method", "route"), route.split(" ", 1))), totals)
+        for route, totals in sorted(metrics.routes.items())
+    ]
+    out.family("http_request_db_queries", "histogram", "SQL statements per HTTP request by route")
+    for labels, totals in routes:
+        out.histogram("http_request_db_queries", labels, totals.queries)
+    out.family("http_request_db_duration_seconds", "histogram", "Time in SQL per HTTP request by route")
+    for labels, totals in routes:
+        out.histogram("http_request_db_duration_seconds", labels, totals.db_ms, seconds=True)
+    out.family(
+        "http_requests_repeated_statement_total", "counter",
+        "Requests that ran one statement DB_REPEATED_QUERY_THRESHOLD or more times (likely N+1)",
+    )
+    for labels, totals in routes:
+        out.sample("http_requests_repeated_statement_total", labels, totals.repeated)
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the statements of each HTTP request into query_metrics. With
+    headers on (debug), the counts so far also go out as X-DB-* response
+    headers; a streaming body's own queries land in the metrics only.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        headers: bool = False,
+        repeat_threshold: int = 5,
+        metrics: QueryMetrics = query_metrics,
+    ):
+        self.app = app
+        self.headers = headers
+        self.repeat_threshold = repeat_threshold
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # collect_queries() inlined: this runs on every request
+        stats = QueryStats()
+        token = _collectors.set(_collectors.get() + (stats,))
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *stats.headers(self.repeat_threshold)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.headers else send)
+        finally:
+            _collectors.reset(token)
+            route = route_label(scope)
+            repeated = stats.repeated(self.repeat_threshold)
+            self.metrics.record(route, stats, bool(repeated))
+            for statement, n in repeated:
+                logger.warning("possible N+1 in %s: %dx %s", route, n, _short(statement))
@@ -0,0 +1,227 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Milliseconds; suits DB checkouts as well as request latencies
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-bucket histogram, cumulative like Prometheus `le` buckets"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def cumulative(self):
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): total
+                for bound, total in self.cumulative()
+            },
+        }
+
+
+class LoopHistogram(Histogram):
+    """Histogram written only from the event loop thread, so without the lock"""
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+# ---- requests ----
+
+def route_path(scope) -> str:
+    """The matched route's template ("/api/v1/cycles/{cycle_id}"), never the raw path"""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class RouteStats:
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency_ms = LoopHistogram()
+
+
+class RequestMetrics:
+    """
+    Per-route request counts by status and latency, plus requests in flight.
+    Only RequestMetricsMiddleware writes here, from the event loop, so the
+    request path takes no locks.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+
+    def record(self, method: str, route: str, status: int, elapsed_ms: float) -> None:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[method, route] = RouteStats()
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.latency_ms.observe(elapsed_ms)
+
+
+# ✅ Singleton
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """
+    Times every HTTP request into request_metrics. Pure ASGI and kept to a
+    couple of clock reads and dict updates, so it costs microseconds.
+    """
+
+    def __init__(self, app, *, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # what the client gets if the app raises before responding
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            metrics.in_flight -= 1
+            metrics.record(scope["method"], route_path(scope), status, elapsed_ms)
+
+
+# ---- calls to outside services ----
+
+class CallMetrics:
+    """
+    Latency and failures of calls to one outside service, by kind of call.
+    Calls abandoned because the caller went away (client disconnect, task
+    cancelled) are only counted: their partial time says nothing about
+    the service.
+    """
+
+    def __init__(self):
+        self.latency_ms: Dict[str, Histogram] = {}
+        self.errors: Counter = Counter()  # (kind, exception class name)
+        self.cancelled: Counter = Counter()  # kind
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, elapsed_ms: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            histogram = self.latency_ms.get(kind)
+            if histogram is None:
+                histogram = self.latency_ms[kind] = Histogram()
+            if error is not None:
+                self.errors[kind, type(error).__name__] += 1
+        histogram.observe(elapsed_ms)
+
+    def record_cancelled(self, kind: str) -> None:
+        with self._lock:
+            self.cancelled[kind] += 1
+
+
+# ---- Prometheus text format ----
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class PrometheusText:
+    """
+    Builds a text-format (0.0.4) exposition. Millisecond histograms are
+    written in seconds, as Prometheus expects, with seconds=True.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4"  # the response adds charset=utf-8
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        self.lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+    def sample(self, name: str, labels: Dict, value: float) -> None:
+        self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, labels: Dict, histogram: Histogram, seconds: bool = False) -> None:
+        scale = (lambda ms: ms / 1000) if seconds else (lambda value: value)
+        for bound, total in histogram.cumulative():
+            self.sample(f"{name}_bucket", {**labels, "le": _number(scale(bound))}, total)
+        self.sample(f"{name}_sum", labels, scale(histogram.sum))
+        self.sample(f"{name}_count", labels, histogram.count)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_requests(out: PrometheusText, metrics: RequestMetrics = request_metrics) -> None:
+    routes = sorted(metrics.routes.items())
+    out.family("http_requests_total", "counter", "HTTP requests by route and status")
+    for (method, route), stats in routes:
+        for status, count in sorted(stats.statuses.items()):
+            out.sample("http_requests_total", {"method": method, "route": route, "status": status}, count)
+    out.family("http_requests_in_flight", "gauge", "HTTP requests being served")
+    out.sample("http_requests_in_flight", {}, metrics.in_flight)
+    out.family("http_request_duration_seconds", "histogram", "HTTP request latency by route")
+    for (method, route), stats in routes:
+        labels = {"method": method, "route": route}
+        out.histogram("http_request_duration_seconds", labels, stats.latency_ms, seconds=True)
+
+
+def render_calls(out: PrometheusText, service: str, metrics: CallMetrics) -> None:
+    out.family(f"{service}_request_duration_seconds", "histogram", f"Latency of {service} calls, failed ones included")
+    for kind, histogram in sorted(metrics.latency_ms.items()):
+        out.histogram(f"{service}_request_duration_seconds", {"call": kind}, histogram, seconds=True)
+    out.family(f"{service}_errors_total", "counter", f"Failed {service} calls by exception")
+    for (kind, error), count in sorted(metrics.errors.items()):
+        out.sample(f"{service}_errors_total", {"call": kind, "error": error}, count)
+    out.family(f"{service}_cancelled_total", "counter", f"{service} calls abandoned by a disconnect or cancellation")
+    for kind, count in sorted(metrics.cancelled.items()):
+        out.sample(f"{service}_cancelled_total", {"call": kind}, count)
@@ -0,0 +1,77 @@
+import base64
+import json
+from datetime import date
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque token for the sort key of the last row on a page"""
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, types: Sequence[Callable[[str], Any]]) -> tuple:
+    """Sort key from a cursor token, parsed with one callable per column"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if len(values) != len(types):
+            raise ValueError(token)
+        return tuple(parse(value) for parse, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def date_range(column: Any, date_from: Optional[date], date_to: Optional[date]) -> List:
+    """
+    Inclusive bounds on a date column, for a range scan on an index led by
+    (user_id, column); a missing end leaves that side open
+    """
+    filters = []
+    if date_from:
+        filters.append(column >= date_from)
+    if date_to:
+        filters.append(column <= date_to)
+    return filters
+
+
+def paginate(
+    stmt: Select,
+    columns: Sequence[Any],
+    types: Sequence[Callable[[str], Any]],
+    *,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+) -> Select:
+    """
+    Newest-first page of stmt. With a cursor, rows strictly after that key
+    are selected (keyset), so a deep page costs the same as the first one;
+    otherwise skip/limit is used. One extra row is fetched to tell whether
+    another page exists, see set_next_cursor.
+    """
+    stmt = stmt.order_by(*(column.desc() for column in columns)).limit(limit + 1)
+    if cursor:
+        return stmt.where(tuple_(*columns) < decode_cursor(cursor, types))
+    return stmt.offset(skip)
+
+
+def set_next_cursor(
+    response: Response,
+    rows: list,
+    limit: int,
+    key: Callable[[Any], tuple],
+) -> list:
+    """Trim the look-ahead row and expose the next page's cursor as a header"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
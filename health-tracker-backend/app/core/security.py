@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -7,31 +9,82 @@ from app.core.config import settings
 from fastapi import HTTPException, status
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds makes passlib flag any hash with a different cost
+# as needing an update, which is what drives rehash-on-login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt is CPU-bound; a dedicated pool caps how many hashes run at once so
+# a login burst cannot starve the request threadpool.
+_hash_executor = (
+    ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    if settings.PASSWORD_HASH_USE_PROCESSES
+    else ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        thread_name_prefix="bcrypt",
+    )
+)
+
+
+def shutdown_hash_executor() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    valid, _ = verify_and_update_password(plain_password, hashed_password)
+    return valid
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash if the stored cost is outdated"""
+    return _hash_executor.submit(_verify_and_update, plain_password, hashed_password).result()
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    # DEBUG LOG
-    print(">>> [get_password_hash] password repr:", repr(password))
-    print(">>> [get_password_hash] type:", type(password))
     try:
-        password_bytes = password.encode("utf-8")
-        print(">>> [get_password_hash] byte length:", len(password_bytes))
+        return _hash_executor.submit(_hash, password).result()
     except Exception as e:
-        print(">>> [get_password_hash] ERROR encoding password:", e)
-        raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Awaitable verify_password for async handlers"""
+    valid, _ = await verify_and_update_password_async(plain_password, hashed_password)
+    return valid
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Awaitable verify_and_update_password for async handlers"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, _verify_and_update, plain_password, hashed_password
+    )
+
 
-    # Now actually hash
+async def get_password_hash_async(password: str) -> str:
+    """Awaitable get_password_hash for async handlers"""
+    loop = asyncio.get_running_loop()
     try:
-        return pwd_context.hash(password)
+        return await loop.run_in_executor(_hash_executor, _hash, password)
     except Exception as e:
-        print(">>> [get_password_hash] HASH ERROR:", e)
-        # re-raise as HTTPException so we see it clearly
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
@@ -0,0 +1,172 @@
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import case, exists, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Cycle, User, UserCycleStats
+from app.services.cycle_prediction import next_period_date
+
+# risk rules and predictions look at the latest six cycles
+STATS_WINDOW = 6
+SKIPPED_PERIOD_DAYS = 45
+
+AGGREGATE_COLUMNS = (
+    "cycle_count",
+    "length_sum",
+    "length_sum_sq",
+    "min_length",
+    "max_length",
+    "skipped_count",
+    "last_period_date",
+    "next_predicted_date",
+)
+
+
+def _upsert(db: AsyncSession):
+    """INSERT ... ON CONFLICT (user_id) DO UPDATE for the session's backend"""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(UserCycleStats)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={**{name: stmt.excluded[name] for name in AGGREGATE_COLUMNS}, "updated_at": func.now()},
+    )
+
+
+def _aggregates(cycles) -> List:
+    """SELECT list over rows with cycle_length and last_period_date columns"""
+    length = cycles.c.cycle_length
+    return [
+        func.count(),
+        func.coalesce(func.sum(length), 0),
+        func.coalesce(func.sum(length * length), 0),
+        func.min(length),
+        func.max(length),
+        func.coalesce(func.sum(case((length > SKIPPED_PERIOD_DAYS, 1), else_=0)), 0),
+        func.max(cycles.c.last_period_date),
+    ]
+
+
+def _stats_values(user_id: UUID, row: Sequence) -> Dict:
+    count, total, total_sq, shortest, longest, skipped, last = row
+    return {
+        "user_id": user_id,
+        "cycle_count": count,
+        "length_sum": total,
+        "length_sum_sq": total_sq,
+        "min_length": shortest,
+        "max_length": longest,
+        "skipped_count": skipped,
+        "last_period_date": last,
+        "next_predicted_date": next_period_date(last, total / count) if count else None,
+    }
+
+
+def stats_from_cycles(user_id: UUID, cycles: Sequence[Cycle]) -> UserCycleStats:
+    """Unsaved stats for cycles already loaded newest first"""
+    recent = cycles[:STATS_WINDOW]
+    lengths = [c.cycle_length for c in recent]
+    row = (
+        len(lengths),
+        sum(lengths),
+        sum(n * n for n in lengths),
+        min(lengths, default=None),
+        max(lengths, default=None),
+        sum(1 for n in lengths if n > SKIPPED_PERIOD_DAYS),
+        max((c.last_period_date for c in recent), default=None),
+    )
+    return UserCycleStats(**_stats_values(user_id, row))
+
+
+async def get_cycle_stats(db: AsyncSession, *, user_id: UUID) -> Optional[UserCycleStats]:
+    return await db.scalar(select(UserCycleStats).where(UserCycleStats.user_id == user_id))
+
+
+async def refresh_cycle_stats(db: AsyncSession, *, user_id: UUID) -> None:
+    """
+    Recompute the user's stats inside the caller's transaction; call it after
+    any cycle insert, update or delete and before the commit.
+    """
+    # Serialize cycle writers per user so the aggregate below sees every
+    # committed cycle (SQLite has no FOR UPDATE and locks the whole file)
+    await db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+    window = (
+        select(Cycle.cycle_length, Cycle.last_period_date)
+        .where(Cycle.user_id == user_id)
+        .order_by(Cycle.last_period_date.desc(), Cycle.id.desc())
+        .limit(STATS_WINDOW)
+        .subquery()
+    )
+    row = (await db.execute(select(*_aggregates(window)))).one()
+    await db.execute(_upsert(db).values(**_stats_values(user_id, row)))
+
+
+async def check_cycle_stats(db: AsyncSession, *, fix: bool = False) -> Dict:
+    """
+    Rebuild every user's stats from the cycles table and compare them with
+    user_cycle_stats. With `fix`, missing or wrong rows are rewritten.
+    """
+    ranked = select(
+        Cycle.user_id,
+        Cycle.cycle_length,
+        Cycle.last_period_date,
+        func.row_number()
+        .over(
+            partition_by=Cycle.user_id,
+            order_by=(Cycle.last_period_date.desc(), Cycle.id.desc()),
+        )
+        .label("position"),
+    ).subquery()
+    expected = (
+        select(ranked.c.user_id, *_aggregates(ranked))
+        .where(ranked.c.position <= STATS_WINDOW)
+        .group_by(ranked.c.user_id)
+    )
+
+    report = {"checked": 0, "missing": 0, "mismatched": 0, "orphaned": 0, "users": []}
+    repairs = []
+
+    result = await db.stream(expected.execution_options(yield_per=1000))
+    async for rows in result.partitions():
+        stored = {
+            s.user_id: s
+            for s in (
+                await db.scalars(
+                    select(UserCycleStats).where(
+                        UserCycleStats.user_id.in_([row[0] for row in rows])
+                    )
+                )
+            ).all()
+        }
+        for row in rows:
+            report["checked"] += 1
+            values = _stats_values(row[0], row[1:])
+            current = stored.get(row[0])
+            if current is None:
+                report["missing"] += 1
+            elif any(getattr(current, name) != values[name] for name in AGGREGATE_COLUMNS):
+                report["mismatched"] += 1
+            else:
+                continue
+            report["users"].append(str(row[0]))
+            repairs.append(values)
+
+    # stats still claiming cycles for users who have none left
+    orphaned = (
+        await db.scalars(
+            select(UserCycleStats.user_id).where(
+                UserCycleStats.cycle_count > 0,
+                ~exists().where(Cycle.user_id == UserCycleStats.user_id),
+            )
+        )
+    ).all()
+    report["orphaned"] = len(orphaned)
+    report["users"].extend(str(user_id) for user_id in orphaned)
+    repairs.extend(_stats_values(user_id, (0, 0, 0, None, None, 0, None)) for user_id in orphaned)
+
+    if fix and repairs:
+        await db.execute(_upsert(db), repairs)
+        await db.commit()
+    return report
@@ -1,34 +1,225 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import math
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Integer, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from uuid import UUID
 
 from app.models.models import Cycle, SymptomLog
 
 
-def get_average_cycle_length(db: Session, *, user_id: UUID):
+class days_between(FunctionElement):
+    """Whole days from the second date to the first"""
+
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(days_between)
+def _days_between(element, compiler, **kw):
+    later, earlier = list(element.clauses)
+    # date - date is an integer number of days on Postgres
+    return f"({compiler.process(later, **kw)} - {compiler.process(earlier, **kw)})"
+
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    later, earlier = list(element.clauses)
     return (
-        db.query(func.avg(func.date_part("day", Cycle.cycle_end_date - Cycle.cycle_start_date)))
-        .filter(
-            Cycle.user_id == user_id,
-            Cycle.cycle_end_date.isnot(None),
-        )
-        .scalar()
+        f"CAST(julianday({compiler.process(later, **kw)})"
+        f" - julianday({compiler.process(earlier, **kw)}) AS INTEGER)"
     )
 
 
-def get_last_cycle(db: Session, *, user_id: UUID):
+def _cycle_gaps(user_id: UUID):
+    """
+    One row per period start, oldest first, with the observed length of the
+    cycle that ended there (NULL for the first) and its 1-based position.
+    """
+    ordered = {"order_by": (Cycle.last_period_date, Cycle.id)}
     return (
-        db.query(Cycle)
-        .filter(Cycle.user_id == user_id)
-        .order_by(Cycle.cycle_start_date.desc())
-        .first()
+        select(
+            Cycle.last_period_date,
+            Cycle.period_length,
+            days_between(
+                Cycle.last_period_date,
+                func.lag(Cycle.last_period_date).over(**ordered),
+            ).label("gap"),
+            func.row_number().over(**ordered).label("position"),
+        )
+        .where(Cycle.user_id == user_id)
+        .subquery()
     )
 
 
-def get_symptoms_summary(db: Session, *, user_id: UUID):
-    total = (
-        db.query(func.count(SymptomLog.id))
-        .filter(SymptomLog.user_id == user_id)
-        .scalar()
+async def get_average_cycle_length(db: AsyncSession, *, user_id: UUID) -> Optional[float]:
+    gaps = _cycle_gaps(user_id)
+    avg = await db.scalar(select(func.avg(gaps.c.gap)))
+    return round(float(avg), 1) if avg is not None else None
+
+
+async def get_last_cycle(db: AsyncSession, *, user_id: UUID) -> Optional[Dict]:
+    gaps = _cycle_gaps(user_id)
+    row = (
+        await db.execute(
+            select(gaps.c.last_period_date, gaps.c.gap, gaps.c.period_length)
+            .where(gaps.c.gap.isnot(None))
+            .order_by(gaps.c.position.desc())
+            .limit(1)
+        )
+    ).first()
+    if row is None:
+        return None
+
+    end, gap, period_length = row
+    return {
+        "cycle_start_date": end - timedelta(days=gap),
+        "cycle_end_date": end - timedelta(days=1),
+        "cycle_length_days": gap,
+        "period_length": period_length,
+    }
+
+
+async def get_cycle_summary(db: AsyncSession, *, user_id: UUID) -> Dict:
+    """Cycle-length statistics and symptom counts, in one round-trip"""
+    gaps = _cycle_gaps(user_id)
+    observed = gaps.c.gap.isnot(None)
+    x = gaps.c.position
+
+    def symptom_count(*where):
+        return (
+            select(func.count())
+            .select_from(SymptomLog)
+            .where(SymptomLog.user_id == user_id, *where)
+            .scalar_subquery()
+        )
+
+    row = (
+        await db.execute(
+            select(
+                func.count(),
+                func.count(gaps.c.gap),
+                func.sum(gaps.c.gap),
+                func.sum(gaps.c.gap * gaps.c.gap),
+                func.min(gaps.c.gap),
+                func.max(gaps.c.gap),
+                func.max(gaps.c.last_period_date),
+                # sums for a least-squares slope of gap against position
+                func.sum(x).filter(observed),
+                func.sum(x * x).filter(observed),
+                func.sum(x * gaps.c.gap),
+                symptom_count(),
+                symptom_count(SymptomLog.log_date >= date.today() - timedelta(days=30)),
+            ).select_from(gaps)
+        )
+    ).one()
+
+    count, n, s, ss, shortest, longest, last, sx, sxx, sxy, logs, recent_logs = row
+    mean = stdev = trend = None
+    if n:
+        mean = round(s / n, 1)
+    if n >= 2:
+        stdev = round(math.sqrt(max((ss - s * s / n) / (n - 1), 0.0)), 2)
+        spread = n * sxx - sx * sx
+        trend = round((n * sxy - sx * s) / spread, 3) if spread else 0.0
+
+    return {
+        "cycle_count": count,
+        "observed_cycles": n,
+        "average_cycle_length_days": mean,
+        "shortest_cycle_days": shortest,
+        "longest_cycle_days": longest,
+        "cycle_length_stdev_days": stdev,
+        "trend_days_per_cycle": trend,
+        "last_period_date": last,
+        "symptom_logs_total": logs,
+        "symptom_logs_last_30_days": recent_logs,
+    }
+
+
+async def get_rolling_averages(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    window: int,
+    limit: int,
+) -> List[Dict]:
+    """
+    Average of each observed cycle and the `window - 1` before it, for the
+    latest `limit` cycles with a full window, oldest first.
+    """
+    gaps = _cycle_gaps(user_id)
+    frame = {"order_by": gaps.c.position, "rows": (-(window - 1), 0)}
+    rolling = (
+        select(
+            gaps.c.last_period_date,
+            gaps.c.gap,
+            gaps.c.position,
+            func.avg(gaps.c.gap).over(**frame).label("average"),
+            func.count(gaps.c.gap).over(**frame).label("filled"),
+        )
+        .where(gaps.c.gap.isnot(None))
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            select(rolling.c.last_period_date, rolling.c.gap, rolling.c.average)
+            .where(rolling.c.filled == window)
+            .order_by(rolling.c.position.desc())
+            .limit(limit)
+        )
+    ).all()
+
+    return [
+        {
+            # the cycle ran from the previous period start up to this one
+            "cycle_start_date": end - timedelta(days=gap),
+            "cycle_length_days": gap,
+            "rolling_average_days": round(float(average), 1),
+        }
+        for end, gap, average in reversed(rows)
+    ]
+
+
+async def get_symptoms_summary(db: AsyncSession, *, user_id: UUID):
+    total = await db.scalar(
+        select(func.count(SymptomLog.id))
+        .where(SymptomLog.user_id == user_id)
     )
     return total
+
+
+def _tag_rows(db: AsyncSession):
+    """SymptomLog.tags expanded to one row per tag, as column `value`"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.unnest(SymptomLog.tags).table_valued("value").render_derived()
+    # tags are JSON on SQLite; json_each names its column "value" too
+    return func.json_each(SymptomLog.tags).table_valued("value")
+
+
+async def get_symptom_tag_counts(db: AsyncSession, *, user_id: UUID, days: int) -> Dict:
+    """How many of the user's logs over the last `days` carry each tag"""
+    since = date.today() - timedelta(days=days - 1)
+    in_window = (SymptomLog.user_id == user_id, SymptomLog.log_date >= since)
+
+    tags = _tag_rows(db)
+    logs = await db.scalar(select(func.count()).select_from(SymptomLog).where(*in_window))
+    rows = (
+        await db.execute(
+            select(tags.c.value, func.count().label("logs"))
+            .select_from(SymptomLog)
+            .join(tags, true())
+            .where(*in_window)
+            .group_by(tags.c.value)
+            .order_by(func.count().desc(), tags.c.value)
+        )
+    ).all()
+
+    return {
+        "since": since,
+        "logs": logs,
+        "tags": [{"tag": tag, "logs": count} for tag, count in rows],
+    }
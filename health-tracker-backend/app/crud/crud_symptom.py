@@ -1,36 +1,302 @@
-from sqlalchemy.orm import Session
+import html
+import re
+from datetime import date
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
+from typing import Dict, Iterable, List, Literal, Optional
 
+from app.core.pagination import date_range
 from app.models.models import SymptomLog
 from app.schemas.symptom import SymptomCreate
+from app.services.risk_engine import symptom_tags
 
 
-def create_symptom(
-    db: Session,
+def _insert(db: AsyncSession):
+    """INSERT construct with ON CONFLICT support for the session's backend"""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(SymptomLog)
+
+
+async def create_symptom(
+    db: AsyncSession,
     *,
     user_id: UUID,
     symptom_in: SymptomCreate,
-) -> SymptomLog:
-    symptom = SymptomLog(
-        user_id=user_id,
-        log_date=symptom_in.log_date,
-        notes=symptom_in.notes,
-    )
-    db.add(symptom)
-    db.commit()
-    db.refresh(symptom)
+) -> Optional[SymptomLog]:
+    """Insert a log, or return None if one already exists for that day (one statement)"""
+    stmt = (
+        _insert(db)
+        .values(
+            user_id=user_id,
+            log_date=symptom_in.log_date,
+            notes=symptom_in.notes,
+            tags=symptom_tags(symptom_in.notes),
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "log_date"])
+        .returning(SymptomLog)
+    )
+    symptom = await db.scalar(stmt)
+    await db.commit()
     return symptom
 
 
-def get_symptoms_by_user(
-    db: Session,
+async def upsert_symptoms(
+    db: AsyncSession,
     *,
     user_id: UUID,
+    symptoms_in: Iterable[SymptomCreate],
 ) -> List[SymptomLog]:
-    return (
-        db.query(SymptomLog)
-        .filter(SymptomLog.user_id == user_id)
+    """Insert or overwrite one log per day in a single statement"""
+    # Last entry wins when a batch repeats a day; ON CONFLICT cannot touch
+    # the same row twice in one statement.
+    by_date = {s.log_date: s.notes for s in symptoms_in}
+    if not by_date:
+        return []
+
+    stmt = _insert(db).values(
+        [
+            {"user_id": user_id, "log_date": log_date, "notes": notes, "tags": symptom_tags(notes)}
+            for log_date, notes in by_date.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "log_date"],
+        set_={"notes": stmt.excluded.notes, "tags": stmt.excluded.tags},
+    ).returning(SymptomLog)
+    symptoms = list((await db.scalars(stmt)).all())
+    await db.commit()
+    return sorted(symptoms, key=lambda s: s.log_date)
+
+
+async def update_symptom(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    symptom_id: UUID,
+    values: Dict,
+) -> Optional[SymptomLog]:
+    """UPDATE ... RETURNING; None when the log does not exist for this user"""
+    if not values:
+        return await db.scalar(
+            select(SymptomLog).where(
+                SymptomLog.id == symptom_id,
+                SymptomLog.user_id == user_id,
+            )
+        )
+
+    if "notes" in values:
+        values = {**values, "tags": symptom_tags(values["notes"])}
+
+    symptom = await db.scalar(
+        update(SymptomLog)
+        .where(SymptomLog.id == symptom_id, SymptomLog.user_id == user_id)
+        .values(**values)
+        .returning(SymptomLog)
+    )
+    await db.commit()
+    return symptom
+
+
+async def delete_symptom(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    symptom_id: UUID,
+) -> bool:
+    """DELETE ... RETURNING; False when nothing was deleted"""
+    deleted = await db.scalar(
+        delete(SymptomLog)
+        .where(SymptomLog.id == symptom_id, SymptomLog.user_id == user_id)
+        .returning(SymptomLog.id)
+    )
+    await db.commit()
+    return deleted is not None
+
+
+async def get_symptoms_by_user(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+) -> List[SymptomLog]:
+    result = await db.execute(
+        select(SymptomLog)
+        .where(SymptomLog.user_id == user_id)
         .order_by(SymptomLog.log_date.desc())
-        .all()
     )
+    return list(result.scalars().all())
+
+
+SearchOrder = Literal["rank", "recent"]
+
+# how matched words are marked in search snippets; the rest is HTML-escaped
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+# ts_headline marks matches with these control characters (stripped from the
+# notes first), so the snippet can be escaped before the tags go in
+_SEL_START, _SEL_STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = f"StartSel={_SEL_START}, StopSel={_SEL_STOP}, MinWords=5, MaxWords=20, MaxFragments=2"
+_SNIPPET_CONTEXT = 60  # characters either side of the first match (fallback)
+
+
+async def search_symptoms(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    q: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    order: SearchOrder = "rank",
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Dict]:
+    """
+    The user's logs whose notes match `q`, best match (or newest) first,
+    each with its rank and a highlighted snippet.
+    """
+    filters = [SymptomLog.user_id == user_id, *date_range(SymptomLog.log_date, date_from, date_to)]
+
+    if db.get_bind().dialect.name == "postgresql":
+        return await _search_postgres(db, q, filters, order, skip, limit)
+    return await _search_portable(db, q, filters, order, skip, limit)
+
+
+async def _search_postgres(db, q, filters, order, skip, limit) -> List[Dict]:
+    # websearch syntax: "exact phrase", or, -excluded; stemmed, stop words dropped
+    query = func.websearch_to_tsquery("english", q)
+    search_vector = SymptomLog.__table__.c.search_vector
+    rank = func.ts_rank_cd(search_vector, query).label("rank")
+    hits = (
+        select(SymptomLog.id, SymptomLog.log_date, SymptomLog.notes, rank)
+        .where(*filters, search_vector.bool_op("@@")(query))
+        .order_by(*_search_order(order, SymptomLog.log_date, SymptomLog.id, rank))
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    # ts_headline re-parses the text, so it runs for this page only
+    rows = await db.execute(
+        select(
+            hits.c.id,
+            hits.c.log_date,
+            hits.c.notes,
+            hits.c.rank,
+            func.ts_headline(
+                "english",
+                func.translate(hits.c.notes, _SEL_START + _SEL_STOP, ""),
+                query,
+                _HEADLINE_OPTIONS,
+            ).label("headline"),
+        ).order_by(*_search_order(order, hits.c.log_date, hits.c.id, hits.c.rank))
+    )
+    return [
+        {
+            "id": row.id,
+            "log_date": row.log_date,
+            "notes": row.notes,
+            "rank": row.rank,
+            "snippet": html.escape(row.headline)
+            .replace(_SEL_START, HIGHLIGHT_START)
+            .replace(_SEL_STOP, HIGHLIGHT_STOP),
+        }
+        for row in rows
+    ]
+
+
+async def _search_portable(db, q, filters, order, skip, limit) -> List[Dict]:
+    """Case-insensitive substring match on every word; ranked by occurrences"""
+    terms = list(dict.fromkeys(re.findall(r"\w+", q.lower())))
+    if not terms:
+        return []
+
+    notes = func.lower(SymptomLog.notes)
+    rank = sum(
+        (func.length(notes) - func.length(func.replace(notes, term, ""))) // len(term)
+        for term in terms
+    ).label("rank")
+    rows = await db.execute(
+        select(SymptomLog.id, SymptomLog.log_date, SymptomLog.notes, rank)
+        .where(*filters, *(notes.contains(term, autoescape=True) for term in terms))
+        .order_by(*_search_order(order, SymptomLog.log_date, SymptomLog.id, rank))
+        .offset(skip)
+        .limit(limit)
+    )
+    return [
+        {**row._mapping, "rank": float(row.rank), "snippet": _snippet(row.notes, terms)}
+        for row in rows
+    ]
+
+
+def _search_order(order: SearchOrder, log_date, log_id, rank) -> tuple:
+    newest = (log_date.desc(), log_id.desc())
+    return newest if order == "recent" else (rank.desc(), *newest)
+
+
+def _snippet(notes: str, terms: List[str]) -> str:
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    first = pattern.search(notes)
+    start = max(first.start() - _SNIPPET_CONTEXT, 0) if first else 0
+    end = min((first.end() if first else 0) + _SNIPPET_CONTEXT, len(notes))
+    # escape the text between matches, not the whole note: a term could
+    # otherwise match inside an entity such as "&lt;"
+    parts, last = [], start
+    for match in pattern.finditer(notes, start, end):
+        parts += [
+            html.escape(notes[last:match.start()]),
+            HIGHLIGHT_START,
+            html.escape(match.group(0)),
+            HIGHLIGHT_STOP,
+        ]
+        last = match.end()
+    parts.append(html.escape(notes[last:end]))
+    return f"{'...' if start else ''}{''.join(parts)}{'...' if end < len(notes) else ''}"
+
+
+async def backfill_symptom_tags(
+    db: AsyncSession,
+    *,
+    batch_size: int = 1000,
+    retag: bool = False,
+) -> int:
+    """
+    Set tags on logs written before they existed (or on every log, with
+    retag, after the keyword list changes). Walks the table by id and
+    commits each batch, so it can run against a live database and resume.
+    A row edited between the read and the write keeps the tags its write
+    set: the UPDATE only applies while notes (and, without retag, the
+    missing tags) are still what was read.
+    """
+    table = SymptomLog.__table__
+    tag = (
+        update(table)
+        .where(
+            table.c.id == bindparam("log_id"),
+            table.c.notes.is_not_distinct_from(bindparam("old_notes")),
+        )
+        .values(tags=bindparam("new_tags"))
+    )
+    if not retag:
+        tag = tag.where(table.c.tags.is_(None))
+
+    updated = 0
+    last_id = None
+    while True:
+        stmt = select(table.c.id, table.c.notes).order_by(table.c.id).limit(batch_size)
+        if not retag:
+            stmt = stmt.where(table.c.tags.is_(None))
+        if last_id is not None:
+            stmt = stmt.where(table.c.id > last_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return updated
+
+        await db.execute(
+            tag,
+            [
+                {"log_id": row.id, "old_notes": row.notes, "new_tags": symptom_tags(row.notes)}
+                for row in rows
+            ],
+        )
+        await db.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
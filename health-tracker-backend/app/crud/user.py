@@ -1,46 +1,54 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
 from app.models.models import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_and_update_password_async
+from app.core.auth_cache import user_cache
 
-def get_user_by_id(db: Session, user_id: UUID) -> Optional[User]:
+async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
     """Get user by ID"""
-    return db.query(User).filter(User.id == user_id).first()
+    return await db.get(User, user_id)
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email"""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def create_user(db: Session, user_in: UserCreate) -> User:
+async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     """Create new user"""
     db_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password)
+        hashed_password=await get_password_hash_async(user_in.password)
     )
     db.add(db_user)
     try:
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise ValueError("User with this email already exists")
 
-def authenticate(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate user"""
-    user = get_user_by_email(db, email)
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Stored hash uses a different bcrypt cost; upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
-def update_user(db: Session, user_id: UUID, user_in: UserUpdate) -> Optional[User]:
+async def update_user(db: AsyncSession, user_id: UUID, user_in: UserUpdate) -> Optional[User]:
     """Update user"""
-    user = get_user_by_id(db, user_id)
+    user = await get_user_by_id(db, user_id)
     if not user:
         return None
     
@@ -48,16 +56,29 @@ def update_user(db: Session, user_id: UUID, user_in: UserUpdate) -> Optional[Use
     for field, value in update_data.items():
         setattr(user, field, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user_id)
     return user
 
-def update_password(db: Session, user_id: UUID, new_password: str) -> bool:
+async def update_password(db: AsyncSession, user_id: UUID, new_password: str) -> bool:
     """Update user password"""
-    user = get_user_by_id(db, user_id)
+    user = await get_user_by_id(db, user_id)
     if not user:
         return False
     
-    user.hashed_password = get_password_hash(new_password)
-    db.commit()
+    user.hashed_password = await get_password_hash_async(new_password)
+    await db.commit()
+    user_cache.invalidate(user_id)
+    return True
+
+async def deactivate_user(db: AsyncSession, user_id: UUID) -> bool:
+    """Deactivate user"""
+    user = await get_user_by_id(db, user_id)
+    if not user:
+        return False
+    
+    user.is_active = False
+    await db.commit()
+    user_cache.invalidate(user_id)
     return True
\ No newline at end of file
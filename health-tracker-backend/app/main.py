@@ -1,15 +1,45 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.database import dispose_engines, get_async_engine
+from app.core.db_metrics import DB_HEADERS, QueryStatsMiddleware, instrument_queries, render_queries
+from app.core.metrics import PrometheusText, RequestMetricsMiddleware, render_calls, render_requests
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import shutdown_hash_executor
 from app.api.v1.api import api_router
+from app.services.ai_service_gemini import gemini_metrics, get_ai_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the engine (no connection is opened until the first query);
+    # the schema is managed by Alembic, not created here.
+    get_async_engine()
+    yield
+    if get_ai_service.cache_info().currsize:
+        get_ai_service().close()
+    shutdown_hash_executor()
+    await dispose_engines()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     debug=settings.DEBUG,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
 )
 
+# SQL per request: totals per route always, X-DB-* headers in debug
+instrument_queries()
+app.add_middleware(
+    QueryStatsMiddleware,
+    headers=settings.DEBUG,
+    repeat_threshold=settings.DB_REPEATED_QUERY_THRESHOLD,
+)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,8 +51,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, *(DB_HEADERS if settings.DEBUG else [])],
 )
 
+# Outermost, so latency covers every other middleware
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -33,3 +67,12 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+# Prometheus scrape target; async, so it answers even with the threadpool busy
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    out = PrometheusText()
+    render_requests(out)
+    render_queries(out)
+    render_calls(out, "gemini", gemini_metrics)
+    return Response(out.render(), media_type=PrometheusText.CONTENT_TYPE)
@@ -1,5 +1,6 @@
 from sqlalchemy import (
     Column,
+    Computed,
     String,
     Integer,
     DateTime,
@@ -9,16 +10,30 @@ from sqlalchemy import (
     DECIMAL,
     ARRAY,
     ForeignKey,
+    Index,
+    JSON,
     UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.sql import func
+import math
 import uuid
 
 from app.core.database import Base
 
 
+@compiles(CreateColumn)
+def _create_column(element, compiler, **kw):
+    # columns marked postgresql_only (generated from Postgres functions) are
+    # left out of CREATE TABLE elsewhere, e.g. SQLite test databases
+    if element.element.info.get("postgresql_only") and compiler.dialect.name != "postgresql":
+        return None
+    return compiler.visit_create_column(element, **kw)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -65,14 +80,30 @@ class SymptomLog(Base):
     log_date = Column(Date, nullable=False)
 
     notes = Column(Text)
+    # normalized symptom keywords found in notes, set on every write;
+    # NULL only for rows the backfill has not reached yet
+    tags = Column(ARRAY(String).with_variant(JSON(), "sqlite"))
+    # full-text search document, maintained by Postgres. A table column only:
+    # it is left out of the mapper so the ORM never loads it or fetches it
+    # back after an insert (see crud_symptom.search_symptoms)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(notes, ''))", persisted=True),
+        info={"postgresql_only": True},
+    )
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="symptom_logs")
 
     __table_args__ = (
+        # also the (user_id, log_date) index for per-user date lookups and paging
         UniqueConstraint("user_id", "log_date", name="unique_user_log_date"),
+        # tag containment / overlap filters (tags @> ..., tags && ...)
+        Index("ix_symptom_logs_tags", "tags", postgresql_using="gin"),
+        Index("ix_symptom_logs_search", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
     )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
 
 class AIInsight(Base):
@@ -88,6 +119,11 @@ class AIInsight(Base):
 
     user = relationship("User", back_populates="ai_insights")
 
+    __table_args__ = (
+        # newest-first listing and keyset paging per user
+        Index("ix_ai_insights_user_created", "user_id", created_at.desc(), id.desc()),
+    )
+
 
 # class Cycle(Base):
 #     __tablename__ = "cycles"
@@ -128,6 +164,44 @@ class Cycle(Base):
 
     user = relationship("User", back_populates="cycles")
 
+    __table_args__ = (
+        # every cycle query is per user, latest period first
+        Index("ix_cycles_user_last_period", "user_id", last_period_date.desc()),
+    )
+
+
+
+class UserCycleStats(Base):
+    __tablename__ = "user_cycle_stats"
+
+    # Read model over the user's latest cycles (crud_cycle_stats.STATS_WINDOW),
+    # rewritten in the same transaction as every cycle insert or delete
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    cycle_count = Column(Integer, nullable=False, default=0)
+    length_sum = Column(Integer, nullable=False, default=0)
+    length_sum_sq = Column(Integer, nullable=False, default=0)
+    min_length = Column(Integer)
+    max_length = Column(Integer)
+    skipped_count = Column(Integer, nullable=False, default=0)  # cycles over 45 days
+
+    last_period_date = Column(Date)
+    next_predicted_date = Column(Date)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def mean_length(self):
+        return self.length_sum / self.cycle_count if self.cycle_count else None
+
+    @property
+    def stdev_length(self):
+        """Sample standard deviation, as statistics.stdev gives"""
+        n = self.cycle_count
+        if n < 2:
+            return None
+        variance = (self.length_sum_sq - self.length_sum ** 2 / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
 
 
 class UserSettings(Base):
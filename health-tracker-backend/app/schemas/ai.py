@@ -3,6 +3,8 @@ from typing import Optional, Literal
 from datetime import datetime
 from uuid import UUID
 
+from app.schemas.cycle import CyclePrediction
+
 
 class AIAnalysisRequest(BaseModel):
     days: int = Field(default=30, ge=1, le=365, description="Number of days to analyze")
@@ -41,8 +43,9 @@ class AICyclePredictionResponse(BaseModel):
     predicted_start_date: Optional[str]
     average_cycle_length: Optional[float]
     confidence: Optional[str]
-    analysis: str
+    analysis: str = ""  # only filled when an explanation is asked for
     message: Optional[str] = None
+    forecast: Optional[CyclePrediction] = None
 
 class AIAsk(BaseModel):
     question: str
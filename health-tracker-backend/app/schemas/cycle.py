@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import List
+from typing import Dict, List
 from uuid import UUID
 
 
@@ -21,7 +21,29 @@ class CycleResponse(BaseModel):
         from_attributes = True
 
 
+class DateRange(BaseModel):
+    start: date
+    end: date
+
+
 class CyclePrediction(BaseModel):
     next_period: date
-    upcoming_periods: List[date]
+    upcoming_periods: List[date]  # next_period first
     is_irregular: bool
+
+    # one entry per upcoming period, in the same order
+    period_intervals: List[DateRange]  # likely range for each start (80%)
+    fertile_windows: List[DateRange]  # estimated, in the cycle before each start
+
+    average_cycle_length: float  # weighted toward recent cycles
+    cycle_length_stdev: float
+    based_on_cycles: int
+
+
+class CycleCalendar(BaseModel):
+    start: date
+    end: date
+    # one letter per day from start: M menstrual, F follicular, O ovulation,
+    # L luteal; lowercase when predicted, "-" when there is no cycle data
+    phases: str
+    symptoms: Dict[date, List[str]]  # logged days only, with their tags
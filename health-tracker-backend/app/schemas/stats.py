@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 
@@ -8,9 +8,47 @@ class AverageCycleResponse(BaseModel):
 
 
 class LastCycleResponse(BaseModel):
+    # the latest completed cycle: previous period start to the day before the latest
     cycle_start_date: date
     cycle_end_date: Optional[date]
+    cycle_length_days: int
+    period_length: int
 
 
 class SymptomsSummaryResponse(BaseModel):
     total_logs: int
+
+
+class CycleSummaryResponse(BaseModel):
+    cycle_count: int
+    observed_cycles: int  # gaps between consecutive period start dates
+    average_cycle_length_days: Optional[float]
+    shortest_cycle_days: Optional[int]
+    longest_cycle_days: Optional[int]
+    cycle_length_stdev_days: Optional[float]
+    trend_days_per_cycle: Optional[float]  # least-squares slope; > 0 means lengthening
+    last_period_date: Optional[date]
+    symptom_logs_total: int
+    symptom_logs_last_30_days: int
+
+
+class RollingAveragePoint(BaseModel):
+    cycle_start_date: date
+    cycle_length_days: int
+    rolling_average_days: float
+
+
+class RollingAverageResponse(BaseModel):
+    window: int
+    points: List[RollingAveragePoint]
+
+
+class SymptomTagCount(BaseModel):
+    tag: str
+    logs: int
+
+
+class SymptomTagsResponse(BaseModel):
+    since: date
+    logs: int  # all logs in the window, tagged or not
+    tags: List[SymptomTagCount]  # most frequent first
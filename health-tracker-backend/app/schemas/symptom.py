@@ -2,6 +2,12 @@ from datetime import date, datetime
 from uuid import UUID
 from pydantic import BaseModel
 
+
+class SymptomCreate(BaseModel):
+    log_date: date
+    notes: str
+
+
 class SymptomLogResponse(BaseModel):
     id: UUID
     user_id: UUID
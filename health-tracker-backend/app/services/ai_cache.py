@@ -0,0 +1,57 @@
+import hashlib
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.core.cache import build_backend
+from app.core.config import settings
+
+
+class AIResponseCache:
+    """
+    Gemini responses keyed by a hash of the full prompt, i.e. the formatted
+    user context plus the prompt template. Unchanged health data therefore
+    maps to the same entry; writes drop the user's entries early.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _prefix(self, user_id: UUID) -> str:
+        return f"ai:{user_id}:"
+
+    def key(self, user_id: UUID, kind: str, prompt: str) -> str:
+        digest = hashlib.sha256(f"{kind}\0{prompt}".encode("utf-8")).hexdigest()
+        return f"{self._prefix(user_id)}{kind}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self.backend.delete_prefix(self._prefix(user_id))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# ✅ Singleton
+ai_cache = AIResponseCache(
+    build_backend(settings.AI_CACHE_URL, settings.AI_CACHE_MAX_ENTRIES),
+    ttl=settings.AI_CACHE_TTL_SECONDS,
+)
@@ -1,10 +1,18 @@
-import google.generativeai as genai
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, date
-from typing import Dict
-from sqlalchemy.orm import Session
+from functools import lru_cache, partial
+from typing import AsyncIterator, Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import CallMetrics
+from app.services.ai_cache import ai_cache
+from app.services.cycle_prediction import forecast_for_user, predict_from_forecast
 from app.models.models import (
     UserProfile,
     SymptomLog,
@@ -12,15 +20,38 @@ from app.models.models import (
     AIInsight,
 )
 
+# ✅ Singleton: Gemini latency, failures and abandoned calls, exported on
+# /metrics. Only the calls themselves are timed: not queueing for a slot,
+# nor (when streaming) the client reading the chunks.
+gemini_metrics = CallMetrics()
+
 
 class AIService:
     def __init__(self):
         if not settings.GEMINI_API_KEY:
             raise RuntimeError("❌ GEMINI_API_KEY not set")
 
+        # Imported here: the SDK adds most of a second to process startup
+        import google.generativeai as genai
+
         genai.configure(api_key=settings.GEMINI_API_KEY)
         self.model = genai.GenerativeModel("models/gemini-2.5-flash")
 
+        # The SDK call is blocking, so it runs on a dedicated pool instead of
+        # the event loop. The semaphore caps how many calls wait on Gemini;
+        # a slot is held until its thread returns (see _release_when_done),
+        # so a thread per slot means no call ever waits for a worker.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(settings.AI_WORKER_THREADS, settings.AI_MAX_CONCURRENCY),
+            thread_name_prefix="gemini",
+        )
+        self._semaphore = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+        self._timeout = settings.AI_REQUEST_TIMEOUT_SECONDS
+        self.cache = ai_cache
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     # -------------------------------------------------
     # Helpers
     # -------------------------------------------------
@@ -31,34 +62,128 @@ class AIService:
             (today.month, today.day) < (dob.month, dob.day)
         )
 
-    def _get_user_context(self, db: Session, user_id: UUID) -> Dict:
-        profile = (
-            db.query(UserProfile)
-            .filter(UserProfile.user_id == user_id)
-            .first()
+    def _release_when_done(self, future: Optional[asyncio.Future]) -> None:
+        """
+        Free the concurrency slot once `future`, the caller's last SDK call,
+        has returned. A timeout abandons the call, not its thread: the slot
+        stays taken until Gemini answers, so new calls never queue behind
+        abandoned ones for a worker and real Gemini work stays capped at
+        AI_MAX_CONCURRENCY.
+        """
+
+        def release(done: asyncio.Future) -> None:
+            self._semaphore.release()
+            if not done.cancelled():
+                done.exception()  # nobody awaits an abandoned call's outcome
+
+        if future is None:
+            self._semaphore.release()
+        elif future.done():
+            release(future)
+        else:
+            future.add_done_callback(release)
+
+    async def _generate(self, prompt: str) -> str:
+        """Run a Gemini completion off the event loop with a timeout"""
+        loop = asyncio.get_running_loop()
+        await self._semaphore.acquire()
+        future = None
+        try:
+            start = time.perf_counter()
+            future = loop.run_in_executor(self._executor, self.model.generate_content, prompt)
+            # shielded: on timeout the call keeps running, and keeps its slot
+            response = await asyncio.wait_for(asyncio.shield(future), timeout=self._timeout)
+        except asyncio.CancelledError:
+            gemini_metrics.record_cancelled("generate")
+            raise
+        except Exception as e:
+            gemini_metrics.record("generate", (time.perf_counter() - start) * 1000, e)
+            raise
+        finally:
+            self._release_when_done(future)
+        gemini_metrics.record("generate", (time.perf_counter() - start) * 1000)
+        return response.text.strip()
+
+    async def _generate_cached(
+        self, user_id: UUID, kind: str, prompt: str
+    ) -> Tuple[str, bool]:
+        """Serve a completion from the response cache when the prompt is unchanged"""
+        key = self.cache.key(user_id, kind, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        text = await self._generate(prompt)
+        self.cache.set(key, text)
+        return text, False
+
+    async def _generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield Gemini text chunks as they arrive, pulling each one off-loop"""
+        loop = asyncio.get_running_loop()
+        # time spent waiting on Gemini only, not on the client between chunks
+        waited_ms = 0.0
+        pending = None  # the latest SDK call; the slot is freed once it returns
+
+        async def off_loop(fn, *args):
+            nonlocal waited_ms, pending
+            start = time.perf_counter()
+            pending = loop.run_in_executor(self._executor, fn, *args)
+            try:
+                return await asyncio.wait_for(asyncio.shield(pending), timeout=self._timeout)
+            finally:
+                waited_ms += (time.perf_counter() - start) * 1000
+
+        # one slot for the whole stream, as it is one Gemini call
+        await self._semaphore.acquire()
+        try:
+            try:
+                response = await off_loop(partial(self.model.generate_content, prompt, stream=True))
+                chunks = iter(response)
+                while True:
+                    chunk = await off_loop(next, chunks, None)
+                    if chunk is None:
+                        break
+                    if chunk.text:
+                        yield chunk.text
+            except (asyncio.CancelledError, GeneratorExit):
+                # the client went away mid-stream
+                gemini_metrics.record_cancelled("stream")
+                raise
+            except Exception as e:
+                gemini_metrics.record("stream", waited_ms, e)
+                raise
+            gemini_metrics.record("stream", waited_ms)
+        finally:
+            self._release_when_done(pending)
+
+    async def _get_user_context(self, db: AsyncSession, user_id: UUID) -> Dict:
+        profile = await db.scalar(
+            select(UserProfile).where(UserProfile.user_id == user_id)
         )
 
         # Symptoms (30 days)
         start_date = date.today() - timedelta(days=30)
         symptoms = (
-            db.query(SymptomLog)
-            .filter(
-                SymptomLog.user_id == user_id,
-                SymptomLog.log_date >= start_date,
+            await db.scalars(
+                select(SymptomLog)
+                .where(
+                    SymptomLog.user_id == user_id,
+                    SymptomLog.log_date >= start_date,
+                )
+                .order_by(SymptomLog.log_date.desc())
+                .limit(20)
             )
-            .order_by(SymptomLog.log_date.desc())
-            .limit(20)
-            .all()
-        )
+        ).all()
 
         # Cycles (latest 6)
         cycles = (
-            db.query(Cycle)
-            .filter(Cycle.user_id == user_id)
-            .order_by(Cycle.last_period_date.desc())
-            .limit(6)
-            .all()
-        )
+            await db.scalars(
+                select(Cycle)
+                .where(Cycle.user_id == user_id)
+                .order_by(Cycle.last_period_date.desc())
+                .limit(6)
+            )
+        ).all()
 
         return {
             "profile": profile,
@@ -104,21 +229,10 @@ class AIService:
 
         return text
 
-    # -------------------------------------------------
-    # Public APIs
-    # -------------------------------------------------
-
-    async def analyze_health_data(
-        self,
-        db: Session,
-        user_id: UUID,
-        days: int = 30,
-        analysis_type: str = "comprehensive",
-    ) -> str:
-        ctx = self._get_user_context(db, user_id)
-        formatted = self._format_context(ctx)
+    async def _analysis_prompt(self, db: AsyncSession, user_id: UUID) -> str:
+        formatted = self._format_context(await self._get_user_context(db, user_id))
 
-        prompt = f"""
+        return f"""
 You are a friendly women's health AI.
 
 {formatted}
@@ -132,30 +246,10 @@ Instructions:
 - Suggest doctor visit only if needed
 """
 
-        response = self.model.generate_content(prompt)
-        insight_text = response.text.strip()
-
-        db.add(
-            AIInsight(
-                user_id=user_id,
-                title="AI Health Analysis",
-                content=insight_text,
-            )
-        )
-        db.commit()
-
-        return insight_text
-
-    async def ask_question(
-        self,
-        db: Session,
-        user_id: UUID,
-        question: str,
-    ) -> str:
-        ctx = self._get_user_context(db, user_id)
-        formatted = self._format_context(ctx)
+    async def _question_prompt(self, db: AsyncSession, user_id: UUID, question: str) -> str:
+        formatted = self._format_context(await self._get_user_context(db, user_id))
 
-        prompt = f"""
+        return f"""
 You are an empathetic women's health assistant.
 
 {formatted}
@@ -169,59 +263,122 @@ Rules:
 - NO medical diagnosis
 """
 
-        response = self.model.generate_content(prompt)
-        return response.text.strip()
+    async def _save_insight(self, db: AsyncSession, user_id: UUID, text: str) -> AIInsight:
+        insight = AIInsight(
+            user_id=user_id,
+            title="AI Health Analysis",
+            content=text,
+        )
+        db.add(insight)
+        await db.commit()
+        return insight
 
-    async def predict_next_cycle(
+    # -------------------------------------------------
+    # Public APIs
+    # -------------------------------------------------
+
+    async def analyze_health_data(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: UUID,
-    ) -> Dict:
-        cycles = (
-            db.query(Cycle)
-            .filter(Cycle.user_id == user_id)
-            .order_by(Cycle.last_period_date.desc())
-            .limit(6)
-            .all()
+        days: int = 30,
+        analysis_type: str = "comprehensive",
+    ) -> str:
+        prompt = await self._analysis_prompt(db, user_id)
+        insight_text, cached = await self._generate_cached(
+            user_id, f"analyze:{analysis_type}", prompt
         )
 
-        if not cycles:
-            return {
-                "predicted_start_date": None,
-                "average_cycle_length": None,
-                "confidence": "low",
-                "analysis": "",
-                "message": "Add your cycle data to get predictions.",
-            }
+        # A cache hit means this exact insight was already stored
+        if cached:
+            return insight_text
+
+        await self._save_insight(db, user_id, insight_text)
+        return insight_text
+
+    async def ask_question(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        question: str,
+    ) -> str:
+        prompt = await self._question_prompt(db, user_id, question)
+        return await self._generate(prompt)
 
-        lengths = [c.cycle_length for c in cycles if c.cycle_length]
+    async def stream_analysis(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        days: int = 30,
+        analysis_type: str = "comprehensive",
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of analyze_health_data. The prompt is built now,
+        while the request session is open; the insight is stored with a
+        fresh session once the last chunk has been sent.
+        """
+        prompt = await self._analysis_prompt(db, user_id)
+        key = self.cache.key(user_id, f"analyze:{analysis_type}", prompt)
+
+        async def chunks():
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+            parts = []
+            async for part in self._generate_stream(prompt):
+                parts.append(part)
+                yield part
+
+            insight_text = "".join(parts).strip()
+            self.cache.set(key, insight_text)
+
+            async with AsyncSessionLocal() as session:
+                await self._save_insight(session, user_id, insight_text)
+
+        return chunks()
+
+    async def stream_question(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        question: str,
+    ) -> AsyncIterator[str]:
+        """Streaming variant of ask_question"""
+        prompt = await self._question_prompt(db, user_id, question)
+        return self._generate_stream(prompt)
 
-        avg = round(sum(lengths) / len(lengths), 1)
-        last = cycles[0].last_period_date
-        next_date = last + timedelta(days=int(avg))
+    async def predict_next_cycle(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+    ) -> Dict:
+        """The forecast, with Gemini's explanation of it"""
+        forecast = await forecast_for_user(db, user_id=user_id)
+        prediction = predict_from_forecast(forecast)
+        if forecast is None:
+            return {**prediction, "analysis": ""}
 
+        interval = forecast.period_intervals[0]
         prompt = f"""
-Cycle lengths: {lengths}
-Average: {avg} days
-Last period: {last}
-Next expected: {next_date}
+Cycles logged: {forecast.based_on_cycles}
+Average: {forecast.average_cycle_length} days, varying by about {forecast.cycle_length_stdev} days
+Irregular: {"yes" if forecast.is_irregular else "no"}
+Next expected: {forecast.next_period} (likely between {interval.start} and {interval.end})
 
 Explain this gently and clearly.
 """
 
         try:
-            analysis = self.model.generate_content(prompt).text.strip()
+            analysis, _ = await self._generate_cached(user_id, "predict", prompt)
         except Exception:
-            analysis = "Prediction based on average cycle length."
+            analysis = "Prediction based on your recent cycle lengths."
 
-        return {
-            "predicted_start_date": next_date.isoformat(),
-            "average_cycle_length": avg,
-            "confidence": "high" if len(lengths) >= 4 else "medium",
-            "analysis": analysis,
-            "message": None,
-        }
+        return {**prediction, "analysis": analysis}
 
 
-# ✅ Singleton
-ai_service = AIService()
+# ✅ Singleton, built on first use so importing the app needs no API key
+@lru_cache
+def get_ai_service() -> AIService:
+    return AIService()
@@ -0,0 +1,59 @@
+import json
+from datetime import date
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.core.cache import build_backend
+from app.core.config import settings
+
+
+class CalendarCache:
+    """
+    Computed calendar months keyed by user and month. Predicted days depend
+    on today's date, so the day is part of the key and entries roll over at
+    midnight; cycle and symptom writes drop the user's entries early. An
+    in-process backend is only cleared by its own worker, so it gets the
+    short CALENDAR_CACHE_LOCAL_TTL_SECONDS instead.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    PREFIX = "calendar:"
+
+    @property
+    def shared(self) -> bool:
+        """Whether invalidation here reaches every worker (and the CLI's does)"""
+        return self.backend.shared
+
+    def _prefix(self, user_id: UUID) -> str:
+        return f"{self.PREFIX}{user_id}:"
+
+    def key(self, user_id: UUID, month: date, today: date) -> str:
+        return f"{self._prefix(user_id)}{today.isoformat()}:{month:%Y-%m}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        raw = self.backend.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, month: Dict) -> None:
+        self.backend.set(key, json.dumps(month), self.ttl)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self.backend.delete_prefix(self._prefix(user_id))
+
+    def invalidate_all(self) -> None:
+        """Every user's months, e.g. after symptom tags were recomputed"""
+        self.backend.delete_prefix(self.PREFIX)
+
+
+# ✅ Singleton
+calendar_cache = CalendarCache(
+    build_backend(settings.CALENDAR_CACHE_URL, settings.CALENDAR_CACHE_MAX_ENTRIES),
+    ttl=(
+        settings.CALENDAR_CACHE_TTL_SECONDS
+        if settings.CALENDAR_CACHE_URL
+        else min(settings.CALENDAR_CACHE_TTL_SECONDS, settings.CALENDAR_CACHE_LOCAL_TTL_SECONDS)
+    ),
+)
@@ -0,0 +1,189 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Cycle, SymptomLog
+from app.services.calendar_cache import calendar_cache
+from app.services.cycle_prediction import (
+    LUTEAL_DAYS,
+    MAX_CYCLE_DAYS,
+    MIN_CYCLE_DAYS,
+    forecast_cycles,
+)
+from app.services.risk_engine import log_tags, untagged_notes
+
+MAX_CALENDAR_DAYS = 732  # two years per request
+
+# One letter per day: M menstrual, F follicular, O ovulation, L luteal,
+# lowercase inside a predicted cycle, "-" where there is no cycle data.
+# Indexed by the phase numbers day_phases computes.
+PHASE_LETTERS = np.frombuffer(b"-MFOLmfol", dtype=np.uint8)
+OVULATION_DAYS = 1  # the ovulation phase is the estimated day +/- this
+
+# (period start, entered cycle length, period length), oldest first
+CycleRow = Tuple[date, int, int]
+
+
+def cycle_arrays(cycles: Sequence[CycleRow], until: date, today: date) -> Tuple[np.ndarray, ...]:
+    """
+    Starts, lengths, period lengths and a predicted flag for every logged
+    cycle plus the forecast cycles needed to reach `until`. A cycle lasts
+    until the next start; the entered length only applies to the latest
+    one and to gaps too long to be a single cycle.
+    """
+    starts = [start for start, _, _ in cycles]
+    entered = [length for _, length, _ in cycles]
+    periods = [period for _, _, period in cycles]
+    predicted = [False] * len(cycles)
+
+    if cycles and until > starts[-1]:
+        count = (until - max(starts[-1], today)).days // MIN_CYCLE_DAYS + 2
+        forecast = forecast_cycles([list(zip(starts, entered))], periods=count, today=today)
+        upcoming = forecast.starts[0].tolist()
+        starts += upcoming
+        entered += [int(round(forecast.mean[0]))] * count
+        periods += [periods[-1]] * count
+        predicted += [True] * count
+
+    starts = np.array(starts, dtype="datetime64[D]")
+    entered = np.minimum(np.array(entered, dtype=np.int64), MAX_CYCLE_DAYS)
+    gaps = np.diff(starts).astype(np.int64)
+    lengths = entered.copy()
+    lengths[:-1] = np.where(gaps <= MAX_CYCLE_DAYS, gaps, entered[:-1])
+    return starts, lengths, np.array(periods, dtype=np.int64), np.array(predicted, dtype=bool)
+
+
+def day_phases(
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    periods: np.ndarray,
+    predicted: np.ndarray,
+    first: date,
+    days: int,
+) -> str:
+    """Phase letters for `days` consecutive days from `first`"""
+    if not len(starts):
+        return "-" * days
+
+    day = np.datetime64(first, "D") + np.arange(days)
+    cycle = np.searchsorted(starts, day, side="right") - 1
+    before_first = cycle < 0
+    cycle = np.maximum(cycle, 0)
+
+    offset = (day - starts[cycle]).astype(np.int64)
+    length = lengths[cycle]
+    ovulation = length - LUTEAL_DAYS
+    phase = np.select(
+        [
+            before_first | (offset >= length),
+            offset < periods[cycle],
+            np.abs(offset - ovulation) <= OVULATION_DAYS,
+            offset < ovulation,
+        ],
+        [0, 1, 3, 2],
+        default=4,
+    )
+    phase += np.where(predicted[cycle] & (phase > 0), 4, 0)
+    return PHASE_LETTERS[phase].tobytes().decode("ascii")
+
+
+def _month_starts(date_from: date, date_to: date) -> List[date]:
+    months, month = [], date_from.replace(day=1)
+    while month <= date_to:
+        months.append(month)
+        month = (month + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def _month_end(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+async def _compute_months(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    months: Sequence[date],
+    today: date,
+) -> Dict[date, Dict]:
+    """Calendar months from months[0] through the end of months[-1]"""
+    first, last = months[0], _month_end(months[-1])
+
+    # the whole history: the forecast weighs all of it, and it is small
+    cycles = (
+        await db.execute(
+            select(Cycle.last_period_date, Cycle.cycle_length, Cycle.period_length)
+            .where(Cycle.user_id == user_id)
+            .order_by(Cycle.last_period_date)
+        )
+    ).all()
+    logs = await db.execute(
+        select(
+            SymptomLog.log_date,
+            SymptomLog.tags,
+            untagged_notes(),
+        )
+        .where(
+            SymptomLog.user_id == user_id,
+            SymptomLog.log_date >= first,
+            SymptomLog.log_date <= last,
+        )
+    )
+
+    phases = day_phases(*cycle_arrays(cycles, last, today), first, (last - first).days + 1)
+    computed = {
+        month: {
+            "phases": phases[(month - first).days:(_month_end(month) - first).days + 1],
+            "symptoms": {},
+        }
+        for month in months
+    }
+    for log_date, tags, notes in logs:
+        month = computed.get(log_date.replace(day=1))
+        if month is not None:
+            month["symptoms"][log_date.isoformat()] = list(log_tags(tags, notes))
+    return computed
+
+
+async def get_calendar(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    date_from: date,
+    date_to: date,
+    today: Optional[date] = None,
+) -> Dict:
+    """
+    Per-day phases and logged symptoms for a date range, assembled from
+    cached months. Months not in the cache are computed in one pass.
+    """
+    today = today or date.today()
+    months = _month_starts(date_from, date_to)
+    keys = {month: calendar_cache.key(user_id, month, today) for month in months}
+    found = {month: calendar_cache.get(key) for month, key in keys.items()}
+
+    missing = [month for month, cached in found.items() if cached is None]
+    if missing:
+        computed = await _compute_months(db, user_id=user_id, months=missing, today=today)
+        for month in missing:
+            found[month] = computed[month]
+            calendar_cache.set(keys[month], computed[month])
+
+    offset = (date_from - months[0]).days
+    phases = "".join(found[month]["phases"] for month in months)
+    start, end = date_from.isoformat(), date_to.isoformat()
+    return {
+        "start": date_from,
+        "end": date_to,
+        "phases": phases[offset:offset + (date_to - date_from).days + 1],
+        "symptoms": {
+            day: tags
+            for month in months
+            for day, tags in found[month]["symptoms"].items()
+            if start <= day <= end
+        },
+    }
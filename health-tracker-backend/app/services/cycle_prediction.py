@@ -0,0 +1,193 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Cycle, UserCycleStats
+from app.schemas.cycle import CyclePrediction, DateRange
+
+DEFAULT_FORECAST_PERIODS = 6
+
+# recent cycles count more; a cycle this many cycles back weighs half
+HALF_LIFE_CYCLES = 6
+# lengths outside this range are treated as entry mistakes and clipped
+MIN_CYCLE_DAYS, MAX_CYCLE_DAYS = 15, 90
+# a short history is pulled toward typical cycle-to-cycle variation, as if
+# PRIOR_CYCLES extra cycles with this spread had been seen
+PRIOR_CYCLES, PRIOR_STDEV_DAYS = 2, 3.0
+IRREGULAR_STDEV_DAYS = 7  # same threshold as the risk rules
+INTERVAL_Z = 1.2816  # two-sided 80% interval
+# ovulation ~14 days before a period; fertile from 5 days before to 1 after
+LUTEAL_DAYS, FERTILE_BEFORE, FERTILE_AFTER = 14, 5, 1
+
+# (period start date, entered cycle length), oldest first
+CycleHistory = Sequence[Tuple[date, int]]
+
+
+def next_period_date(last_period_date: date, mean_length: float) -> date:
+    return last_period_date + timedelta(days=int(round(mean_length, 1)))
+
+
+def predict_next_period(stats: Optional[UserCycleStats]) -> Dict:
+    """
+    Average-length prediction from the user's cycle statistics (the latest
+    six cycles). No LLM involved; AIService adds the explanation on top.
+    """
+    if not stats or not stats.cycle_count:
+        return {
+            "predicted_start_date": None,
+            "average_cycle_length": None,
+            "confidence": "low",
+            "message": "Add your cycle data to get predictions.",
+        }
+
+    return {
+        "predicted_start_date": stats.next_predicted_date.isoformat(),
+        "average_cycle_length": round(stats.mean_length, 1),
+        "confidence": "high" if stats.cycle_count >= 4 else "medium",
+        "message": None,
+    }
+
+
+def predict_from_forecast(forecast: Optional[CyclePrediction]) -> Dict:
+    """
+    The /ai/predict-cycle fields from a forecast. Confidence follows how
+    tight the likely range around the next period is.
+    """
+    if forecast is None:
+        return predict_next_period(None)
+
+    interval = forecast.period_intervals[0]
+    half_width = (interval.end - interval.start).days / 2
+    return {
+        "predicted_start_date": forecast.next_period.isoformat(),
+        "average_cycle_length": forecast.average_cycle_length,
+        "confidence": "high" if half_width <= 2 else "medium" if half_width <= 5 else "low",
+        "message": None,
+        "forecast": forecast,
+    }
+
+
+class CycleForecasts:
+    """
+    Forecasts for many users as arrays, one row per user (in input order),
+    one column per upcoming period. prediction(i) builds the schema for one.
+    """
+
+    def __init__(self, histories: Sequence[CycleHistory], periods: int, today: date):
+        counts = np.array([len(h) for h in histories], dtype=np.int64)
+        width = max(int(counts.max(initial=0)), 1)
+        flat = [length for history in histories for _, length in history]
+
+        # right-aligned, so column -1 is everyone's latest cycle
+        lengths = np.full((len(histories), width), np.nan)
+        rows = np.repeat(np.arange(len(histories)), counts)
+        cols = width - counts[rows] + (np.arange(len(flat)) - np.repeat(np.cumsum(counts) - counts, counts))
+        lengths[rows, cols] = np.clip(np.asarray(flat, dtype=float), MIN_CYCLE_DAYS, MAX_CYCLE_DAYS)
+
+        seen = ~np.isnan(lengths)
+        weights = np.where(seen, 0.5 ** (np.arange(width)[::-1] / HALF_LIFE_CYCLES), 0.0)
+        total = weights.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(weights * lengths, axis=1) / total
+            spread = np.nansum(weights * (lengths - mean[:, None]) ** 2, axis=1) / total
+            # Kish effective sample size, for the unbiased weighted variance
+            effective = total**2 / (weights**2).sum(axis=1)
+            variance = np.where(effective > 1, spread * effective / (effective - 1), 0.0)
+            stdev = np.sqrt(
+                (effective * variance + PRIOR_CYCLES * PRIOR_STDEV_DAYS**2) / (effective + PRIOR_CYCLES)
+            )
+        # users without cycles get placeholder rows; prediction() returns None
+        empty = counts == 0
+        mean[empty], stdev[empty], variance[empty] = 28.0, PRIOR_STDEV_DAYS, 0.0
+
+        last = np.array(
+            [h[-1][0] if len(h) else today for h in histories], dtype="datetime64[D]"
+        )
+        # first period still to come: skip cycles that already ended, but keep
+        # one that is late while today is inside its interval
+        elapsed = (np.datetime64(today, "D") - last).astype(np.int64)
+        first = np.maximum(np.ceil(elapsed / mean), 1)
+        previous = np.maximum(first - 1, 1)
+        late = (previous < first) & (
+            np.rint(previous * mean + INTERVAL_Z * stdev * np.sqrt(previous)) >= elapsed
+        )
+        first = np.where(late, previous, first)
+
+        k = first[:, None] + np.arange(periods)
+        offsets = np.rint(k * mean[:, None]).astype(np.int64)
+        half_width = np.rint(INTERVAL_Z * stdev[:, None] * np.sqrt(k)).astype(np.int64)
+
+        self.counts = counts
+        self.mean = mean
+        self.stdev = stdev
+        self.irregular = (counts >= 3) & (np.sqrt(variance) > IRREGULAR_STDEV_DAYS)
+        self.starts = last[:, None] + offsets.astype("timedelta64[D]")
+        self.low = self.starts - half_width.astype("timedelta64[D]")
+        self.high = self.starts + half_width.astype("timedelta64[D]")
+        ovulation = self.starts - np.timedelta64(LUTEAL_DAYS, "D")
+        self.fertile_start = ovulation - np.timedelta64(FERTILE_BEFORE, "D")
+        self.fertile_end = ovulation + np.timedelta64(FERTILE_AFTER, "D")
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def prediction(self, i: int) -> Optional[CyclePrediction]:
+        """The schema for user i; None when they have no cycles"""
+        if not self.counts[i]:
+            return None
+        starts = self.starts[i].tolist()
+        return CyclePrediction(
+            next_period=starts[0],
+            upcoming_periods=starts,
+            is_irregular=bool(self.irregular[i]),
+            period_intervals=[
+                DateRange(start=lo, end=hi) for lo, hi in zip(self.low[i].tolist(), self.high[i].tolist())
+            ],
+            fertile_windows=[
+                DateRange(start=lo, end=hi)
+                for lo, hi in zip(self.fertile_start[i].tolist(), self.fertile_end[i].tolist())
+            ],
+            average_cycle_length=round(float(self.mean[i]), 1),
+            cycle_length_stdev=round(float(self.stdev[i]), 1),
+            based_on_cycles=int(self.counts[i]),
+        )
+
+
+def forecast_cycles(
+    histories: Sequence[CycleHistory],
+    *,
+    periods: int = DEFAULT_FORECAST_PERIODS,
+    today: Optional[date] = None,
+) -> CycleForecasts:
+    """Forecast every history in one vectorized pass"""
+    return CycleForecasts(histories, periods, today or date.today())
+
+
+async def load_cycle_histories(
+    db: AsyncSession,
+    user_ids: Sequence[UUID],
+) -> List[CycleHistory]:
+    """Each user's full cycle history, in the order of user_ids, in one query"""
+    histories: Dict[UUID, List[Tuple[date, int]]] = {user_id: [] for user_id in user_ids}
+    rows: Iterable = await db.execute(
+        select(Cycle.user_id, Cycle.last_period_date, Cycle.cycle_length)
+        .where(Cycle.user_id.in_(user_ids))
+        .order_by(Cycle.user_id, Cycle.last_period_date)
+    )
+    for user_id, start, length in rows:
+        histories[user_id].append((start, length))
+    return [histories[user_id] for user_id in user_ids]
+
+
+async def forecast_for_user(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    periods: int = DEFAULT_FORECAST_PERIODS,
+) -> Optional[CyclePrediction]:
+    histories = await load_cycle_histories(db, [user_id])
+    return forecast_cycles(histories, periods=periods).prediction(0)
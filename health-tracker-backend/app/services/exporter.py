@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import AsyncIterator, Callable, Iterable, List, Literal, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.models import AIInsight, Cycle, SymptomLog, User, UserProfile
+
+ExportFormat = Literal["csv", "ndjson"]
+ExportSection = Literal["profile", "cycles", "symptom-logs", "ai-insights"]
+
+SECTIONS: List[ExportSection] = ["profile", "cycles", "symptom-logs", "ai-insights"]
+
+# NDJSON "type" of each record
+RECORD_TYPES = {
+    "profile": "profile",
+    "cycles": "cycle",
+    "symptom-logs": "symptom_log",
+    "ai-insights": "ai_insight",
+}
+
+
+def _query(section: ExportSection, user_id: UUID) -> Select:
+    """Core SELECT for one section, oldest first so an export replays in order"""
+    if section == "profile":
+        return (
+            select(
+                User.id,
+                User.email,
+                User.is_active,
+                User.created_at,
+                UserProfile.date_of_birth,
+                UserProfile.height_cm,
+                UserProfile.weight_kg,
+                UserProfile.diagnosed_conditions,
+            )
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .where(User.id == user_id)
+        )
+    if section == "cycles":
+        # same column names as the cycles API and the importer
+        return (
+            select(
+                Cycle.id,
+                Cycle.last_period_date.label("cycle_start_date"),
+                Cycle.cycle_length,
+                Cycle.period_length,
+            )
+            .where(Cycle.user_id == user_id)
+            .order_by(Cycle.last_period_date, Cycle.id)
+        )
+    if section == "symptom-logs":
+        return (
+            select(SymptomLog.id, SymptomLog.log_date, SymptomLog.notes, SymptomLog.created_at)
+            .where(SymptomLog.user_id == user_id)
+            .order_by(SymptomLog.log_date, SymptomLog.id)
+        )
+    return (
+        select(AIInsight.id, AIInsight.title, AIInsight.content, AIInsight.created_at)
+        .where(AIInsight.user_id == user_id)
+        .order_by(AIInsight.created_at, AIInsight.id)
+    )
+
+
+def _plain(value):
+    """JSON/CSV-friendly form of a column value"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _ndjson(record_type: str, columns: Sequence[str]) -> Callable[[Iterable], str]:
+    def encode(rows: Iterable) -> str:
+        return "".join(
+            json.dumps({"type": record_type, **dict(zip(columns, map(_plain, row)))})
+            + "\n"
+            for row in rows
+        )
+
+    return encode
+
+
+def _cell(value):
+    # arrays (diagnosed_conditions) go into one cell as JSON
+    return json.dumps(value) if isinstance(value, list) else _plain(value)
+
+
+def _csv(columns: Sequence[str]) -> Callable[[Iterable], str]:
+    def encode(rows: Iterable) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([_cell(v) for v in row] for row in rows)
+        return buffer.getvalue()
+
+    return encode
+
+
+async def export_rows(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    sections: Sequence[ExportSection],
+    fmt: ExportFormat,
+) -> AsyncIterator[str]:
+    """
+    Yield an export of `sections` for one user, one chunk per
+    EXPORT_BATCH_SIZE rows. Each section is read through a server-side cursor
+    (yield_per), so memory does not grow with the length of the history.
+    CSV holds a single section, headed by its column names.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # one snapshot across all sections, even with writes in between
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    for section in sections:
+        stmt = _query(section, user_id).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        result = await db.stream(stmt)
+        columns = list(result.keys())
+        if fmt == "csv":
+            encode = _csv(columns)
+            yield encode([columns])
+        else:
+            encode = _ndjson(RECORD_TYPES[section], columns)
+
+        async for rows in result.partitions():
+            yield encode(rows)
+
+    # read-only; end the snapshot without holding it until the session closes
+    await db.rollback()
+
+
+def export_filename(sections: Sequence[ExportSection], fmt: ExportFormat) -> str:
+    name = sections[0] if len(sections) == 1 else "account"
+    return f"health-tracker-{name}.{fmt}"
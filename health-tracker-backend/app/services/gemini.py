@@ -1,10 +1,16 @@
-import google.generativeai as genai
+from functools import lru_cache
+
 from app.core.config import settings
 
-genai.configure(api_key=settings.GEMINI_API_KEY)
 
-model = genai.GenerativeModel("models/gemini-pro-latest")
+@lru_cache
+def _model():
+    import google.generativeai as genai
+
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+    return genai.GenerativeModel("models/gemini-pro-latest")
+
 
 def ask_gemini(prompt: str) -> str:
-    response = model.generate_content(prompt)
+    response = _model().generate_content(prompt)
     return response.text
@@ -0,0 +1,303 @@
+import codecs
+import csv
+import json
+from datetime import date
+from itertools import islice
+from typing import IO, Dict, Iterator, List, Literal, Tuple, Type
+from uuid import UUID, uuid4
+
+from pydantic import AliasChoices, BaseModel, Field, ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.crud_cycle_stats import refresh_cycle_stats
+from app.models.models import Cycle, SymptomLog
+from app.services.risk_engine import symptom_tags
+
+ImportFormat = Literal["csv", "ndjson"]
+ImportKind = Literal["cycles", "symptom-logs"]
+
+
+class SymptomImportRow(BaseModel):
+    log_date: date = Field(validation_alias=AliasChoices("log_date", "date"))
+    notes: str = ""
+
+
+class CycleImportRow(BaseModel):
+    cycle_start_date: date = Field(
+        validation_alias=AliasChoices("cycle_start_date", "last_period_date", "start_date")
+    )
+    cycle_length: int = Field(28, ge=1, le=365)
+    period_length: int = Field(5, ge=1, le=60)
+
+
+class ImportReport(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[Dict] = []
+
+
+class _Lines:
+    """
+    A binary file's lines as text, decoded one at a time. Lines that are not
+    UTF-8 or hold a NUL byte (Postgres can't store one) are set aside in
+    rejected instead of ending the import.
+    """
+
+    def __init__(self, stream: IO[bytes]):
+        self.stream = stream
+        self.line_no = 0
+        self.rejected: List[Tuple[int, Dict]] = []
+
+    def __iter__(self) -> Iterator[str]:
+        for self.line_no, raw in enumerate(self.stream, start=1):
+            if self.line_no == 1:
+                raw = raw.removeprefix(codecs.BOM_UTF8)
+            try:
+                line = raw.decode("utf-8")
+            except UnicodeDecodeError as e:
+                self.reject(f"not valid UTF-8 (byte {e.start + 1})")
+                continue
+            if "\x00" in line:
+                self.reject("contains a NUL byte")
+                continue
+            yield line
+
+    def reject(self, error: str, line_no: int = 0) -> None:
+        self.rejected.append((line_no or self.line_no, {"__error__": error}))
+
+    def pop_rejected(self) -> List[Tuple[int, Dict]]:
+        rejected, self.rejected = self.rejected, []
+        return rejected
+
+
+def read_rows(stream: IO[bytes], fmt: ImportFormat) -> Iterator[Tuple[int, Dict]]:
+    """(line number, raw row) pairs, read incrementally from a binary file"""
+    lines = _Lines(stream)
+    if fmt == "csv":
+        reader = csv.reader(lines, strict=True)
+        header = None
+        while True:
+            first_line = lines.line_no + 1
+            try:
+                record = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                # the reader drops the bad record and carries on with the next line
+                lines.reject(f"malformed CSV: {e}", first_line)
+                record = None
+            yield from lines.pop_rejected()
+            if not record:
+                continue
+            if header is None:
+                header = record
+                continue
+            # empty cells mean "use the default", not an empty string
+            yield lines.line_no, {k: v for k, v in zip(header, record) if k and v != ""}
+        yield from lines.pop_rejected()
+        return
+
+    for line in lines:
+        yield from lines.pop_rejected()
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield lines.line_no, {"__error__": f"invalid JSON: {e.msg}"}
+            continue
+        if not isinstance(row, dict):
+            row = {"__error__": "expected a JSON object"}
+        elif any(isinstance(v, str) and "\x00" in v for v in row.values()):
+            row = {"__error__": "contains a NUL character"}
+        yield lines.line_no, row
+    yield from lines.pop_rejected()
+
+
+class _Importer:
+    """Validates rows in batches and writes each batch as multi-row INSERTs"""
+
+    model: Type[BaseModel]
+
+    def __init__(self, db: AsyncSession, user_id: UUID, overwrite: bool):
+        self.db = db
+        self.user_id = user_id
+        self.overwrite = overwrite
+        self.report = ImportReport()
+        self.seen = set()  # dates already taken earlier in this file
+
+    def _error(self, line_no: int, errors: List) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.report.errors.append({"line": line_no, "errors": errors})
+
+    def _validate(self, batch: List[Tuple[int, Dict]]) -> List[BaseModel]:
+        self.report.received += len(batch)
+        valid = []
+        duplicates = 0
+        for line_no, raw in batch:
+            if "__error__" in raw:
+                self._error(line_no, [raw["__error__"]])
+                continue
+            try:
+                row = self.model.model_validate(raw)
+            except ValidationError as e:
+                self._error(
+                    line_no,
+                    [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()],
+                )
+                continue
+            key = self._date(row)
+            if key in self.seen and not self.overwrite:
+                duplicates += 1
+                continue
+            self.seen.add(key)
+            valid.append(row)
+        self.report.duplicates += duplicates
+        return valid
+
+    async def run(self, rows: Iterator[Tuple[int, Dict]]) -> ImportReport:
+        while batch := list(islice(rows, settings.IMPORT_BATCH_SIZE)):
+            valid = self._validate(batch)
+            if valid:
+                await self._write(valid)
+                await self.db.commit()
+        return self.report
+
+
+class SymptomLogImporter(_Importer):
+    model = SymptomImportRow
+
+    def _date(self, row: SymptomImportRow) -> date:
+        return row.log_date
+
+    async def _write(self, rows: List[SymptomImportRow]) -> None:
+        # last row wins for a date repeated within one batch
+        by_date = {row.log_date: row.notes for row in rows}
+        self.report.duplicates += len(rows) - len(by_date)
+        values = [
+            {
+                "id": uuid4(),
+                "user_id": self.user_id,
+                "log_date": d,
+                "notes": notes,
+                "tags": symptom_tags(notes),
+            }
+            for d, notes in by_date.items()
+        ]
+
+        # executemany form: SQLAlchemy batches it into multi-row INSERTs
+        # ("insertmanyvalues") with one cached compile, unlike .values([...])
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(SymptomLog.__table__)
+        if self.overwrite:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "log_date"],
+                set_={"notes": stmt.excluded.notes, "tags": stmt.excluded.tags},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "log_date"])
+        written = (await self.db.scalars(stmt.returning(SymptomLog.__table__.c.id), values)).all()
+
+        # an updated row keeps its old id, so only new ids count as inserts
+        generated = {value["id"] for value in values}
+        inserted = sum(1 for log_id in written if log_id in generated)
+        self.report.inserted += inserted
+        self.report.updated += len(written) - inserted
+        self.report.duplicates += len(values) - len(written)
+
+
+class CycleImporter(_Importer):
+    model = CycleImportRow
+
+    def _date(self, row: CycleImportRow) -> date:
+        return row.cycle_start_date
+
+    async def _write(self, rows: List[CycleImportRow]) -> None:
+        # cycles have no unique constraint to conflict on, so existing start
+        # dates are looked up for the whole batch in one query
+        by_date = {row.cycle_start_date: row for row in rows}
+        self.report.duplicates += len(rows) - len(by_date)
+        existing = set(
+            (
+                await self.db.scalars(
+                    select(Cycle.last_period_date).where(
+                        Cycle.user_id == self.user_id,
+                        Cycle.last_period_date.in_(list(by_date)),
+                    )
+                )
+            ).all()
+        )
+
+        new = [row for d, row in by_date.items() if d not in existing]
+        if new:
+            await self.db.execute(
+                insert(Cycle.__table__),
+                [
+                    {
+                        "id": uuid4(),
+                        "user_id": self.user_id,
+                        "last_period_date": row.cycle_start_date,
+                        "cycle_length": row.cycle_length,
+                        "period_length": row.period_length,
+                    }
+                    for row in new
+                ],
+            )
+        self.report.inserted += len(new)
+
+        if self.overwrite and existing:
+            table = Cycle.__table__
+            await self.db.execute(
+                update(table)
+                .where(
+                    table.c.user_id == self.user_id,
+                    table.c.last_period_date == bindparam("start_date"),
+                )
+                .values(
+                    cycle_length=bindparam("new_cycle_length"),
+                    period_length=bindparam("new_period_length"),
+                ),
+                [
+                    {
+                        "start_date": d,
+                        "new_cycle_length": by_date[d].cycle_length,
+                        "new_period_length": by_date[d].period_length,
+                    }
+                    for d in existing
+                ],
+            )
+            self.report.updated += len(existing)
+        else:
+            self.report.duplicates += len(existing)
+
+        if new or (self.overwrite and existing):
+            await refresh_cycle_stats(self.db, user_id=self.user_id)
+
+
+IMPORTERS = {"cycles": CycleImporter, "symptom-logs": SymptomLogImporter}
+
+
+async def import_rows(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    kind: ImportKind,
+    stream: IO[bytes],
+    fmt: ImportFormat,
+    overwrite: bool = False,
+) -> ImportReport:
+    """
+    Load a CSV or NDJSON export into cycles or symptom_logs for one user.
+    Rows are read and validated lazily and committed per batch, so memory
+    stays bounded by IMPORT_BATCH_SIZE. Days that already exist are
+    skipped, or overwritten when `overwrite` is set.
+    """
+    importer = IMPORTERS[kind](db, user_id, overwrite)
+    return await importer.run(read_rows(stream, fmt))
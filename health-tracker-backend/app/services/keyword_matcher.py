@@ -0,0 +1,82 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence
+
+_NOTHING: FrozenSet[str] = frozenset()
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    One regex alternation with shared prefixes factored out, so the engine
+    tries each leading character once instead of once per word.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # a word ends here
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # the longer words are tried first; "" lets the shorter one end here
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed set of keywords appear in a text in one regex
+    pass, on whole words only, with synonyms folded into their keyword.
+
+    A trailing "s" is accepted on every form ("cramp" matches "cramps"), and
+    keywords contained in a longer one count too ("weight gain" is also
+    "weight"), since the engine reports the longest form at each position.
+    """
+
+    def __init__(self, keywords: Sequence[str], synonyms: Optional[Mapping[str, Sequence[str]]] = None):
+        # every keyword a form implies: its own, plus any keyword it contains
+        whole_word = {k: re.compile(rf"\b{re.escape(k.lower())}s?\b") for k in keywords}
+
+        def implied(text: str) -> FrozenSet[str]:
+            return frozenset(k for k, pattern in whole_word.items() if pattern.search(text))
+
+        forms: Dict[str, FrozenSet[str]] = {k.lower(): implied(k.lower()) for k in keywords}
+        for keyword, variants in (synonyms or {}).items():
+            if keyword not in keywords:
+                continue
+            for variant in variants:
+                forms.setdefault(variant.lower(), forms[keyword.lower()] | implied(variant.lower()))
+
+        # a form overlapping another at whole words ("facial hair" and "hair
+        # fall") would hide it, since matches don't overlap; add the joined
+        # phrase ("facial hair fall") as a form of its own
+        for a, found_a in list(forms.items()):
+            for b, found_b in list(forms.items()):
+                words_a, words_b = a.split(), b.split()
+                for n in range(1, min(len(words_a), len(words_b))):
+                    if words_a[-n:] == words_b[:n]:
+                        forms.setdefault(" ".join(words_a + words_b[n:]), found_a | found_b)
+
+        self._keywords = forms
+        self._pattern = re.compile(rf"\b({_trie_pattern(forms)})s?\b")
+
+    def match(self, text: Optional[str]) -> FrozenSet[str]:
+        return self.match_all([text])[0]
+
+    def match_all(self, texts: Iterable[Optional[str]]) -> List[FrozenSet[str]]:
+        # the per-text work stays inline; this runs for every symptom log read
+        findall, keywords = self._pattern.findall, self._keywords
+        results = []
+        for text in texts:
+            found = findall(text.lower()) if text else None
+            if not found:
+                results.append(_NOTHING)
+            elif len(found) == 1:
+                results.append(keywords[found[0]])
+            else:
+                results.append(_NOTHING.union(*map(keywords.__getitem__, found)))
+        return results
@@ -0,0 +1,409 @@
+from abc import ABC, abstractmethod
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, case, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import SymptomLog, User, UserCycleStats, UserProfile
+from app.services.keyword_matcher import KeywordMatcher
+
+# recent symptom logs every scorer can look at, newest first
+SYMPTOM_WINDOW = 30
+
+
+class RiskFeatures(BaseModel):
+    """Everything the scorers read, extracted once per user"""
+
+    # over the latest cycles, from user_cycle_stats
+    cycle_count: int = 0
+    mean_length: Optional[float] = None
+    stdev_length: Optional[float] = None
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    skipped_count: int = 0
+
+    bmi: Optional[float] = None
+
+    # tags of each recent log, newest first
+    log_keywords: List[FrozenSet[str]] = []
+
+    def mentioned(self, keywords: Sequence[str]) -> List[str]:
+        """Keywords that appear in any recent log, in the given order"""
+        found = frozenset().union(*self.log_keywords)
+        return [k for k in keywords if k in found]
+
+    def keyword_hits(self, keywords: Sequence[str], logs: int = SYMPTOM_WINDOW) -> int:
+        """(log, keyword) pairs over the newest `logs` logs"""
+        wanted = frozenset(keywords)
+        return sum(len(found & wanted) for found in self.log_keywords[:logs])
+
+    def logs_mentioning(self, keywords: Sequence[str]) -> int:
+        wanted = frozenset(keywords)
+        return sum(1 for found in self.log_keywords if found & wanted)
+
+
+class RiskScorer(ABC):
+    """Turns RiskFeatures into one report; subclasses register in SCORERS"""
+
+    keywords: Sequence[str] = ()
+
+    @abstractmethod
+    def score(self, features: RiskFeatures) -> Dict:
+        ...
+
+
+class HormonalRiskScorer(RiskScorer):
+    keywords = (
+        "acne",
+        "hair fall",
+        "facial hair",
+        "weight gain",
+        "irregular periods",
+        "fatigue",
+        "mood swings",
+    )
+
+    def score(self, features: RiskFeatures) -> Dict:
+        score = 0
+        observations = []
+
+        # ✅ Rule 1: Cycle irregularity
+        if features.cycle_count >= 3 and features.stdev_length > 7:
+            score += 2
+            observations.append("High variation in menstrual cycle length detected")
+
+        # ✅ Rule 2: Long cycles (PCOS indicator)
+        avg_cycle = features.mean_length
+        if avg_cycle and avg_cycle > 35:
+            score += 2
+            observations.append("Average cycle length is longer than 35 days")
+
+        # ✅ Rule 3: Symptoms linked to hormonal imbalance
+        matched = features.mentioned(self.keywords)
+        if len(matched) >= 2:
+            score += 1
+            observations.append(f"Reported symptoms: {', '.join(matched)}")
+
+        # ✅ Risk classification
+        if score <= 1:
+            level = "LOW"
+        elif score <= 3:
+            level = "MODERATE"
+        else:
+            level = "HIGH"
+
+        return {
+            "risk_level": level,
+            "score": score,
+            "average_cycle_length": round(avg_cycle, 1) if avg_cycle else None,
+            "observations": observations or ["No significant irregularities detected"],
+            "recommendation": (
+                "Maintain a healthy lifestyle and continue tracking."
+                if level == "LOW"
+                else "Consider lifestyle changes and consult a gynecologist if symptoms persist."
+            ),
+            "disclaimer": "This is not a medical diagnosis",
+        }
+
+
+class PCOSRiskScorer(RiskScorer):
+    keywords = (
+        "acne",
+        "weight gain",
+        "facial hair",
+        "hair fall",
+        "hair loss",
+        "irregular bleeding",
+        "fatigue",
+        "missed period",
+    )
+    symptom_logs = 20
+
+    def score(self, features: RiskFeatures) -> Dict:
+        score = 0
+        reasons = []
+
+        # 1️⃣ Cycle length analysis
+        if features.cycle_count >= 2:
+            avg_cycle = features.mean_length
+            if avg_cycle > 45:
+                score += 40
+                reasons.append("Very long average cycle length")
+            elif avg_cycle > 35:
+                score += 25
+                reasons.append("Long average cycle length")
+
+            if features.cycle_count >= 3 and features.stdev_length > 7:
+                score += 20
+                reasons.append("Highly irregular cycle pattern")
+
+        # 2️⃣ Missed / skipped periods
+        if features.skipped_count:
+            score += min(features.skipped_count * 10, 20)
+            reasons.append("Missed or delayed periods")
+
+        # 3️⃣ Symptom pattern detection (NLP-lite)
+        keyword_hits = features.keyword_hits(self.keywords, self.symptom_logs)
+        if keyword_hits:
+            score += min(keyword_hits * 5, 25)
+            reasons.append("Repeated hormone-related symptoms")
+
+        # 4️⃣ BMI (optional)
+        if features.bmi and features.bmi > 25:
+            score += 10
+            reasons.append("Higher BMI")
+
+        if score <= 25:
+            level = "Low"
+        elif score <= 50:
+            level = "Moderate"
+        elif score <= 75:
+            level = "High"
+        else:
+            level = "Very High"
+
+        return {
+            "risk_score": min(score, 100),
+            "risk_level": level,
+            "reasons": reasons,
+            "disclaimer": "This is not a medical diagnosis.",
+        }
+
+
+class PCODIndicatorScorer(RiskScorer):
+    """Pattern-based PCOS / PCOD awareness; formerly services/hormonal_risk.py"""
+
+    keywords = (
+        "acne",
+        "weight",
+        "obese",
+        "hair fall",
+        "facial hair",
+        "chin hair",
+        "thinning hair",
+        "fatigue",
+        "tired",
+        "mood",
+        "anxiety",
+        "depression",
+    )
+
+    def score(self, features: RiskFeatures) -> Dict:
+        score = 0
+        observations: List[str] = []
+        report = {"risk_type": "PCOS / PCOD Indicators"}
+
+        # Need at least 3 cycles for meaningful trend
+        if features.cycle_count < 3:
+            observations.append(
+                "Not enough cycle history. Add at least 3 cycles for better hormonal risk analysis."
+            )
+            return {
+                **report,
+                "risk_level": "LOW",
+                "score": score,
+                "observations": observations,
+                "recommendation": "Keep tracking your cycles regularly for better insights.",
+            }
+
+        avg_cycle = features.mean_length
+        min_len, max_len = features.min_length, features.max_length
+
+        # Long cycles (>35 days) – common PCOS pattern
+        if avg_cycle > 35:
+            score += 3
+            observations.append(
+                f"Average cycle length is long (~{round(avg_cycle)} days), which can be a sign of hormonal imbalance."
+            )
+
+        # Very long cycles (>45 days) – stronger signal
+        if avg_cycle > 45:
+            score += 2
+            observations.append(
+                "Some cycles appear very long (>45 days), suggesting possible missed periods."
+            )
+
+        # Irregular cycles – high variation
+        if max_len - min_len > 10:
+            score += 2
+            observations.append(
+                f"Cycle length varies a lot (from {min_len} to {max_len} days). Irregular cycles can be associated with PCOS/PCOD."
+            )
+
+        # Very short cycles (<21 days) also hormonal issue
+        if min_len < 21:
+            score += 1
+            observations.append(
+                "Some cycles are very short (<21 days), which may indicate hormonal imbalance."
+            )
+
+        symptom_hits = features.logs_mentioning(self.keywords)
+        if symptom_hits >= 3:
+            score += 2
+            observations.append(
+                "Multiple logs mention symptoms like acne, hair changes, weight changes, or fatigue – these can be related to hormonal imbalance."
+            )
+        elif symptom_hits > 0:
+            score += 1
+            observations.append(
+                "You have mentioned some symptoms that may be related to hormones. Keep tracking them regularly."
+            )
+
+        if score <= 2:
+            risk = "LOW"
+        elif score <= 5:
+            risk = "MODERATE"
+        else:
+            risk = "HIGH"
+
+        if not observations:
+            observations.append("No strong hormonal imbalance patterns detected from your data so far.")
+
+        return {
+            **report,
+            "risk_level": risk,
+            "score": score,
+            "observations": observations,
+            "recommendation": (
+                "This is NOT a medical diagnosis. If you are worried about your periods or symptoms, "
+                "please consult a gynecologist or endocrinologist for proper evaluation."
+            ),
+        }
+
+
+SCORERS: Dict[str, RiskScorer] = {
+    "hormonal": HormonalRiskScorer(),
+    "pcos": PCOSRiskScorer(),
+    "pcod_indicators": PCODIndicatorScorer(),
+}
+
+# every keyword any scorer asks about, matched once per log
+KEYWORDS = tuple(dict.fromkeys(k for scorer in SCORERS.values() for k in scorer.keywords))
+
+# other ways users write a keyword; a match counts as the keyword itself
+SYNONYMS = {
+    "acne": ("pimple", "breakout", "zit"),
+    "hair fall": ("hairfall", "hair-fall", "hair falling", "losing hair"),
+    "hair loss": ("hairloss",),
+    "thinning hair": ("hair thinning",),
+    "facial hair": ("hirsutism", "chin hairs"),
+    "weight gain": ("gained weight", "gaining weight"),
+    "obese": ("obesity", "overweight"),
+    "fatigue": ("fatigued", "exhausted", "exhaustion"),
+    "tired": ("tiredness",),
+    "mood swings": ("mood swing", "moody"),
+    "anxiety": ("anxious",),
+    "depression": ("depressed",),
+    "irregular periods": ("irregular period", "irregular cycle", "irregular cycles"),
+    # unambiguous forms only: "no period pain" or "late period" is no missed period
+    "missed period": ("skipped period", "skipped my period", "missed my period"),
+}
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS, SYNONYMS)
+
+
+def symptom_tags(notes: Optional[str]) -> List[str]:
+    """The keywords in a log's notes, as stored in symptom_logs.tags"""
+    return sorted(KEYWORD_MATCHER.match(notes))
+
+
+def log_tags(tags: Optional[Sequence[str]], notes: Optional[str]) -> Sequence[str]:
+    """A log's stored tags, or extracted now if the backfill hasn't reached it"""
+    return tags if tags is not None else symptom_tags(notes)
+
+
+def untagged_notes():
+    """
+    Column for log_tags' `notes`: the notes only for rows still waiting on
+    the tag backfill, NULL otherwise, so tagged rows don't ship their text.
+    """
+    return case((SymptomLog.tags.is_(None), SymptomLog.notes)).label("notes")
+
+
+def build_features(
+    stats: Optional[UserCycleStats],
+    tags: Sequence[Iterable[str]],
+    *,
+    height_cm: Optional[int] = None,
+    weight_kg=None,
+) -> RiskFeatures:
+    """Features from data the caller already has; `tags` per log, newest first"""
+    features = RiskFeatures(log_keywords=[frozenset(t) for t in tags[:SYMPTOM_WINDOW]])
+    if stats and stats.cycle_count:
+        features.cycle_count = stats.cycle_count
+        features.mean_length = stats.mean_length
+        features.stdev_length = stats.stdev_length
+        features.min_length = stats.min_length
+        features.max_length = stats.max_length
+        features.skipped_count = stats.skipped_count
+    if height_cm and weight_kg:
+        features.bmi = float(weight_kg) / (height_cm / 100) ** 2
+    return features
+
+
+# what UserCycleStats needs for mean, stdev, range and skipped periods
+STATS_COLUMNS = ("cycle_count", "length_sum", "length_sum_sq", "min_length", "max_length", "skipped_count")
+
+
+def _features_query():
+    """
+    Cycle stats, BMI inputs and the recent symptom tags in one statement:
+    the user's row outer-joined to each, one result row per recent log.
+    Built once; the user is a bind parameter.
+    """
+    user_id = bindparam("user_id")
+    recent = (
+        select(
+            SymptomLog.log_date,
+            SymptomLog.tags,
+            untagged_notes(),
+        )
+        .where(SymptomLog.user_id == user_id)
+        .order_by(SymptomLog.log_date.desc())
+        .limit(SYMPTOM_WINDOW)
+        .subquery()
+    )
+    stats = UserCycleStats.__table__
+    return (
+        select(
+            *(stats.c[name] for name in STATS_COLUMNS),
+            UserProfile.height_cm,
+            UserProfile.weight_kg,
+            recent.c.log_date,
+            recent.c.tags,
+            recent.c.notes,
+        )
+        .select_from(User)
+        .outerjoin(stats, stats.c.user_id == User.id)
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .outerjoin(recent, true())
+        .where(User.id == user_id)
+        .order_by(recent.c.log_date.desc())
+    )
+
+
+FEATURES_QUERY = _features_query()
+
+
+async def extract_features(db: AsyncSession, user_id: UUID) -> RiskFeatures:
+    rows = (await db.execute(FEATURES_QUERY, {"user_id": user_id})).all()
+    if not rows:
+        return build_features(None, [])
+
+    first = rows[0]
+    stats = None
+    if first.cycle_count is not None:
+        stats = UserCycleStats(**{name: getattr(first, name) for name in STATS_COLUMNS})
+    return build_features(
+        stats,
+        [log_tags(row.tags, row.notes) for row in rows if row.log_date is not None],
+        height_cm=first.height_cm,
+        weight_kg=first.weight_kg,
+    )
+
+
+def assess(features: RiskFeatures, names: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+    """Run the named scorers (default: all) over one feature vector"""
+    return {name: SCORERS[name].score(features) for name in (names or SCORERS)}
@@ -0,0 +1,40 @@
+"""Fill symptom_logs.tags for logs written before the column existed.
+
+    python backfill_symptom_tags.py            # rows with no tags yet
+    python backfill_symptom_tags.py --retag    # every row, after keyword changes
+
+Commits every batch, so it is safe to run against a live database and to
+stop and re-run; without --retag it picks up where it left off.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal, dispose_engines
+from app.crud.crud_symptom import backfill_symptom_tags
+from app.services.calendar_cache import calendar_cache
+
+
+async def main(args) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            updated = await backfill_symptom_tags(db, batch_size=args.batch_size, retag=args.retag)
+    finally:
+        await dispose_engines()
+    print(f"✅ Tagged {updated} symptom logs")
+    if args.retag:
+        # cached calendar months carry the old tags
+        calendar_cache.invalidate_all()
+        if not calendar_cache.shared:
+            print(
+                "⚠️  CALENDAR_CACHE_URL is not set, so the API workers' cached calendar months "
+                f"were not cleared; they show the old tags for up to {calendar_cache.ttl}s",
+                file=sys.stderr,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retag", action="store_true", help="recompute tags on every row")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per UPDATE batch (default: 1000)")
+    asyncio.run(main(parser.parse_args()))
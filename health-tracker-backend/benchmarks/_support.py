@@ -0,0 +1,140 @@
+"""Shared setup for the benchmark scripts.
+
+Run them from health-tracker-backend/, e.g.
+    python -m benchmarks.bench_ai_concurrency
+
+The SQLite stand-in talks to the async stack through aiosqlite, which is a
+benchmark-only dependency (pip install aiosqlite).
+"""
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+# Settings() needs these before anything under app/ is imported
+os.environ.setdefault("POSTGRES_PASSWORD", "benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    # Values are already bound as hex strings on non-native backends
+    return "CHAR(32)"
+
+
+@compiles(ARRAY, "sqlite")
+def _array_on_sqlite(type_, compiler, **kw):
+    # Only lets user_profiles be created; arrays are not bound on SQLite
+    return "JSON"
+
+
+def sqlite_database(tables, **async_engine_kwargs):
+    """
+    Throwaway file-backed SQLite database holding only `tables`, reachable
+    through a sync engine (for seeding) and an aiosqlite engine (for the API).
+    """
+    from app.core.database import Base
+
+    path = os.path.join(tempfile.mkdtemp(prefix="ht-bench-"), "bench.db")
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    Base.metadata.create_all(bind=engine, tables=[t.__table__ for t in tables])
+
+    # Default to a connection per session so the pool adds no limits
+    async_engine_kwargs.setdefault("poolclass", NullPool)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", **async_engine_kwargs
+    )
+    return SimpleNamespace(
+        engine=engine,
+        SessionLocal=sessionmaker(autoflush=False, bind=engine),
+        async_engine=async_engine,
+        AsyncSessionLocal=async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        ),
+    )
+
+
+def database_from_url(url, tables, **async_engine_kwargs):
+    """Same shape as sqlite_database, for a real database such as Postgres"""
+    from app.core.database import Base
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine, tables=[t.__table__ for t in tables])
+    async_url = url.replace("postgresql://", "postgresql+psycopg://", 1)
+    async_engine = create_async_engine(async_url, **async_engine_kwargs)
+    return SimpleNamespace(
+        engine=engine,
+        SessionLocal=sessionmaker(autoflush=False, bind=engine),
+        async_engine=async_engine,
+        AsyncSessionLocal=async_sessionmaker(
+            async_engine, autoflush=False, expire_on_commit=False
+        ),
+    )
+
+
+def override_db(app, database):
+    from app.core.database import get_async_db, get_async_session_factory, get_db
+
+    def _get_db():
+        db = database.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def _get_async_db():
+        async with database.AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_async_db] = _get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: database.AsyncSessionLocal
+
+
+def override_user(app, user_id=None):
+    from app.api.deps import get_current_user
+
+    user = SimpleNamespace(id=user_id or uuid4(), is_active=True)
+
+    async def _current_user():
+        return user
+
+    app.dependency_overrides[get_current_user] = _current_user
+    return user
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label, samples_ms):
+    print(
+        f"{label:<32} n={len(samples_ms):<5} "
+        f"p50={statistics.median(samples_ms):8.2f}ms "
+        f"p99={percentile(samples_ms, 99):8.2f}ms "
+        f"max={max(samples_ms):8.2f}ms"
+    )
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.start) * 1000
@@ -0,0 +1,97 @@
+"""Event-loop responsiveness while /ai/ask calls are in flight.
+
+Gemini is replaced by a fake model that sleeps for --latency seconds, so
+the numbers only reflect how the API schedules the call. /health and
+/symptom-logs are probed before and during a burst of --calls requests.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._support import (
+    Timer,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+
+from app.main import app
+from app.models.models import User, SymptomLog
+from app.services.ai_service_gemini import get_ai_service
+
+
+class FakeModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        time.sleep(self.latency)
+        return type("Response", (), {"text": "ok"})()
+
+
+async def probe(client, path, stop, samples):
+    while not stop.is_set():
+        with Timer() as t:
+            response = await client.get(path)
+        response.raise_for_status()
+        samples.append(t.ms)
+        await asyncio.sleep(0.005)
+
+
+async def run(calls: int, latency: float):
+    ai_service = get_ai_service()
+    ai_service.model = FakeModel(latency)
+
+    async def no_context(db, user_id):
+        return {"profile": None, "symptoms": [], "cycles": []}
+
+    ai_service._get_user_context = no_context
+
+    override_db(app, sqlite_database([User, SymptomLog]))
+    override_user(app)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        for phase in ("idle", f"{calls} x /ai/ask in flight"):
+            stop = asyncio.Event()
+            health, logs = [], []
+            probes = [
+                asyncio.create_task(probe(client, "/health", stop, health)),
+                asyncio.create_task(
+                    probe(client, "/api/v1/symptom-logs", stop, logs)
+                ),
+            ]
+
+            if phase == "idle":
+                await asyncio.sleep(1.0)
+            else:
+                with Timer() as t:
+                    responses = await asyncio.gather(
+                        *(
+                            client.post(
+                                "/api/v1/ai/ask", json={"question": "why?"}
+                            )
+                            for _ in range(calls)
+                        )
+                    )
+                failed = sum(r.status_code != 200 for r in responses)
+                print(f"burst finished in {t.ms:.0f}ms, {failed} failed")
+
+            stop.set()
+            await asyncio.gather(*probes)
+            print(f"-- {phase}")
+            summarize("GET /health", health)
+            summarize("GET /symptom-logs", logs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.latency))
@@ -0,0 +1,75 @@
+"""Authenticated requests per second with and without the user cache.
+
+Runs the real get_current_user against a SQLite stand-in (or the async
+database URL given by --database-url, e.g. postgresql+psycopg://...) and reports throughput plus SQL statements per
+request for GET /users/me.
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from benchmarks._support import override_db, sqlite_database
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.auth_cache import user_cache
+from app.core.security import create_access_token
+from app.main import app
+from app.models.models import User
+
+
+async def run(requests: int, database_url: str):
+    if database_url:
+        engine = create_async_engine(database_url)
+        database = SimpleNamespace(
+            SessionLocal=None,
+            async_engine=engine,
+            AsyncSessionLocal=async_sessionmaker(engine, expire_on_commit=False),
+        )
+    else:
+        database = sqlite_database([User])
+    override_db(app, database)
+
+    statements = 0
+
+    @event.listens_for(database.async_engine.sync_engine, "before_cursor_execute")
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    async with database.AsyncSessionLocal() as db:
+        user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(str(user.id))}"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for enabled in (False, True):
+            user_cache.enabled = enabled
+            user_cache.invalidate(user.id)
+            response = await client.get("/api/v1/users/me", headers=headers)
+            response.raise_for_status()
+
+            statements = 0
+            start = time.perf_counter()
+            for _ in range(requests):
+                await client.get("/api/v1/users/me", headers=headers)
+            elapsed = time.perf_counter() - start
+
+            label = "cache on " if enabled else "cache off"
+            print(
+                f"{label}: {requests / elapsed:8.1f} req/s, "
+                f"{statements / requests:.2f} SQL statements/request"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--database-url", default="")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.database_url))
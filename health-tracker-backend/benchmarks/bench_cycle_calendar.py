@@ -0,0 +1,200 @@
+"""Rendering a 12-month calendar: client-side phases vs /cycles/calendar.
+
+Seeds --users users with --years years of cycles and a symptom log on
+most days, then times a 12-month view (this calendar year) per user:
+  - "client": what the pages did before. Fetch every /cycles/ and
+    /symptom-logs page and /cycles/forecast, then work out each day's
+    phase in a Python loop
+  - /cycles/calendar with the cache cleared first (one pass: two queries,
+    array ops over the days)
+  - /cycles/calendar again, now served from the per-month cache
+  - /cycles/calendar for a single month, cold
+The client's phases and symptom map are compared with the endpoint's.
+Pass --database-url postgresql+psycopg://... to run against Postgres.
+"""
+import argparse
+import asyncio
+import random
+import time
+from bisect import bisect_right
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from sqlalchemy import insert
+
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User, UserCycleStats
+from app.services.calendar_cache import calendar_cache
+from app.services.cycle_calendar import OVULATION_DAYS
+from app.services.cycle_prediction import LUTEAL_DAYS, MAX_CYCLE_DAYS
+from app.services.risk_engine import symptom_tags
+
+PHRASES = ["cramps", "acne", "so tired", "bloating", "headache", "moody", "felt fine", "slept well"]
+
+
+def seed(database, users, years):
+    random.seed(22)
+    user_ids = [uuid4() for _ in range(users)]
+    first = date.today() - timedelta(days=365 * years)
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        for u in user_ids:
+            usual, start, cycles = random.randint(26, 32), first, []
+            while start < date.today():
+                length = usual + random.randint(-3, 3)
+                cycles.append({"id": uuid4(), "user_id": u, "last_period_date": start,
+                               "cycle_length": length, "period_length": random.randint(4, 6)})
+                start += timedelta(days=length)
+            conn.execute(insert(Cycle.__table__), cycles)
+
+            logs = []
+            for i in range((date.today() - first).days + 1):
+                if random.random() < 0.8:
+                    notes = ", ".join(random.sample(PHRASES, random.randint(1, 3)))
+                    logs.append({"id": uuid4(), "user_id": u, "log_date": first + timedelta(days=i),
+                                 "notes": notes, "tags": symptom_tags(notes)})
+            conn.execute(insert(SymptomLog.__table__), logs)
+    return user_ids
+
+
+def client_phases(cycles, forecast, first, days):
+    """Each day's phase letter, one day at a time, as a client would"""
+    rows = sorted(
+        (date.fromisoformat(c["cycle_start_date"]), min(c["cycle_length"], MAX_CYCLE_DAYS), c["period_length"], False)
+        for c in cycles
+    )
+    if forecast:
+        length = min(round(forecast["average_cycle_length"]), MAX_CYCLE_DAYS)
+        rows += [(date.fromisoformat(d), length, rows[-1][2], True) for d in forecast["upcoming_periods"]]
+    starts = [row[0] for row in rows]
+
+    letters = []
+    for i in range(days):
+        day = first + timedelta(days=i)
+        j = bisect_right(starts, day) - 1
+        if j < 0:
+            letters.append("-")
+            continue
+        start, length, period, predicted = rows[j]
+        if j + 1 < len(rows) and (starts[j + 1] - start).days <= MAX_CYCLE_DAYS:
+            length = (starts[j + 1] - start).days
+        offset, ovulation = (day - start).days, length - LUTEAL_DAYS
+        if offset >= length:
+            letters.append("-")
+            continue
+        if offset < period:
+            letter = "M"
+        elif abs(offset - ovulation) <= OVULATION_DAYS:
+            letter = "O"
+        elif offset < ovulation:
+            letter = "F"
+        else:
+            letter = "L"
+        letters.append(letter.lower() if predicted else letter)
+    return "".join(letters)
+
+
+async def every_page(client, path, limit):
+    rows, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+        rows += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+async def client_calendar(client, first, last):
+    cycles = await every_page(client, "/api/v1/cycles/", 200)
+    response = await client.get("/api/v1/cycles/forecast", params={"periods": 24})
+    forecast = response.json() if response.status_code == 200 else None
+
+    symptoms = {
+        log["log_date"]: log["tags"]
+        for log in await every_page(client, "/api/v1/symptom-logs", 100)
+        if first.isoformat() <= log["log_date"] <= last.isoformat()
+    }
+
+    phases = client_phases(cycles, forecast, first, (last - first).days + 1)
+    return {"start": first.isoformat(), "end": last.isoformat(), "phases": phases, "symptoms": symptoms}
+
+
+async def run(args):
+    tables = [User, Cycle, SymptomLog, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    with Timer() as t:
+        user_ids = seed(database, args.users, args.years)
+    print(f"seeded {args.users} users x {args.years} years in {t.ms / 1000:.0f}s\n")
+
+    year = date.today().year
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    view = {"from": first.isoformat(), "to": last.isoformat()}
+    month = {"from": date(year, 6, 1).isoformat(), "to": date(year, 6, 30).isoformat()}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        mismatched, samples = 0, {"client": [], "cold": [], "cached": [], "month": []}
+        for i in range(args.requests):
+            user = override_user(app, user_ids[i % len(user_ids)])
+
+            if i < args.client_requests:
+                with Timer() as t:
+                    expected = await client_calendar(client, first, last)
+                samples["client"].append(t.ms)
+
+            calendar_cache.invalidate_user(user.id)
+            with Timer() as t:
+                response = await client.get("/api/v1/cycles/calendar", params=view)
+            response.raise_for_status()
+            samples["cold"].append(t.ms)
+
+            with Timer() as t:
+                cached = await client.get("/api/v1/cycles/calendar", params=view)
+            samples["cached"].append(t.ms)
+
+            calendar_cache.invalidate_user(user.id)
+            with Timer() as t:
+                (await client.get("/api/v1/cycles/calendar", params=month)).raise_for_status()
+            samples["month"].append(t.ms)
+
+            if cached.json() != response.json():
+                mismatched += 1
+            if i < args.client_requests and response.json() != expected:
+                mismatched += 1
+
+    summarize("client-side, 12 months", samples["client"])
+    summarize("/cycles/calendar 12 months", samples["cold"])
+    summarize("/cycles/calendar 12, cached", samples["cached"])
+    summarize("/cycles/calendar 1 month", samples["month"])
+    print(f"\nmismatches (client vs endpoint, cached vs cold): {mismatched}")
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--client-requests", type=int, default=30)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,154 @@
+"""Cycle forecasts without the LLM, for one user and in batch.
+
+Seeds --users users with --cycles cycles each (most regular, some not),
+then reports:
+  - /cycles/forecast and /ai/predict-cycle with explain off, which answer
+    from the NumPy engine alone, next to /ai/predict-cycle?explain=true,
+    which still goes through the Gemini path for its explanation. Gemini is
+    replaced by a model that answers instantly and the AI cache is cleared
+    before each call, so explain=true shows the overhead around the call;
+    a real call adds one to a few seconds on top
+  - batch mode over every user: one query for all histories, then one
+    vectorized pass, against the same engine called once per user. Both
+    must produce identical forecasts
+Pass --database-url postgresql+psycopg://... to run against Postgres.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from sqlalchemy import insert
+
+from app.main import app
+from app.models.models import AIInsight, Cycle, User, UserCycleStats, UserProfile
+from app.services.ai_cache import ai_cache
+from app.services.ai_service_gemini import get_ai_service
+from app.services.cycle_prediction import forecast_cycles, load_cycle_histories
+
+
+class InstantModel:
+    def generate_content(self, prompt):
+        return type("Response", (), {"text": "ok"})()
+
+
+def history(cycles):
+    """Cycle lengths ending about now; one user in five is irregular"""
+    if random.random() < 0.2:
+        lengths = [random.randint(24, 55) for _ in range(cycles)]
+    else:
+        usual = random.randint(25, 33)
+        lengths = [usual + random.randint(-2, 2) for _ in range(cycles)]
+    start = date.today() - timedelta(days=sum(lengths) - random.randint(0, 20))
+    rows = []
+    for length in lengths:
+        rows.append((start, length))
+        start += timedelta(days=length)
+    return rows
+
+
+def seed(database, users, cycles):
+    random.seed(21)
+    user_ids = [uuid4() for _ in range(users)]
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        for chunk in range(0, users, 1000):
+            conn.execute(insert(Cycle.__table__), [
+                {"id": uuid4(), "user_id": u, "last_period_date": start, "cycle_length": length,
+                 "period_length": 5}
+                for u in user_ids[chunk:chunk + 1000] for start, length in history(cycles)
+            ])
+    return user_ids
+
+
+async def endpoints(client, user_ids, requests):
+    paths = [
+        ("/cycles/forecast", "/api/v1/cycles/forecast", False),
+        ("/ai/predict-cycle", "/api/v1/ai/predict-cycle", False),
+        ("/ai/predict-cycle?explain=true", "/api/v1/ai/predict-cycle?explain=true", True),
+    ]
+    for label, path, uncached in paths:
+        samples = []
+        for i in range(requests):
+            user = override_user(app, user_ids[i % len(user_ids)])
+            if uncached:
+                ai_cache.invalidate_user(user.id)
+            with Timer() as t:
+                response = await client.get(path)
+            response.raise_for_status()
+            samples.append(t.ms)
+        summarize(label, samples)
+
+
+async def batch(database, user_ids, periods, rounds):
+    async with database.AsyncSessionLocal() as db:
+        with Timer() as t:
+            histories = await load_cycle_histories(db, user_ids)
+    print(f"load {len(user_ids)} histories ({sum(map(len, histories))} cycles), one query: {t.ms:.0f}ms")
+
+    today = date.today()
+    vectorized, loop = [], []
+    for _ in range(rounds):
+        with Timer() as t:
+            forecasts = forecast_cycles(histories, periods=periods, today=today)
+        vectorized.append(t.ms)
+        with Timer() as t:
+            singles = [forecast_cycles([h], periods=periods, today=today) for h in histories]
+        loop.append(t.ms)
+    summarize("vectorized pass", vectorized)
+    summarize("one user at a time", loop)
+
+    with Timer() as t:
+        batched = [forecasts.prediction(i) for i in range(len(forecasts))]
+    print(f"{'':<32} building {len(batched)} CyclePrediction objects: {t.ms:.0f}ms")
+    identical = batched == [single.prediction(0) for single in singles]
+    print(f"\nbatch and per-user forecasts identical: {identical}")
+    irregular = sum(p.is_irregular for p in batched if p)
+    print(f"irregular: {irregular}/{len(batched)} users")
+
+
+async def run(args):
+    tables = [User, UserProfile, Cycle, AIInsight, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+    get_ai_service().model = InstantModel()
+
+    with Timer() as t:
+        user_ids = seed(database, args.users, args.cycles)
+    print(f"seeded {args.users} users x {args.cycles} cycles in {t.ms / 1000:.0f}s\n")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await endpoints(client, user_ids, args.requests)
+    print()
+    await batch(database, user_ids, args.periods, args.rounds)
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--cycles", type=int, default=60)
+    parser.add_argument("--periods", type=int, default=6)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,166 @@
+"""Reading user_cycle_stats vs re-reading cycles, plus the cost of keeping it.
+
+"before" swaps get_cycle_stats for the previous data path: load the latest
+six Cycle rows and aggregate them in Python. "after" is the primary-key
+read of the precomputed row. Both run through a bench route that reads the
+stats and builds the average-length prediction, so only the cycle access
+differs (/ai/predict-cycle now uses the forecast engine, see
+bench_cycle_forecast.py; the /health endpoints join the row into their
+single feature query, see bench_risk_engine.py). Also reported:
+  - POST/DELETE /cycles with and without the in-transaction refresh
+  - check_cycle_stats rebuilding every user's row from raw cycles, and
+    verifying that the incremental rows still match after the writes
+Pass --database-url postgresql+psycopg://... to run against Postgres.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.api.v1.endpoints import cycles as cycles_endpoints
+from app.core.database import get_async_db
+from app.crud import crud_cycle_stats
+from app.main import app
+from app.models.models import AIInsight, Cycle, SymptomLog, User, UserCycleStats, UserProfile
+from app.services.cycle_prediction import predict_next_period
+
+ENDPOINTS = ["/bench/predict-from-stats"]
+READ_STATS = crud_cycle_stats.get_cycle_stats
+
+
+@app.get("/bench/predict-from-stats")
+async def predict_from_stats(user=Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return predict_next_period(await READ_STATS(db, user_id=user.id))
+
+
+async def stats_from_rows(db, *, user_id):
+    """The previous path: the latest six cycles, aggregated in Python"""
+    cycles = (
+        await db.scalars(
+            select(Cycle)
+            .where(Cycle.user_id == user_id)
+            .order_by(Cycle.last_period_date.desc())
+            .limit(crud_cycle_stats.STATS_WINDOW)
+        )
+    ).all()
+    return crud_cycle_stats.stats_from_cycles(user_id, cycles)
+
+
+async def skip_refresh(db, *, user_id):
+    pass
+
+
+def use(reader, refresh):
+    global READ_STATS
+    READ_STATS = reader
+    cycles_endpoints.refresh_cycle_stats = refresh
+
+
+def seed(database, users, cycles):
+    user_ids = [uuid4() for _ in range(users)]
+    start = date(2015, 1, 1)
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        conn.execute(insert(Cycle.__table__), [
+            {"id": uuid4(), "user_id": u, "last_period_date": start + timedelta(days=30 * i),
+             "cycle_length": random.choice([26, 28, 29, 31, 38, 50]), "period_length": 5}
+            for u in user_ids for i in range(cycles)
+        ])
+        conn.execute(insert(SymptomLog.__table__), [
+            {"id": uuid4(), "user_id": u, "log_date": start + timedelta(days=i), "notes": "acne, fatigue"}
+            for u in user_ids for i in range(30)
+        ])
+    return user_ids
+
+
+async def check(database, fix=False):
+    async with database.AsyncSessionLocal() as db:
+        with Timer() as t:
+            report = await crud_cycle_stats.check_cycle_stats(db, fix=fix)
+    return report, t.ms
+
+
+async def run(args):
+    random.seed(7)
+    tables = [User, UserProfile, Cycle, SymptomLog, AIInsight, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    user_ids = seed(database, args.users, args.cycles)
+    report, ms = await check(database, fix=True)
+    print(f"check_cycle_stats --fix over {args.users} users x {args.cycles} cycles:"
+          f" {ms:.0f}ms, {report['missing']} rows built")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print("\nreads (p50 per endpoint):")
+        for path in ENDPOINTS:
+            for label, reader in (("before", stats_from_rows), ("after", crud_cycle_stats.get_cycle_stats)):
+                use(reader, crud_cycle_stats.refresh_cycle_stats)
+                samples = []
+                for i in range(args.requests):
+                    override_user(app, user_ids[i % len(user_ids)])
+                    with Timer() as t:
+                        response = await client.get(path)
+                    response.raise_for_status()
+                    samples.append(t.ms)
+                summarize(f"{path.rsplit('/', 1)[1]} {label}", samples)
+
+        print("\nwrites (POST then DELETE /cycles):")
+        for label, refresh in (("no refresh", skip_refresh), ("with refresh", crud_cycle_stats.refresh_cycle_stats)):
+            use(crud_cycle_stats.get_cycle_stats, refresh)
+            samples = []
+            for i in range(args.requests):
+                override_user(app, random.choice(user_ids))
+                with Timer() as t:
+                    response = await client.post("/api/v1/cycles/", json={
+                        "cycle_start_date": (date(2030, 1, 1) + timedelta(days=i)).isoformat(),
+                        "cycle_length": random.randint(21, 60),
+                    })
+                    response.raise_for_status()
+                    if i % 2:
+                        (await client.delete(f"/api/v1/cycles/{response.json()['id']}")).raise_for_status()
+                samples.append(t.ms)
+            summarize(label, samples)
+
+    # "no refresh" writes left drift behind on purpose; the checker finds it
+    report, ms = await check(database)
+    print(f"\ncheck_cycle_stats after the writes: {ms:.0f}ms, checked={report['checked']}"
+          f" mismatched={report['mismatched']} (expected: users touched by 'no refresh')")
+    await check(database, fix=True)
+    report, _ = await check(database)
+    print(f"after --fix: mismatched={report['mismatched']} missing={report['missing']}")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--cycles", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
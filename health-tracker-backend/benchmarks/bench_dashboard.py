@@ -0,0 +1,130 @@
+"""Wall-clock time to load the dashboard: five calls vs GET /dashboard.
+
+The old sequence is /cycles/, /symptom-logs, /symptom-logs/today,
+/health/hormonal-risk and /ai/predict-cycle, issued one after another as
+the frontend did. Each request runs the real get_current_user with a
+bearer token. Gemini is replaced by a model that answers instantly, so
+the LLM call is not counted. The report covers latency per dashboard load
+and SQL statements per load, with --auth-cache on and off. Pass
+--database-url postgresql+psycopg://... to run against Postgres.
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from sqlalchemy import event
+
+from app.core.auth_cache import user_cache
+from app.core.security import create_access_token
+from app.main import app
+from app.crud.crud_cycle_stats import check_cycle_stats
+from app.models.models import AIInsight, Cycle, SymptomLog, User, UserCycleStats, UserProfile
+from app.services.ai_service_gemini import get_ai_service
+
+OLD_SEQUENCE = [
+    "/api/v1/cycles/",
+    "/api/v1/symptom-logs",
+    "/api/v1/symptom-logs/today",
+    "/api/v1/health/hormonal-risk",
+    "/api/v1/ai/predict-cycle",
+]
+NEW_SEQUENCE = ["/api/v1/dashboard"]
+
+
+class InstantModel:
+    def generate_content(self, prompt):
+        return type("Response", (), {"text": "ok"})()
+
+
+def seed(database, cycles, logs):
+    today = date.today()
+    with database.SessionLocal() as db:
+        user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            Cycle(
+                user_id=user.id,
+                last_period_date=today - timedelta(days=29 * i),
+                cycle_length=27 + i % 5,
+                period_length=5,
+            )
+            for i in range(cycles)
+        )
+        db.add_all(
+            SymptomLog(
+                user_id=user.id,
+                log_date=today - timedelta(days=i),
+                notes="acne and fatigue",
+            )
+            for i in range(logs)
+        )
+        db.commit()
+        return user.id
+
+
+async def load(client, paths):
+    for path in paths:
+        response = await client.get(path)
+        if response.status_code not in (200, 404):
+            response.raise_for_status()
+
+
+async def run(args):
+    tables = [User, UserProfile, Cycle, SymptomLog, AIInsight, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+    get_ai_service().model = InstantModel()
+
+    user_id = seed(database, args.cycles, args.logs)
+    async with database.AsyncSessionLocal() as db:
+        await check_cycle_stats(db, fix=True)  # seeded rows bypass the API
+    headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    statements = 0
+
+    @event.listens_for(database.async_engine.sync_engine, "before_cursor_execute")
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers=headers, timeout=None
+    ) as client:
+        for cached in (False, True):
+            user_cache.enabled = cached
+            for label, paths in (("5 calls", OLD_SEQUENCE), ("/dashboard", NEW_SEQUENCE)):
+                await load(client, paths)  # warm up
+                statements = 0
+                samples = []
+                for _ in range(args.loads):
+                    with Timer() as t:
+                        await load(client, paths)
+                    samples.append(t.ms)
+                summarize(f"{label} (auth cache {'on' if cached else 'off'})", samples)
+                print(f"{'':<32} {statements / args.loads:.1f} SQL statements/load")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--loads", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=24)
+    parser.add_argument("--logs", type=int, default=365)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,161 @@
+"""Date-range listing for users with years of daily logs.
+
+Seeds --users users with a symptom log every day for --years years and
+the cycles to match, then times, one user at a time:
+  - "show me March", before: page through every /symptom-logs page and
+    keep March locally, the only way to get a month without from/to
+  - /symptom-logs?from=&to= for one month (one page) and for one year
+    (first page of 100)
+  - /cycles/ for the whole history (one page of --cycle-limit, what the
+    endpoint returned for every request before the limit), the default
+    page, and one year via from/to
+The SQL each endpoint ran is then explained, so the report shows the
+index range scan behind every number; check_query_plans.py asserts the
+same shapes. Pass --database-url postgresql+psycopg://... to run against
+Postgres (plans then come from EXPLAIN ANALYZE).
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from sqlalchemy import event, insert, text
+
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User
+
+NOTES = ["cramps", "tired", "fine", "headache, bloating", "slept well", "acne"]
+
+
+def seed(database, users, years):
+    random.seed(23)
+    user_ids = [uuid4() for _ in range(users)]
+    first = date.today() - timedelta(days=365 * years)
+    days = (date.today() - first).days + 1
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        for u in user_ids:
+            conn.execute(insert(Cycle.__table__), [
+                {"id": uuid4(), "user_id": u, "last_period_date": first + timedelta(days=29 * i),
+                 "cycle_length": 29, "period_length": 5}
+                for i in range(days // 29)
+            ])
+            conn.execute(insert(SymptomLog.__table__), [
+                {"id": uuid4(), "user_id": u, "log_date": first + timedelta(days=i),
+                 "notes": random.choice(NOTES)}
+                for i in range(days)
+            ])
+    return user_ids
+
+
+async def every_page(client, path, params):
+    rows, cursor = [], None
+    while True:
+        response = await client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        response.raise_for_status()
+        rows += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+def explain(database, statement, parameters):
+    with database.engine.connect() as conn:
+        if database.engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters)).fetchall()
+            return [row[-1] for row in rows]
+        rows = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters).fetchall()
+        return [row[0] for row in rows]
+
+
+async def run(args):
+    tables = [User, Cycle, SymptomLog]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    with Timer() as t:
+        user_ids = seed(database, args.users, args.years)
+    with database.engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"seeded {args.users} users x {args.years} years of daily logs in {t.ms / 1000:.0f}s\n")
+
+    year = date.today().year - 1
+    march = {"from": date(year, 3, 1).isoformat(), "to": date(year, 3, 31).isoformat()}
+    whole_year = {"from": date(year, 1, 1).isoformat(), "to": date(year, 12, 31).isoformat()}
+
+    march_locally = lambda logs: [log for log in logs if march["from"] <= log["log_date"] <= march["to"]]
+    cases = [
+        ("March, every page + filter", "/api/v1/symptom-logs", {"limit": 100}, args.client_requests, march_locally),
+        ("March, from/to", "/api/v1/symptom-logs", {**march, "limit": 100}, args.requests, None),
+        ("one year, from/to, 1st page", "/api/v1/symptom-logs", {**whole_year, "limit": 100}, args.requests, None),
+        ("cycles, whole history", "/api/v1/cycles/", {"limit": args.cycle_limit}, args.requests, None),
+        ("cycles, default page", "/api/v1/cycles/", {}, args.requests, None),
+        ("cycles, one year, from/to", "/api/v1/cycles/", whole_year, args.requests, None),
+    ]
+
+    statements = []
+
+    @event.listens_for(database.async_engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        plans = {}
+        for label, path, params, requests, local in cases:
+            samples = []
+            for i in range(requests):
+                override_user(app, user_ids[i % len(user_ids)])
+                statements.clear()
+                with Timer() as t:
+                    if local:
+                        rows = local(await every_page(client, path, params))
+                    else:
+                        response = await client.get(path, params=params)
+                        response.raise_for_status()
+                        rows = response.json()
+                samples.append(t.ms)
+            summarize(label, samples)
+            print(f"{'':<32} {len(rows)} rows, {len(statements)} statements")
+            plans[label] = statements[-1]
+
+        override_user(app, user_ids[0])
+        paged = march_locally(await every_page(client, "/api/v1/symptom-logs", {"limit": 100}))
+        ranged = (await client.get("/api/v1/symptom-logs", params={**march, "limit": 100})).json()
+
+    print(f"\nsame March either way: {paged == ranged}")
+    print("\nplans (last statement of each case):")
+    for label, (statement, parameters) in plans.items():
+        print(f"  {label}")
+        for line in explain(database, statement, parameters):
+            print(f"      {line}")
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--client-requests", type=int, default=20)
+    parser.add_argument("--cycle-limit", type=int, default=200)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
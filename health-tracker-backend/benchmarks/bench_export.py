@@ -0,0 +1,158 @@
+"""Memory while streaming GET /export, against loading everything with .all().
+
+Seeds one user with --rows rows split across cycles, symptom logs and AI
+insights, then drives the ASGI app directly (httpx's ASGITransport buffers
+the whole body, which would hide the point). The send() callback drops each
+chunk and samples the process RSS every 100k lines, so a flat series means
+memory does not grow with history size. For comparison, the same rows are
+then loaded the way the list endpoints do, with .all() and one JSON
+document. Pass --database-url postgresql://... to run against Postgres,
+where yield_per uses a named (server-side) cursor.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+)
+
+from sqlalchemy import insert, select
+
+from app.main import app
+from app.models.models import AIInsight, Cycle, SymptomLog, User, UserProfile
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096 / 1024 / 1024
+
+
+def seed(database, rows):
+    cycles, insights = rows // 10, rows // 5
+    logs = rows - cycles - insights
+    start = date(1000, 1, 1)
+    created = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    with database.engine.begin() as conn:
+        user_id = uuid4()
+        conn.execute(insert(User.__table__), [{"id": user_id, "email": f"bench-{time.time_ns()}@example.com", "hashed_password": "x"}])
+        for offset in range(0, max(cycles, logs, insights), 50_000):
+            batch = range(offset, offset + 50_000)
+            if offset < logs:
+                conn.execute(insert(SymptomLog.__table__), [
+                    {"id": uuid4(), "user_id": user_id, "log_date": start + timedelta(days=i),
+                     "notes": f"cramps, fatigue and headache on day {i}", "created_at": created}
+                    for i in batch if i < logs
+                ])
+            if offset < cycles:
+                conn.execute(insert(Cycle.__table__), [
+                    {"id": uuid4(), "user_id": user_id, "last_period_date": start + timedelta(days=28 * i),
+                     "cycle_length": 26 + i % 6, "period_length": 5}
+                    for i in batch if i < cycles
+                ])
+            if offset < insights:
+                conn.execute(insert(AIInsight.__table__), [
+                    {"id": uuid4(), "user_id": user_id, "title": "Weekly summary",
+                     "content": "Your cycle looks regular. " * 4, "created_at": created + timedelta(minutes=i)}
+                    for i in batch if i < insights
+                ])
+    return user_id
+
+
+async def stream_export(path, sample_every):
+    """Run one GET through the ASGI app; returns (lines, bytes, RSS samples)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    lines = size = 0
+    samples = []
+    requested = False
+    done = asyncio.Event()
+
+    async def receive():
+        # the request, then nothing until the response is complete, as a
+        # server would; StreamingResponse listens for a disconnect meanwhile
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal lines, size
+        if message["type"] != "http.response.body":
+            return
+        if not message.get("more_body", False):
+            done.set()
+        chunk = message.get("body", b"")
+        before = lines
+        lines += chunk.count(b"\n")
+        size += len(chunk)
+        if lines // sample_every > before // sample_every:
+            samples.append((lines, rss_mb()))
+
+    await app(scope, receive, send)
+    return lines, size, samples
+
+
+async def load_all(database, user_id):
+    """The .all() shape of the list endpoints as one document; (bytes, RSS MB)"""
+    async with database.AsyncSessionLocal() as db:
+        payload = {}
+        for model in (Cycle, SymptomLog, AIInsight):
+            rows = (await db.scalars(select(model).where(model.user_id == user_id))).all()
+            payload[model.__tablename__] = [
+                {c.name: getattr(row, c.name) for c in model.__table__.columns} for row in rows
+            ]
+        document = json.dumps(payload, default=str)
+        return len(document), rss_mb()
+
+
+async def run(args):
+    tables = [User, UserProfile, Cycle, SymptomLog, AIInsight]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    with Timer() as t:
+        user_id = seed(database, args.rows)
+    print(f"seeded {args.rows:,} rows in {t.ms / 1000:.1f}s")
+    override_user(app, user_id)
+
+    baseline = rss_mb()
+    with Timer() as t:
+        lines, size, samples = await stream_export("/api/v1/export", args.sample_every)
+    print(f"streamed {lines:,} lines ({size / 1024 / 1024:.0f} MB NDJSON) in {t.ms / 1000:.1f}s"
+          f" = {lines / (t.ms / 1000):,.0f} rows/s")
+    print(f"RSS before: {baseline:.0f} MB")
+    for count, mb in samples:
+        print(f"  after {count:>9,} lines: {mb:6.0f} MB ({mb - baseline:+.0f})")
+
+    before = rss_mb()
+    with Timer() as t:
+        size, peak = await load_all(database, user_id)
+    print(f".all() + json.dumps: {size / 1024 / 1024:.0f} MB document in {t.ms / 1000:.1f}s,"
+          f" RSS {before:.0f} -> {peak:.0f} MB ({peak - before:+.0f})")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sample-every", type=int, default=100_000)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
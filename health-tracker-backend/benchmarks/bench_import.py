@@ -0,0 +1,101 @@
+"""Bulk import throughput and memory for POST /import/{kind}.
+
+Writes a --rows row CSV or NDJSON export to a temp file, streams it to the
+endpoint in 64 KB chunks, and reports wall time, rows per second and the
+growth in peak RSS during the import. Every --bad-every-th row is invalid, so
+the per-row error path is exercised too. Pass
+--database-url postgresql://... to run against Postgres instead of SQLite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import tempfile
+from datetime import date, timedelta
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+)
+
+import httpx
+
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User, UserCycleStats
+
+
+def write_export(path, kind, fmt, rows, bad_every):
+    start = date(1700, 1, 1)
+    with open(path, "w", newline="") as f:
+        if fmt == "csv":
+            f.write("log_date,notes\n" if kind == "symptom-logs" else "cycle_start_date,cycle_length,period_length\n")
+        for i in range(rows):
+            day = "not-a-date" if bad_every and i % bad_every == 0 else (start + timedelta(days=i)).isoformat()
+            if kind == "symptom-logs":
+                record = {"log_date": day, "notes": f"cramps, fatigue #{i}"}
+            else:
+                record = {"cycle_start_date": day, "cycle_length": 28 + i % 6, "period_length": 5}
+            if fmt == "csv":
+                f.write(",".join(f'"{v}"' if isinstance(v, str) and "," in v else str(v) for v in record.values()) + "\n")
+            else:
+                f.write(json.dumps(record) + "\n")
+
+
+async def chunks(path):
+    with open(path, "rb") as f:
+        while chunk := f.read(64 * 1024):
+            yield chunk
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run(args):
+    tables = [User, Cycle, SymptomLog, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+    override_user(app)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="ht-import-"), f"export.{args.format}")
+    write_export(path, args.kind, args.format, args.rows, args.bad_every)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        rss_before = peak_rss_mb()
+        with Timer() as t:
+            response = await client.post(
+                f"/api/v1/import/{args.kind}?format={args.format}",
+                content=chunks(path),
+            )
+        response.raise_for_status()
+        rss_after = peak_rss_mb()
+
+    report = response.json()
+    print(f"{args.rows} {args.kind} rows ({size_mb:.1f} MB {args.format}) in {t.ms / 1000:.2f}s"
+          f" = {args.rows / (t.ms / 1000):,.0f} rows/s")
+    print(f"inserted={report['inserted']} duplicates={report['duplicates']} failed={report['failed']}"
+          f" (first error: {report['errors'][0] if report['errors'] else None})")
+    print(f"peak RSS growth during import: {rss_after - rss_before:.1f} MB")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--kind", choices=["symptom-logs", "cycles"], default="symptom-logs")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--bad-every", type=int, default=1000)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
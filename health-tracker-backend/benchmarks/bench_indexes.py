@@ -0,0 +1,106 @@
+"""Per-user query latency with and without the composite indexes.
+
+Seeds --rows rows in each of cycles, symptom_logs and ai_insights, spread
+over --users users, then times the query shapes from check_query_plans
+for one user. Each shape runs first without the new indexes and then with
+them. symptom_logs is always served by its (user_id, log_date) unique
+constraint, so its two columns should match. Pass
+--database-url postgresql://... to run against Postgres instead of SQLite.
+"""
+import argparse
+import random
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from benchmarks._support import Timer, database_from_url, sqlite_database
+from benchmarks.check_query_plans import query_shapes
+
+from sqlalchemy import insert
+
+from app.models.models import AIInsight, Cycle, SymptomLog, User
+
+NEW_INDEXES = [
+    index
+    for table in (Cycle.__table__, AIInsight.__table__)
+    for index in table.indexes
+]
+CHUNK = 50_000
+
+
+def seed(database, rows, users):
+    user_ids = [uuid4() for _ in range(users)]
+    per_user = rows // users
+    start = date(1990, 1, 1)
+    created = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+    def chunks(make):
+        batch = []
+        # interleave users so a user's rows are spread over the whole table
+        for i in range(per_user):
+            for user_id in user_ids:
+                batch.append(make(user_id, i))
+                if len(batch) == CHUNK:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    with database.engine.begin() as conn:
+        for model, make in (
+            (Cycle, lambda u, i: dict(id=uuid4(), user_id=u, last_period_date=start + timedelta(days=28 * i), cycle_length=28, period_length=5)),
+            (SymptomLog, lambda u, i: dict(id=uuid4(), user_id=u, log_date=start + timedelta(days=i), notes="cramps")),
+            (AIInsight, lambda u, i: dict(id=uuid4(), user_id=u, title="insight", content="text", created_at=created + timedelta(hours=i))),
+        ):
+            for batch in chunks(make):
+                conn.execute(insert(model), batch)
+    return random.choice(user_ids)
+
+
+def measure(database, statement, repeat):
+    samples = []
+    with database.engine.connect() as conn:
+        for _ in range(repeat):
+            with Timer() as t:
+                conn.execute(statement).all()
+            samples.append(t.ms)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def run(args):
+    tables = [User, Cycle, SymptomLog, AIInsight]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+
+    with Timer() as t:
+        user_id = seed(database, args.rows, args.users)
+    print(f"seeded {args.rows} rows x 3 tables for {args.users} users in {t.ms / 1000:.1f}s\n")
+
+    shapes = query_shapes(user_id)
+    results = {}
+    for state in ("without", "with"):
+        with database.engine.begin() as conn:
+            for index in NEW_INDEXES:
+                if state == "with":
+                    index.create(conn, checkfirst=True)
+                else:
+                    index.drop(conn, checkfirst=True)
+            if conn.dialect.name == "postgresql":
+                conn.exec_driver_sql("ANALYZE")
+        for label, _, _, statement in shapes:
+            results.setdefault(label, {})[state] = measure(database, statement, args.repeat)
+
+    print(f"{'query':<28} {'without (p50)':>14} {'with (p50)':>12}")
+    for label, timings in results.items():
+        print(f"{label:<28} {timings['without']:>12.2f}ms {timings['with']:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default="")
+    run(parser.parse_args())
@@ -0,0 +1,118 @@
+"""Symptom keyword scanning: the compiled matcher vs the previous loops.
+
+Over --notes generated notes, times:
+  - pcos loop: `k in text` for every PCOS keyword, per log (the old
+    calculate_pcos_risk)
+  - hormonal any(): `any(word in text ...)` per log (the old
+    analyze_hormonal_risk)
+  - joined scan: every note joined into one string, substring-scanned per
+    keyword (the old /health/hormonal-risk)
+  - substring sets: `k in text` for the union of every scorer's keywords,
+    per log (risk_engine before the matcher), and the same over every
+    synonym too, which is what the matcher's vocabulary would cost that way
+  - matcher: KEYWORD_MATCHER.match_all, one regex pass per log for all of
+    them, on whole words, with synonyms folded in
+The old loops each cover one scorer's keywords; the last two cover all three.
+Also counts the logs whose keyword sets differ between substring sets and
+the matcher, with a few examples, since word boundaries and synonyms change
+what matches by design.
+"""
+import argparse
+import random
+
+from benchmarks._support import Timer, summarize
+
+from app.services.risk_engine import KEYWORD_MATCHER, KEYWORDS, SYNONYMS
+
+PCOS_KEYWORDS = [
+    "acne", "weight gain", "facial hair", "hair fall", "hair loss",
+    "irregular bleeding", "fatigue", "missed period",
+]
+PCOD_KEYWORDS = [
+    "acne", "pimples", "weight", "obese", "hair fall", "hairfall", "facial hair",
+    "chin hair", "thinning hair", "fatigue", "tired", "mood", "anxiety", "depression",
+]
+HORMONAL_KEYWORDS = [
+    "acne", "hair fall", "facial hair", "weight gain", "irregular periods", "fatigue", "mood swings",
+]
+
+FORMS = list(KEYWORDS) + [v for variants in SYNONYMS.values() for v in variants]
+
+PHRASES = [
+    "acne", "pimples on chin", "hairfall", "hair fall", "facial hair", "chin hairs", "weight gain",
+    "gained weight", "overweight", "fatigue", "so tired", "exhausted", "moody", "mood swings",
+    "anxious", "cramps", "bloating", "headache", "late period", "irregular periods", "spotting",
+    "felt fine", "slept well", "went for a run", "busy day at work", "craving chocolate",
+    "backache", "no symptoms today", "sweetweight", "hairfalling",
+]
+
+
+def make_notes(count):
+    random.seed(11)
+    return [
+        ", ".join(random.sample(PHRASES, random.randint(1, 5))) + random.choice(["", ".", "!", " :("])
+        for _ in range(count)
+    ]
+
+
+def pcos_loop(notes):
+    hits = 0
+    for note in notes:
+        text = note.lower()
+        for k in PCOS_KEYWORDS:
+            if k in text:
+                hits += 1
+    return hits
+
+
+def hormonal_any(notes):
+    return sum(1 for note in notes if any(word in note.lower() for word in PCOD_KEYWORDS))
+
+
+def joined_scan(notes):
+    text = " ".join(note.lower() for note in notes)
+    return [k for k in HORMONAL_KEYWORDS if k in text]
+
+
+def substring_sets(notes, forms=KEYWORDS):
+    return [frozenset(k for k in forms if k in text) for text in (n.lower() for n in notes)]
+
+
+def substring_every_form(notes):
+    return substring_sets(notes, FORMS)
+
+
+def matcher(notes):
+    return KEYWORD_MATCHER.match_all(notes)
+
+
+def main(args):
+    notes = make_notes(args.notes)
+
+    old, new = substring_sets(notes), matcher(notes)
+    differ = [(n, sorted(a), sorted(b)) for n, a, b in zip(notes, old, new) if a != b]
+    print(f"{len(differ)} of {len(notes)} notes match differently; for example:")
+    for note, a, b in differ[:5]:
+        print(f"  {note!r}\n    substring: {a}\n    matcher:   {b}")
+    print(f"\n{len(notes)} notes:")
+    for label, scan in (
+        ("pcos loop", pcos_loop),
+        ("hormonal any()", hormonal_any),
+        ("joined scan", joined_scan),
+        ("substring sets", substring_sets),
+        ("substring, all forms", substring_every_form),
+        ("matcher", matcher),
+    ):
+        samples = []
+        for _ in range(args.runs):
+            with Timer() as t:
+                scan(notes)
+            samples.append(t.ms)
+        summarize(label, samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=10)
+    main(parser.parse_args())
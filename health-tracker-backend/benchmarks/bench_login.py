@@ -0,0 +1,82 @@
+"""Login throughput at concurrency 1, 8 and 64.
+
+Seeds one user whose hash uses a different bcrypt cost than BCRYPT_ROUNDS,
+checks that the first login rehashes it, then measures /auth/login
+throughput and /health latency while the logins run.
+"""
+import argparse
+import asyncio
+
+from benchmarks._support import Timer, override_db, sqlite_database, summarize
+
+import httpx
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.main import app
+from app.models.models import User
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+
+
+async def probe(client, stop, samples):
+    while not stop.is_set():
+        with Timer() as t:
+            await client.get("/health")
+        samples.append(t.ms)
+        await asyncio.sleep(0.01)
+
+
+async def run(logins: int, levels):
+    database = sqlite_database([User])
+    override_db(app, database)
+
+    old_cost = settings.BCRYPT_ROUNDS - 1 if settings.BCRYPT_ROUNDS > 4 else 5
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=old_cost)
+    db = database.SessionLocal()
+    user = User(email=EMAIL, hashed_password=old_context.hash(PASSWORD))
+    db.add(user)
+    db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        body = {"email": EMAIL, "password": PASSWORD}
+        (await client.post("/api/v1/auth/login", json=body)).raise_for_status()
+        db.refresh(user)
+        print(f"rehash on login: cost {old_cost} -> {user.hashed_password[4:6]}")
+        db.close()
+
+        for concurrency in levels:
+            gate = asyncio.Semaphore(concurrency)
+            stop = asyncio.Event()
+            health = []
+            prober = asyncio.create_task(probe(client, stop, health))
+
+            async def login():
+                async with gate:
+                    response = await client.post("/api/v1/auth/login", json=body)
+                    response.raise_for_status()
+
+            with Timer() as t:
+                await asyncio.gather(*(login() for _ in range(logins)))
+            stop.set()
+            await prober
+
+            print(
+                f"concurrency {concurrency:>3}: "
+                f"{logins / (t.ms / 1000):7.1f} logins/s "
+                f"(cost {settings.BCRYPT_ROUNDS}, "
+                f"{settings.PASSWORD_HASH_WORKERS} hash workers)"
+            )
+            summarize("  GET /health during burst", health)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 64])
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.levels))
@@ -0,0 +1,115 @@
+"""Offset vs keyset paging of GET /symptom-logs on a user with 10k logs.
+
+Page 1 and page --deep-page are fetched --requests times each, once with
+?skip= and once with ?cursor=, and the latencies compared. The deep cursor
+is built from the last row of the previous page, as a client walking the
+pages would receive it. Both modes must return the same rows. Pass
+--database-url postgresql://... to run against Postgres instead of SQLite.
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from sqlalchemy import select
+
+from app.core.pagination import encode_cursor
+from app.main import app
+from app.models.models import SymptomLog, User
+
+
+def seed(database, user_id, rows, other_users):
+    start = date(2000, 1, 1)
+    with database.SessionLocal() as db:
+        owners = [(user_id, rows)] + [(uuid4(), rows // 10) for _ in range(other_users)]
+        for owner, count in owners:
+            db.add_all(
+                SymptomLog(
+                    user_id=owner,
+                    log_date=start + timedelta(days=i),
+                    notes="cramps and fatigue",
+                )
+                for i in range(count)
+            )
+            db.commit()
+
+
+def cursor_before(database, user_id, offset):
+    """Cursor a client holds after reading the first `offset` rows"""
+    with database.SessionLocal() as db:
+        log = db.scalars(
+            select(SymptomLog)
+            .where(SymptomLog.user_id == user_id)
+            .order_by(SymptomLog.log_date.desc(), SymptomLog.id.desc())
+            .offset(offset - 1)
+            .limit(1)
+        ).one()
+    return encode_cursor(log.log_date, log.id)
+
+
+async def timed(client, path, requests):
+    samples = []
+    for _ in range(requests):
+        with Timer() as t:
+            response = await client.get(path)
+        response.raise_for_status()
+        samples.append(t.ms)
+    return samples, [item["id"] for item in response.json()]
+
+
+async def run(args):
+    tables = [User, SymptomLog]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+    user = override_user(app)
+    seed(database, user.id, args.rows, args.other_users)
+
+    deep_skip = (args.deep_page - 1) * args.limit
+    deep_cursor = cursor_before(database, user.id, deep_skip)
+    base = f"/api/v1/symptom-logs?limit={args.limit}"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        await client.get(base)  # warm up
+
+        # Following X-Next-Cursor must give the same page 2 as ?skip=
+        next_cursor = (await client.get(base)).headers["X-Next-Cursor"]
+        _, cursor_second = await timed(client, f"{base}&cursor={next_cursor}", 1)
+        _, offset_second = await timed(client, f"{base}&skip={args.limit}", 1)
+        assert cursor_second == offset_second, "cursor page 2 differs from offset page 2"
+
+        samples, _ = await timed(client, base, args.requests)
+        summarize("page 1 (first page)", samples)
+        samples, offset_rows = await timed(client, f"{base}&skip={deep_skip}", args.requests)
+        summarize(f"page {args.deep_page} offset", samples)
+        samples, cursor_rows = await timed(client, f"{base}&cursor={deep_cursor}", args.requests)
+        summarize(f"page {args.deep_page} cursor", samples)
+        assert offset_rows == cursor_rows, "cursor page differs from offset page"
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--other-users", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""Drive the CRUD endpoints past the connection pool size.
+
+Uses a deliberately small instrumented pool on a SQLite stand-in and
+fires --concurrency requests at a time at the cycle and symptom-log
+endpoints, then prints response codes and the pool statistics that
+/internal/db-pool would report (queued versus failed checkouts).
+"""
+import argparse
+import asyncio
+import json
+from collections import Counter
+from datetime import date, timedelta
+
+from benchmarks._support import Timer, override_db, override_user, sqlite_database
+
+import httpx
+
+from app.core.db_metrics import InstrumentedAsyncAdaptedQueuePool, pool_status
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User
+
+
+async def run(args):
+    database = sqlite_database(
+        [User, Cycle, SymptomLog],
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+        pool_timeout=args.pool_timeout,
+    )
+    override_db(app, database)
+    override_user(app)
+
+    start_date = date(2020, 1, 1)
+    requests = []
+    for i in range(args.requests):
+        kind = i % 3
+        if kind == 0:
+            requests.append(("GET", "/api/v1/symptom-logs", None))
+        elif kind == 1:
+            log_date = (start_date + timedelta(days=i)).isoformat()
+            requests.append(
+                ("POST", "/api/v1/symptom-logs", {"log_date": log_date, "notes": "cramps"})
+            )
+        else:
+            requests.append(("GET", "/api/v1/cycles/", None))
+
+    gate = asyncio.Semaphore(args.concurrency)
+    codes = Counter()
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+
+        async def send(method, path, body):
+            async with gate:
+                response = await client.request(method, path, json=body)
+                codes[response.status_code] += 1
+
+        with Timer() as t:
+            await asyncio.gather(*(send(*r) for r in requests))
+
+    print(
+        f"{args.requests} requests at concurrency {args.concurrency} "
+        f"in {t.ms:.0f}ms, pool_size={args.pool_size} "
+        f"max_overflow={args.max_overflow} timeout={args.pool_timeout}s"
+    )
+    print("status codes:", dict(sorted(codes.items())))
+    print(json.dumps(pool_status(database.async_engine.sync_engine), indent=2))
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--max-overflow", type=int, default=1)
+    parser.add_argument("--pool-timeout", type=float, default=0.5)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""Per-request cost of the metrics middleware.
+
+Calls a bare ASGI app that answers at once (it only marks the route the way
+the router does) --requests times per round, directly, with no server or
+client in the way, so the difference between rows is the middleware.
+Cases take turns within each of --rounds rounds:
+  - bare: the app alone
+  - RequestMetricsMiddleware: route counts, status, in-flight, latency
+  - + QueryStatsMiddleware: the stack main.py builds (SQL collection on,
+    headers off as in production); with no statements run, this is the
+    bookkeeping cost only
+Each row reports the best and median round in microseconds per request,
+and the overhead over bare. The time to render /metrics after the run is
+shown for --routes routes.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from benchmarks._support import Timer
+
+from app.core.db_metrics import QueryMetrics, QueryStatsMiddleware, render_queries
+from app.core.metrics import PrometheusText, RequestMetrics, RequestMetricsMiddleware, render_requests
+
+START = {"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"2")]}
+BODY = {"type": "http.response.body", "body": b"{}"}
+
+
+def make_app(routes):
+    async def app(scope, receive, send):
+        scope["route"] = routes[scope["path"]]
+        await send(START)
+        await send(BODY)
+
+    return app
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def per_request_us(app, scopes, requests):
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(dict(scopes[i % len(scopes)]), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(args):
+    paths = [f"/api/v1/resource-{i}/{{item_id}}" for i in range(args.routes)]
+    routes = {path: SimpleNamespace(path=path) for path in paths}
+    scopes = [{"type": "http", "method": "GET", "path": path} for path in paths]
+
+    app = make_app(routes)
+    request_metrics, query_metrics = RequestMetrics(), QueryMetrics()
+    with_metrics = RequestMetricsMiddleware(app, metrics=request_metrics)
+    stack = RequestMetricsMiddleware(QueryStatsMiddleware(app, metrics=query_metrics), metrics=request_metrics)
+
+    cases = {"bare": app, "RequestMetricsMiddleware": with_metrics, "+ QueryStatsMiddleware": stack}
+    samples = {label: [] for label in cases}
+    for round_ in range(args.rounds + 1):
+        # cases take turns each round, so drift in machine speed hits all of them
+        for label, case in cases.items():
+            us = await per_request_us(case, scopes, args.requests)
+            if round_:  # the first round is a warm-up
+                samples[label].append(us)
+
+    print(f"{'':<28} {'best':>8} {'median':>8} {'overhead':>9}  (us/request)")
+    bare = statistics.median(samples["bare"])
+    for label, us in samples.items():
+        print(f"{label:<28} {min(us):8.2f} {statistics.median(us):8.2f} {statistics.median(us) - bare:9.2f}")
+
+    recorded = sum(sum(s.statuses.values()) for s in request_metrics.routes.values())
+    with Timer() as t:
+        out = PrometheusText()
+        render_requests(out, request_metrics)
+        render_queries(out, query_metrics)
+        text = out.render()
+    print(f"\n{recorded:,} requests recorded over {len(request_metrics.routes)} routes")
+    print(f"/metrics render: {t.ms:.2f}ms, {len(text.splitlines()):,} lines, {len(text) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--routes", type=int, default=40)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,153 @@
+"""Queries and latency for the /health risk reports, before and after.
+
+"before" are the previous handlers' data access, mounted under
+/bench/before: hormonal-risk read the cycle stats and 30 symptom logs,
+pcos-risk read the stats, 20 logs and the profile, each endpoint on its
+own. "after" are the current endpoints, one feature query each, and
+/health/risk, which returns every report from a single query. Scoring is
+the same in both, so only the data access differs. Pass
+--database-url postgresql+psycopg://... to run against Postgres.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.crud.crud_cycle_stats import check_cycle_stats, get_cycle_stats
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User, UserCycleStats, UserProfile
+from app.services.risk_engine import assess, build_features, log_tags
+
+NOTES = ["acne and fatigue", "hair fall", "fine", "mood swings, weight gain", "cramps"]
+
+
+# ---- previous data access, scored by the current scorers ----
+
+@app.get("/bench/before/hormonal-risk")
+async def before_hormonal(db: AsyncSession = Depends(get_async_db)):
+    stats = await get_cycle_stats(db, user_id=BENCH_USER.id)
+    symptoms = (
+        await db.scalars(select(SymptomLog).where(SymptomLog.user_id == BENCH_USER.id).limit(30))
+    ).all()
+    return assess(build_features(stats, [log_tags(s.tags, s.notes) for s in symptoms]), ["hormonal"])["hormonal"]
+
+
+@app.get("/bench/before/pcos-risk")
+async def before_pcos(db: AsyncSession = Depends(get_async_db)):
+    stats = await get_cycle_stats(db, user_id=BENCH_USER.id)
+    symptoms = (
+        await db.scalars(select(SymptomLog).where(SymptomLog.user_id == BENCH_USER.id).limit(20))
+    ).all()
+    profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == BENCH_USER.id))
+    features = build_features(
+        stats,
+        [log_tags(s.tags, s.notes) for s in symptoms],
+        height_cm=profile.height_cm if profile else None,
+        weight_kg=profile.weight_kg if profile else None,
+    )
+    return assess(features, ["pcos"])["pcos"]
+
+
+SEQUENCES = [
+    ("before: 2 endpoints", ["/bench/before/hormonal-risk", "/bench/before/pcos-risk"]),
+    ("after: 2 endpoints", ["/api/v1/health/hormonal-risk", "/api/v1/health/pcos-risk"]),
+    ("after: /health/risk", ["/api/v1/health/risk"]),
+]
+
+
+def seed(database, users, cycles, logs):
+    random.seed(5)
+    user_ids = [uuid4() for _ in range(users)]
+    start = date.today() - timedelta(days=logs)
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        conn.execute(insert(UserProfile.__table__), [
+            {"id": uuid4(), "user_id": u, "height_cm": 160, "weight_kg": random.randint(50, 80)}
+            for u in user_ids
+        ])
+        conn.execute(insert(Cycle.__table__), [
+            {"id": uuid4(), "user_id": u, "last_period_date": start + timedelta(days=30 * i),
+             "cycle_length": random.choice([27, 28, 30, 36, 48]), "period_length": 5}
+            for u in user_ids for i in range(cycles)
+        ])
+        conn.execute(insert(SymptomLog.__table__), [
+            {"id": uuid4(), "user_id": u, "log_date": start + timedelta(days=i), "notes": random.choice(NOTES)}
+            for u in user_ids for i in range(logs)
+        ])
+    return user_ids
+
+
+async def run(args):
+    global BENCH_USER
+
+    tables = [User, UserProfile, Cycle, SymptomLog, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    user_ids = seed(database, args.users, args.cycles, args.logs)
+    async with database.AsyncSessionLocal() as db:
+        await check_cycle_stats(db, fix=True)  # seeded rows bypass the API
+
+    statements = 0
+
+    @event.listens_for(database.async_engine.sync_engine, "before_cursor_execute")
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # the same reports either way
+        BENCH_USER = override_user(app, user_ids[0])
+        before = [(await client.get(p)).json() for p in SEQUENCES[0][1]]
+        after = [(await client.get(p)).json() for p in SEQUENCES[1][1]]
+        combined = (await client.get("/api/v1/health/risk")).json()
+        same = before == after == [combined["hormonal"], combined["pcos"]]
+        print(f"reports identical: {same}")
+
+        for label, paths in SEQUENCES:
+            statements = 0
+            samples = []
+            for i in range(args.requests):
+                BENCH_USER = override_user(app, user_ids[i % len(user_ids)])
+                with Timer() as t:
+                    for path in paths:
+                        (await client.get(path)).raise_for_status()
+                samples.append(t.ms)
+            summarize(label, samples)
+            print(f"{'':<32} {statements / args.requests:.1f} SQL statements per user")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--cycles", type=int, default=24)
+    parser.add_argument("--logs", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
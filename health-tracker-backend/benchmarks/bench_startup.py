@@ -0,0 +1,107 @@
+"""Import time of app.main and cold start of the API process.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the total plus the packages with the most self time, then starts uvicorn
+--runs times and measures the time until GET /health answers 200. Nothing
+here needs a database: importing the app must not connect to one.
+
+With --max-import-ms the script exits non-zero when the median import time
+is above the budget, so it can guard against regressions in CI.
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks._support import summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile():
+    """(total_ms, {top-level package: self ms}) for one fresh import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        if name == "app.main":
+            total = int(match.group(2)) / 1000
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(match.group(1)) / 1000
+    return total, packages
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cold_start(timeout):
+    """Milliseconds from spawning uvicorn to the first 200 from /health"""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=os.environ,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"API did not answer /health within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(runs, top, max_import_ms, timeout):
+    totals = []
+    packages = {}
+    for _ in range(runs):
+        total, packages = import_profile()
+        totals.append(total)
+    summarize("import app.main", totals)
+
+    print("\nimport self time by package (last run):")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<40} {ms:8.1f}ms")
+    print()
+
+    summarize("spawn -> first /health 200", [cold_start(timeout) for _ in range(runs)])
+
+    if max_import_ms is not None and statistics.median(totals) > max_import_ms:
+        print(f"\nimport time {statistics.median(totals):.0f}ms exceeds budget {max_import_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    run(args.runs, args.top, args.max_import_ms, args.timeout)
@@ -0,0 +1,128 @@
+"""Cycle statistics in SQL window functions vs in Python, for a long history.
+
+Seeds one user with --cycles cycles (plus other users, so the per-user
+filter matters) and a year of symptom logs. "sql" is crud_stats:
+get_cycle_summary (one round-trip) and get_rolling_averages (LAG and a
+ROWS frame in the database). "python" loads every Cycle row, derives the
+gaps and the same numbers in Python, and counts symptom logs with two
+more queries, which is how these endpoints would otherwise be written. The
+two results are compared, then timed. Pass
+--database-url postgresql+psycopg://... to run against Postgres.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import database_from_url, sqlite_database, summarize, Timer
+
+from sqlalchemy import func, insert, select
+
+from app.crud.crud_stats import get_cycle_summary, get_rolling_averages
+from app.models.models import Cycle, SymptomLog, User
+
+
+def seed(database, cycles, other_users):
+    random.seed(3)
+    user_ids = [uuid4() for _ in range(other_users + 1)]
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        for u in user_ids:
+            day = date(1980, 1, 1)
+            rows = []
+            for _ in range(cycles):
+                rows.append({"id": uuid4(), "user_id": u, "last_period_date": day,
+                             "cycle_length": 28, "period_length": 5})
+                day += timedelta(days=random.randint(24, 40))
+            conn.execute(insert(Cycle.__table__), rows)
+        conn.execute(insert(SymptomLog.__table__), [
+            {"id": uuid4(), "user_id": user_ids[0], "log_date": date.today() - timedelta(days=i), "notes": "cramps"}
+            for i in range(365)
+        ])
+    return user_ids[0]
+
+
+async def python_stats(db, user_id, window, limit):
+    cycles = (
+        await db.scalars(
+            select(Cycle).where(Cycle.user_id == user_id).order_by(Cycle.last_period_date, Cycle.id)
+        )
+    ).all()
+    gaps = [(b.last_period_date - a.last_period_date).days for a, b in zip(cycles, cycles[1:])]
+    logs = await db.scalar(select(func.count()).select_from(SymptomLog).where(SymptomLog.user_id == user_id))
+    recent_logs = await db.scalar(
+        select(func.count()).select_from(SymptomLog).where(
+            SymptomLog.user_id == user_id,
+            SymptomLog.log_date >= date.today() - timedelta(days=30),
+        )
+    )
+    trend = statistics.linear_regression(range(2, len(gaps) + 2), gaps).slope if len(gaps) >= 2 else None
+    summary = {
+        "cycle_count": len(cycles),
+        "observed_cycles": len(gaps),
+        "average_cycle_length_days": round(statistics.mean(gaps), 1) if gaps else None,
+        "shortest_cycle_days": min(gaps, default=None),
+        "longest_cycle_days": max(gaps, default=None),
+        "cycle_length_stdev_days": round(statistics.stdev(gaps), 2) if len(gaps) >= 2 else None,
+        "trend_days_per_cycle": round(trend, 3) if trend is not None else None,
+        "last_period_date": cycles[-1].last_period_date if cycles else None,
+        "symptom_logs_total": logs,
+        "symptom_logs_last_30_days": recent_logs,
+    }
+    rolling = [
+        {
+            "cycle_start_date": cycles[i].last_period_date,
+            "cycle_length_days": gaps[i],
+            "rolling_average_days": round(statistics.mean(gaps[i - window + 1:i + 1]), 1),
+        }
+        for i in range(window - 1, len(gaps))
+    ][-limit:]
+    return summary, rolling
+
+
+async def sql_stats(db, user_id, window, limit):
+    summary = await get_cycle_summary(db, user_id=user_id)
+    rolling = await get_rolling_averages(db, user_id=user_id, window=window, limit=limit)
+    return summary, rolling
+
+
+async def run(args):
+    tables = [User, Cycle, SymptomLog]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    user_id = seed(database, args.cycles, args.other_users)
+
+    async with database.AsyncSessionLocal() as db:
+        expected = await python_stats(db, user_id, args.window, args.limit)
+        actual = await sql_stats(db, user_id, args.window, args.limit)
+        for name, a, b in (("summary", expected[0], actual[0]), ("rolling", expected[1], actual[1])):
+            print(f"{name}: {'match' if a == b else f'MISMATCH {a} != {b}'}")
+
+        for label, compute in (("python", python_stats), ("sql", sql_stats)):
+            samples = []
+            for _ in range(args.runs):
+                with Timer() as t:
+                    await compute(db, user_id, args.window, args.limit)
+                samples.append(t.ms)
+            summarize(f"{label} ({args.cycles} cycles)", samples)
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=500)
+    parser.add_argument("--other-users", type=int, default=200)
+    parser.add_argument("--window", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
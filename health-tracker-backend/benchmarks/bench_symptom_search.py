@@ -0,0 +1,132 @@
+"""Search latency over symptom notes, and what a client did without it.
+
+Seeds --users users x --logs logs (1M notes by default) from a vocabulary
+where some words are common and some rare, then times for one user at a
+time:
+  - "download and filter": page through /symptom-logs 100 at a time and
+    filter the notes locally, which clients had to do before
+  - /symptom-logs/search for a common word, a rare word, two words, a date
+    range and "when did I last log ..." (order=recent, limit=1)
+On SQLite this exercises the portable fallback (substring match on each
+word); pass --database-url postgresql+psycopg://... to run the tsvector /
+GIN path, which needs the search_vector column and index from the model.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from sqlalchemy import insert
+
+from app.main import app
+from app.models.models import SymptomLog, User
+
+COMMON = ["cramps", "tired", "headache", "bloating", "fine", "slept", "work", "walk"]
+RARE = ["migraine", "nausea", "dizzy", "spotting"]
+FILLER = ["today", "bad", "mild", "morning", "evening", "after", "lunch", "really", "again", "a", "bit"]
+
+
+def note():
+    words = random.sample(FILLER, 3) + random.sample(COMMON, 2)
+    if random.random() < 0.02:
+        words.append(random.choice(RARE))
+    random.shuffle(words)
+    return " ".join(words)
+
+
+def seed(database, users, logs):
+    random.seed(20)
+    user_ids = [uuid4() for _ in range(users)]
+    start = date.today() - timedelta(days=logs - 1)
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        for u in user_ids:
+            conn.execute(insert(SymptomLog.__table__), [
+                {"id": uuid4(), "user_id": u, "log_date": start + timedelta(days=i), "notes": note()}
+                for i in range(logs)
+            ])
+    return user_ids
+
+
+async def download_and_filter(client, word):
+    """Every page of /symptom-logs, then a local substring filter"""
+    matches, cursor = [], None
+    while True:
+        params = {"limit": 100, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/symptom-logs", params=params)
+        response.raise_for_status()
+        matches += [log for log in response.json() if word in log["notes"].lower()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return matches
+
+
+async def run(args):
+    tables = [User, SymptomLog]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    with Timer() as t:
+        user_ids = seed(database, args.users, args.logs)
+    print(f"seeded {args.users * args.logs} notes in {t.ms / 1000:.0f}s\n")
+
+    recent = (date.today() - timedelta(days=90)).isoformat()
+    searches = [
+        ("common word", {"q": "cramps"}),
+        ("rare word", {"q": "migraine"}),
+        ("two words", {"q": "cramps headache"}),
+        ("date range, 90 days", {"q": "cramps", "from": recent}),
+        ("last time (recent, 1)", {"q": "nausea", "order": "recent", "limit": 1}),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        samples = []
+        for i in range(args.downloads):
+            override_user(app, user_ids[i % len(user_ids)])
+            with Timer() as t:
+                await download_and_filter(client, "cramps")
+            samples.append(t.ms)
+        summarize("download and filter", samples)
+
+        for label, params in searches:
+            samples, hits = [], 0
+            for i in range(args.requests):
+                override_user(app, random.choice(user_ids))
+                with Timer() as t:
+                    response = await client.get("/api/v1/symptom-logs/search", params=params)
+                response.raise_for_status()
+                samples.append(t.ms)
+                hits += bool(response.json())
+            summarize(label, samples)
+            print(f"{'':<32} {hits}/{args.requests} searches found something")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--logs", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--downloads", type=int, default=20)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,154 @@
+"""Symptom tags stored at write time vs keyword scanning on every read.
+
+Seeds --users users with --logs symptom logs each, written without tags
+(as they were before the column existed), then:
+  - times /health/risk while every log is untagged, so the 30 recent notes
+    are fetched and scanned per request (the previous behaviour), and
+    /stats/symptom-tags next to its Python equivalent: pull every note in
+    the window and run the matcher over it
+  - runs backfill_symptom_tags over the whole table
+  - times the same endpoints again, now reading tags; the tag counts come
+    from one GROUP BY over the unnested arrays
+The reports before and after are compared. Pass
+--database-url postgresql+psycopg://... to run against Postgres, where the
+GIN index and unnest are used.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+from uuid import uuid4
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+    summarize,
+)
+
+import httpx
+from fastapi import Depends, Query
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.crud.crud_cycle_stats import check_cycle_stats
+from app.crud.crud_symptom import backfill_symptom_tags
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User, UserCycleStats, UserProfile
+from app.services.risk_engine import KEYWORD_MATCHER
+
+PHRASES = [
+    "acne", "pimples", "hairfall", "facial hair", "weight gain", "so tired", "moody", "cramps",
+    "bloating", "headache", "late period", "felt fine", "slept well", "busy day", "anxious",
+]
+
+
+@app.get("/bench/notes/symptom-tags")
+async def tags_from_notes(days: int = Query(90), db: AsyncSession = Depends(get_async_db)):
+    """The Python way: every note in the window, matched on each request"""
+    since = date.today() - timedelta(days=days - 1)
+    notes = (
+        await db.scalars(
+            select(SymptomLog.notes).where(SymptomLog.user_id == BENCH_USER.id, SymptomLog.log_date >= since)
+        )
+    ).all()
+    counts = Counter(tag for found in KEYWORD_MATCHER.match_all(notes) for tag in found)
+    return {
+        "since": since.isoformat(),
+        "logs": len(notes),
+        "tags": [{"tag": t, "logs": n} for t, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))],
+    }
+
+
+def seed(database, users, logs):
+    random.seed(19)
+    user_ids = [uuid4() for _ in range(users)]
+    start = date.today() - timedelta(days=logs - 1)
+    with database.engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": u, "email": f"bench-{time.time_ns()}-{i}@example.com", "hashed_password": "x"}
+            for i, u in enumerate(user_ids)
+        ])
+        conn.execute(insert(Cycle.__table__), [
+            {"id": uuid4(), "user_id": u, "last_period_date": start + timedelta(days=31 * i),
+             "cycle_length": random.choice([27, 29, 33, 41]), "period_length": 5}
+            for u in user_ids for i in range(logs // 31)
+        ])
+        for u in user_ids:
+            conn.execute(insert(SymptomLog.__table__), [
+                {"id": uuid4(), "user_id": u, "log_date": start + timedelta(days=i),
+                 "notes": ", ".join(random.sample(PHRASES, random.randint(1, 4)))}
+                for i in range(logs)
+            ])
+    return user_ids
+
+
+async def measure(client, user_ids, requests, paths):
+    global BENCH_USER
+    results = {}
+    for label, path in paths:
+        samples = []
+        for i in range(requests):
+            BENCH_USER = override_user(app, user_ids[i % len(user_ids)])
+            with Timer() as t:
+                response = await client.get(path)
+            response.raise_for_status()
+            samples.append(t.ms)
+        summarize(label, samples)
+    BENCH_USER = override_user(app, user_ids[0])
+    for label, path in paths:
+        results[label] = (await client.get(path)).json()
+    return results
+
+
+async def run(args):
+    tables = [User, UserProfile, Cycle, SymptomLog, UserCycleStats]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+
+    user_ids = seed(database, args.users, args.logs)
+    async with database.AsyncSessionLocal() as db:
+        await check_cycle_stats(db, fix=True)  # seeded rows bypass the API
+
+    days = f"days={args.days}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"untagged ({args.users} users x {args.logs} logs):")
+        before = await measure(client, user_ids, args.requests, [
+            ("/health/risk", "/api/v1/health/risk"),
+            ("tag counts, python", f"/bench/notes/symptom-tags?{days}"),
+        ])
+
+        async with database.AsyncSessionLocal() as db:
+            with Timer() as t:
+                tagged = await backfill_symptom_tags(db, batch_size=args.batch_size)
+        print(f"\nbackfill: {tagged} rows in {t.ms:.0f}ms ({tagged / t.ms * 1000:.0f} rows/s)\n")
+
+        print("tagged:")
+        after = await measure(client, user_ids, args.requests, [
+            ("/health/risk", "/api/v1/health/risk"),
+            ("tag counts, sql", f"/api/v1/stats/symptom-tags?{days}"),
+        ])
+
+    print(f"\nrisk reports identical: {before['/health/risk'] == after['/health/risk']}")
+    print(f"tag counts identical: {before['tag counts, python'] == after['tag counts, sql']}")
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logs", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,201 @@
+"""Round-trips and latency per symptom-log write, before and after.
+
+"before" are copies of the previous handlers (SELECT for the row, then
+INSERT/UPDATE/DELETE, commit and refresh) mounted under /bench/before.
+"after" are the current endpoints: one INSERT ... ON CONFLICT ...
+RETURNING, UPDATE ... RETURNING or DELETE ... RETURNING each, and a
+single multi-row upsert for a --batch days catch-up. Round-trips are the
+statements sent plus the COMMITs. Pass --database-url
+postgresql://... to run against Postgres instead of SQLite.
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+from uuid import UUID
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+)
+
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.symptoms import (
+    SymptomLogCreate,
+    SymptomLogResponse,
+    SymptomLogUpdate,
+)
+from app.core.database import get_async_db
+from app.main import app
+from app.models.models import SymptomLog, User
+
+
+# ---- previous handlers, verbatim apart from the user lookup ----
+
+@app.post("/bench/before/symptom-logs", response_model=SymptomLogResponse, status_code=201)
+async def before_create(log_data: SymptomLogCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await db.scalar(
+        select(SymptomLog.id).where(
+            SymptomLog.user_id == BENCH_USER.id,
+            SymptomLog.log_date == log_data.log_date,
+        )
+    )
+    if existing:
+        raise HTTPException(status_code=400, detail="A symptom log already exists for this date")
+    log = SymptomLog(user_id=BENCH_USER.id, log_date=log_data.log_date, notes=log_data.notes)
+    db.add(log)
+    await db.commit()
+    await db.refresh(log)
+    return log
+
+
+@app.put("/bench/before/symptom-logs/{log_id}", response_model=SymptomLogResponse)
+async def before_update(log_id: UUID, log_data: SymptomLogUpdate, db: AsyncSession = Depends(get_async_db)):
+    log = await db.scalar(
+        select(SymptomLog).where(SymptomLog.id == log_id, SymptomLog.user_id == BENCH_USER.id)
+    )
+    if not log:
+        raise HTTPException(status_code=404, detail="Symptom log not found")
+    for field, value in log_data.model_dump(exclude_unset=True).items():
+        setattr(log, field, value)
+    await db.commit()
+    await db.refresh(log)
+    return log
+
+
+@app.delete("/bench/before/symptom-logs/{log_id}")
+async def before_delete(log_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    log = await db.scalar(
+        select(SymptomLog).where(SymptomLog.id == log_id, SymptomLog.user_id == BENCH_USER.id)
+    )
+    if not log:
+        raise HTTPException(status_code=404, detail="Symptom log not found")
+    await db.delete(log)
+    await db.commit()
+    return {"message": "Symptom log deleted successfully"}
+
+
+class RoundTrips:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._bump)
+        event.listen(engine, "commit", self._bump)
+
+    def _bump(self, *args):
+        self.count += 1
+
+
+async def measure(client, trips, requests):
+    """(round-trips per call, p50 ms) over `requests` calls from make()"""
+    samples = []
+    total = 0
+    for make in requests:
+        trips.count = 0
+        with Timer() as t:
+            response = await make(client)
+        response.raise_for_status()
+        total += trips.count
+        samples.append(t.ms)
+    samples.sort()
+    return total / len(requests), samples[len(samples) // 2]
+
+
+async def run(args):
+    global BENCH_USER
+
+    tables = [User, SymptomLog]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+    BENCH_USER = override_user(app)
+    trips = RoundTrips(database.async_engine.sync_engine)
+
+    start = date(2000, 1, 1)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        print(f"{'operation':<26} {'before':>16} {'after':>16}")
+        for label, before, after in operations(args, start):
+            before_trips, before_ms = await measure(client, trips, before)
+            after_trips, after_ms = await measure(client, trips, after)
+            print(
+                f"{label:<26} {before_trips:5.1f} trips {before_ms:5.2f}ms"
+                f" {after_trips:5.1f} trips {after_ms:5.2f}ms"
+            )
+
+    await database.async_engine.dispose()
+
+
+def operations(args, start):
+    n = args.requests
+    created = {"before": [], "after": []}
+
+    def create(kind, offset):
+        path = "/bench/before/symptom-logs" if kind == "before" else "/api/v1/symptom-logs"
+
+        async def make(client):
+            day = start + timedelta(days=offset)
+            response = await client.post(path, json={"log_date": day.isoformat(), "notes": "cramps"})
+            created[kind].append(response.json()["id"])
+            return response
+
+        return make
+
+    def update(kind, i):
+        base = "/bench/before/symptom-logs" if kind == "before" else "/api/v1/symptom-logs"
+        return lambda client: client.put(f"{base}/{created[kind][i]}", json={"notes": "edited"})
+
+    def delete(kind, i):
+        base = "/bench/before/symptom-logs" if kind == "before" else "/api/v1/symptom-logs"
+        return lambda client: client.delete(f"{base}/{created[kind][i]}")
+
+    def catch_up_before():
+        async def make(client):
+            days = [start + timedelta(days=10 * n + d) for d in range(args.batch)]
+            for day in days:
+                response = await client.post(
+                    "/bench/before/symptom-logs", json={"log_date": day.isoformat(), "notes": "catch-up"}
+                )
+            return response
+
+        return make
+
+    def catch_up_after():
+        async def make(client):
+            days = [start + timedelta(days=20 * n + d) for d in range(args.batch)]
+            return await client.post(
+                "/api/v1/symptom-logs/batch",
+                json={"logs": [{"log_date": d.isoformat(), "notes": "catch-up"} for d in days]},
+            )
+
+        return make
+
+    yield (
+        "create",
+        [create("before", i) for i in range(n)],
+        [create("after", n + i) for i in range(n)],
+    )
+    yield ("update", [update("before", i) for i in range(n)], [update("after", i) for i in range(n)])
+    yield ("delete", [delete("before", i) for i in range(n)], [delete("after", i) for i in range(n)])
+    yield (
+        f"catch-up of {args.batch} days",
+        [catch_up_before()],
+        [catch_up_after()],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=30)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""Throughput of the sync and async database stacks side by side.
+
+GET /symptom-logs (async, AsyncSession) is compared with a copy of the
+previous sync handler (def + Session on the threadpool) mounted at
+/bench/sync/symptom-logs, both reading the same seeded rows. Pass
+--database-url postgresql://... to run against Postgres instead of SQLite.
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from benchmarks._support import (
+    Timer,
+    database_from_url,
+    override_db,
+    override_user,
+    sqlite_database,
+)
+
+import httpx
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.symptoms import SymptomLogResponse
+from app.core.database import get_db
+from app.main import app
+from app.models.models import SymptomLog, User
+
+
+@app.get("/bench/sync/symptom-logs", response_model=list[SymptomLogResponse])
+def sync_symptom_logs(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+    return (
+        db.query(SymptomLog)
+        .filter(SymptomLog.user_id == BENCH_USER.id)
+        .order_by(SymptomLog.log_date.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+async def measure(client, path, requests, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    with Timer() as t:
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (t.ms / 1000)
+
+
+async def run(args):
+    global BENCH_USER
+
+    tables = [User, SymptomLog]
+    if args.database_url:
+        database = database_from_url(args.database_url, tables)
+    else:
+        database = sqlite_database(tables)
+    override_db(app, database)
+    BENCH_USER = override_user(app)
+
+    with database.SessionLocal() as db:
+        start = date(2015, 1, 1)
+        db.add_all(
+            SymptomLog(
+                user_id=BENCH_USER.id,
+                log_date=start + timedelta(days=i),
+                notes="cramps and fatigue",
+            )
+            for i in range(args.rows)
+        )
+        db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        print(f"{'concurrency':>11} {'sync req/s':>11} {'async req/s':>12}")
+        for concurrency in args.levels:
+            sync_rps = await measure(
+                client, "/bench/sync/symptom-logs", args.requests, concurrency
+            )
+            async_rps = await measure(
+                client, "/api/v1/symptom-logs", args.requests, concurrency
+            )
+            print(f"{concurrency:>11} {sync_rps:>11.1f} {async_rps:>12.1f}")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args()))
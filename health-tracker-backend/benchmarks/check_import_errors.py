@@ -0,0 +1,117 @@
+"""Assert that damaged import files come back as row errors, not a 500.
+
+Each case below is read with read_rows and must give exactly the rows and
+per-line errors listed. Then the NDJSON case with a non-UTF-8 line and a NUL
+is posted to /import/symptom-logs with IMPORT_BATCH_SIZE=2, and the check
+is that the response is a 200 and every good row is stored, including
+those after the bad line. The script exits non-zero on any difference.
+
+    python -m benchmarks.check_import_errors
+"""
+import asyncio
+import io
+import sys
+
+from benchmarks._support import override_db, override_user, sqlite_database
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.main import app
+from app.models.models import Cycle, SymptomLog, User, UserCycleStats
+from app.services.importer import read_rows
+
+NDJSON = (
+    b'{"log_date": "2026-01-01", "notes": "cramps"}\n'
+    b'{"log_date": "2026-01-02", "notes": "caf\xe9"}\n'  # Latin-1, not UTF-8
+    b'{"log_date": "2026-01-03", "notes": "acne\\u0000"}\n'
+    b'{"log_date": "2026-01-04", "notes": "fatigue"}\n'
+    b'{"log_date": "2026-01-05", "notes": "bloating"}\n'
+)
+
+# (name, format, file, [(line, row or error)] it must give, in order)
+CASES = [
+    (
+        "utf-8 bom and quoted newline",
+        "csv",
+        b'\xef\xbb\xbflog_date,notes\n2026-01-01,"cramps\nfatigue"\n2026-01-02,\n',
+        [(3, {"log_date": "2026-01-01", "notes": "cramps\nfatigue"}), (4, {"log_date": "2026-01-02"})],
+    ),
+    (
+        "non-utf-8 and nul lines",
+        "csv",
+        b"log_date,notes\n2026-01-01,caf\xe9\n2026-01-02,a\x00b\n2026-01-03,ok\n",
+        [
+            (2, "not valid UTF-8 (byte 15)"),
+            (3, "contains a NUL byte"),
+            (4, {"log_date": "2026-01-03", "notes": "ok"}),
+        ],
+    ),
+    (
+        "text after a closing quote",
+        "csv",
+        b'log_date,notes\n2026-01-01,"cramps"x\n2026-01-02,ok\n',
+        [(2, "malformed CSV: ',' expected after '\"'"), (3, {"log_date": "2026-01-02", "notes": "ok"})],
+    ),
+    (
+        "unclosed quote",
+        "csv",
+        b'log_date,notes\n2026-01-01,ok\n2026-01-02,"cramps\n2026-01-03,lost\n',
+        [(2, {"log_date": "2026-01-01", "notes": "ok"}), (3, "malformed CSV: unexpected end of data")],
+    ),
+    (
+        "ndjson",
+        "ndjson",
+        NDJSON,
+        [
+            (1, {"log_date": "2026-01-01", "notes": "cramps"}),
+            (2, "not valid UTF-8 (byte 41)"),
+            (3, "contains a NUL character"),
+            (4, {"log_date": "2026-01-04", "notes": "fatigue"}),
+            (5, {"log_date": "2026-01-05", "notes": "bloating"}),
+        ],
+    ),
+]
+
+
+def check_read_rows() -> int:
+    failures = 0
+    for name, fmt, data, expected in CASES:
+        got = [
+            (line_no, row.get("__error__", row))
+            for line_no, row in read_rows(io.BytesIO(data), fmt)
+        ]
+        ok = got == expected
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<4} {name}" + ("" if ok else f": got {got}, want {expected}"))
+    return failures
+
+
+async def check_endpoint() -> int:
+    database = sqlite_database([User, Cycle, SymptomLog, UserCycleStats])
+    override_db(app, database)
+    user = override_user(app)
+    settings.IMPORT_BATCH_SIZE = 2  # the bad lines land in the second batch
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        response = await client.post("/api/v1/import/symptom-logs?format=ndjson", content=NDJSON)
+    async with database.AsyncSessionLocal() as db:
+        stored = await db.scalar(select(func.count()).select_from(SymptomLog).where(SymptomLog.user_id == user.id))
+    await database.async_engine.dispose()
+
+    report = response.json() if response.status_code == 200 else {}
+    ok = response.status_code == 200 and report["inserted"] == stored == 3 and report["failed"] == 2
+    print(f"{'ok' if ok else 'FAIL':<4} POST /import/symptom-logs: {response.status_code}, {stored} stored, {report}")
+    return not ok
+
+
+def main() -> int:
+    failures = check_read_rows()
+    failures += asyncio.run(check_endpoint())
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Assert what the keyword matcher finds in a set of sample notes.
+
+Each note below is matched with KEYWORD_MATCHER, the matcher behind
+symptom_logs.tags and the risk scorers. The script prints every case and
+exits non-zero when the keywords found differ from the expected ones.
+Add a case here whenever KEYWORDS or SYNONYMS change, then re-run
+backfill_symptom_tags.py --retag so stored tags follow.
+
+    python -m benchmarks.check_keyword_matcher
+"""
+import sys
+
+import benchmarks._support  # noqa: F401  sets the env Settings() needs
+
+from app.services.risk_engine import KEYWORD_MATCHER
+
+# (note, keywords it must produce, exactly)
+CASES = [
+    ("acne and fatigue", {"acne", "fatigue"}),
+    ("pimples on my chin", {"acne"}),
+    ("hairfall again", {"hair fall"}),
+    ("gained weight, moody", {"weight gain", "weight", "mood swings", "mood"}),
+    ("skipped period this month", {"missed period"}),
+    ("missed my period", {"missed period"}),
+    # "period" next to "no"/"late" is not a missed period
+    ("no period pain today", set()),
+    ("late period cramps", set()),
+    ("period came late", set()),
+    ("sweetweight", set()),
+]
+
+
+def main() -> int:
+    failures = 0
+    for note, expected in CASES:
+        found = set(KEYWORD_MATCHER.match(note))
+        ok = found == expected
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<4} {note!r}" + ("" if ok else f": got {sorted(found)}, want {sorted(expected)}"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Assert that each read endpoint stays within its declared query budget.
+
+Every endpoint below is called once for a seeded user, with a real bearer
+token and the auth cache off, so get_current_user's lookup is counted
+too. query_budget fails the call when it runs more statements than
+declared and lists them; the script exits non-zero when any endpoint is
+over budget. Statements repeated within one request (likely N+1) are
+reported as well.
+
+    python -m benchmarks.check_query_budgets
+    python -m benchmarks.check_query_budgets --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+
+from benchmarks._support import database_from_url, override_db, sqlite_database
+
+import httpx
+
+from app.core.auth_cache import user_cache
+from app.core.config import settings
+from app.core.db_metrics import query_budget
+from app.core.security import create_access_token
+from app.crud.crud_cycle_stats import check_cycle_stats
+from app.main import app
+from app.models.models import AIInsight, Cycle, SymptomLog, User, UserCycleStats, UserProfile
+
+# (path, statements including the auth lookup)
+BUDGETS = [
+    ("/api/v1/users/me", 1),
+    ("/api/v1/cycles/", 2),
+    ("/api/v1/cycles/forecast", 2),
+    ("/api/v1/cycles/calendar?from=2026-01-01&to=2026-12-31", 3),
+    ("/api/v1/symptom-logs", 2),
+    ("/api/v1/symptom-logs/today", 2),
+    ("/api/v1/symptom-logs/search?q=acne", 2),
+    ("/api/v1/health/hormonal-risk", 2),
+    ("/api/v1/health/pcos-risk", 2),
+    ("/api/v1/health/risk", 2),
+    ("/api/v1/stats/average-cycle", 2),
+    ("/api/v1/stats/last-cycle", 2),
+    ("/api/v1/stats/symptoms-summary", 2),
+    ("/api/v1/stats/summary", 2),
+    ("/api/v1/stats/rolling-average", 2),
+    ("/api/v1/stats/symptom-tags", 3),
+    ("/api/v1/ai/predict-cycle", 2),
+    ("/api/v1/ai/insights", 2),
+    ("/api/v1/dashboard", 3),
+]
+
+
+def seed(database):
+    today = date.today()
+    with database.SessionLocal() as db:
+        user = User(email=f"budget-{time.time_ns()}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            Cycle(user_id=user.id, last_period_date=today - timedelta(days=29 * i), cycle_length=29, period_length=5)
+            for i in range(24)
+        )
+        db.add_all(
+            SymptomLog(user_id=user.id, log_date=today - timedelta(days=i), notes="acne and fatigue", tags=["acne", "fatigue"])
+            for i in range(60)
+        )
+        db.commit()
+        return user.id
+
+
+async def run(database_url):
+    tables = [User, UserProfile, Cycle, SymptomLog, AIInsight, UserCycleStats]
+    database = database_from_url(database_url, tables) if database_url else sqlite_database(tables)
+    override_db(app, database)
+    user_cache.enabled = False
+
+    user_id = seed(database)
+    async with database.AsyncSessionLocal() as db:
+        await check_cycle_stats(db, fix=True)  # seeded rows bypass the API
+    headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check", headers=headers) as client:
+        for path, budget in BUDGETS:
+            problem = None
+            try:
+                with query_budget(budget) as stats:
+                    response = await client.get(path)
+                response.raise_for_status()
+            except AssertionError as e:
+                problem = str(e)
+            repeated = stats.repeated(settings.DB_REPEATED_QUERY_THRESHOLD)
+            if repeated:
+                problem = (problem or "") + "".join(f"\n  repeated {n}x: {s[:120]}" for s, n in repeated)
+
+            print(f"{'FAIL' if problem else 'ok':<4} {stats.count}/{budget} {path}")
+            if problem:
+                print("       " + problem.replace("\n", "\n       "))
+            failures += bool(problem)
+
+    await database.async_engine.dispose()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default="")
+    asyncio.run(run(parser.parse_args().database_url))
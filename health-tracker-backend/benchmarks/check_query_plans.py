@@ -0,0 +1,172 @@
+"""Assert that the per-user listing queries are answered from an index.
+
+Each query shape below mirrors a query the API runs. Its plan is fetched
+with EXPLAIN and the script exits non-zero when the table is read by a
+full scan, or (on Postgres) when the expected index is not in the plan.
+Postgres plans are taken with enable_seqscan off, so a small table still
+shows whether the index can serve the query at all.
+
+    python -m benchmarks.check_query_plans
+    python -m benchmarks.check_query_plans --database-url postgresql://...
+"""
+import argparse
+import sys
+from datetime import date, datetime, timezone
+from uuid import UUID, uuid4
+
+from benchmarks._support import database_from_url, sqlite_database
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.pagination import date_range, paginate, encode_cursor
+from app.models.models import AIInsight, Cycle, SymptomLog, User
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain)
+def _explain(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+def query_shapes(user_id):
+    """(label, table, expected index, statement) per access path"""
+    return [
+        (
+            "cycles newest first",
+            "cycles",
+            "ix_cycles_user_last_period",
+            paginate(
+                select(Cycle).where(Cycle.user_id == user_id),
+                (Cycle.last_period_date, Cycle.id),
+                (date.fromisoformat, UUID),
+                cursor=None,
+                skip=0,
+                limit=50,
+            ),
+        ),
+        (
+            "cycles in date range",
+            "cycles",
+            "ix_cycles_user_last_period",
+            paginate(
+                select(Cycle).where(
+                    Cycle.user_id == user_id,
+                    *date_range(Cycle.last_period_date, date(2024, 1, 1), date(2024, 12, 31)),
+                ),
+                (Cycle.last_period_date, Cycle.id),
+                (date.fromisoformat, UUID),
+                cursor=None,
+                skip=0,
+                limit=50,
+            ),
+        ),
+        (
+            "symptom logs since date",
+            "symptom_logs",
+            "unique_user_log_date",
+            select(SymptomLog)
+            .where(SymptomLog.user_id == user_id, SymptomLog.log_date >= date(2024, 1, 1))
+            .order_by(SymptomLog.log_date.desc()),
+        ),
+        (
+            "symptom logs cursor page",
+            "symptom_logs",
+            "unique_user_log_date",
+            paginate(
+                select(SymptomLog).where(SymptomLog.user_id == user_id),
+                (SymptomLog.log_date, SymptomLog.id),
+                (date.fromisoformat, UUID),
+                cursor=encode_cursor(date(2024, 1, 1), uuid4()),
+                skip=0,
+                limit=20,
+            ),
+        ),
+        (
+            "symptom logs in date range",
+            "symptom_logs",
+            "unique_user_log_date",
+            paginate(
+                select(SymptomLog).where(
+                    SymptomLog.user_id == user_id,
+                    *date_range(SymptomLog.log_date, date(2024, 3, 1), date(2024, 3, 31)),
+                ),
+                (SymptomLog.log_date, SymptomLog.id),
+                (date.fromisoformat, UUID),
+                cursor=None,
+                skip=0,
+                limit=20,
+            ),
+        ),
+        (
+            "insights cursor page",
+            "ai_insights",
+            "ix_ai_insights_user_created",
+            paginate(
+                select(AIInsight).where(AIInsight.user_id == user_id),
+                (AIInsight.created_at, AIInsight.id),
+                (datetime.fromisoformat, UUID),
+                cursor=encode_cursor(datetime(2024, 1, 1, tzinfo=timezone.utc), uuid4()),
+                skip=0,
+                limit=20,
+            ),
+        ),
+    ]
+
+
+def plan_lines(conn, statement):
+    # Read the DBAPI cursor directly: the result processors belong to the
+    # wrapped SELECT's columns, not to the plan rows
+    rows = conn.execute(Explain(statement)).cursor.fetchall()
+    return [row[-1] for row in rows]
+
+
+def check_plan(dialect, table, index, lines):
+    """None when the plan uses an index for `table`, else the reason"""
+    plan = "\n".join(lines)
+    if dialect == "sqlite":
+        # SEARCH ... USING INDEX is an index lookup, SCAN <table> a full scan
+        if f"SCAN {table}" in plan and "INDEX" not in plan:
+            return "full table scan"
+        return None if "USING" in plan and "INDEX" in plan else "no index in plan"
+    if f"Seq Scan on {table}" in plan:
+        return "sequential scan"
+    return None if index in plan else f"{index} not used"
+
+
+def run(database_url):
+    tables = [User, Cycle, SymptomLog, AIInsight]
+    database = database_from_url(database_url, tables) if database_url else sqlite_database(tables)
+    dialect = database.engine.dialect.name
+
+    failures = 0
+    with database.engine.connect() as conn:
+        if dialect == "postgresql":
+            conn.execute(text("SET enable_seqscan = off"))
+        for label, table, index, statement in query_shapes(uuid4()):
+            lines = plan_lines(conn, statement)
+            problem = check_plan(dialect, table, index, lines)
+            print(f"{'FAIL' if problem else 'ok':<4} {label}" + (f": {problem}" if problem else ""))
+            for line in lines:
+                print(f"       {line}")
+            failures += bool(problem)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default="")
+    run(parser.parse_args().database_url)
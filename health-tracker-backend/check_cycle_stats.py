@@ -0,0 +1,37 @@
+"""Rebuild user_cycle_stats from the cycles table and report any drift.
+
+    python check_cycle_stats.py          # report only, exit 1 on drift
+    python check_cycle_stats.py --fix    # also rewrite the wrong rows
+
+Safe to run against a live database; run it after restoring a backup or
+editing cycles by hand.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.database import AsyncSessionLocal, dispose_engines
+from app.crud.crud_cycle_stats import check_cycle_stats
+
+
+async def main(args) -> int:
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await check_cycle_stats(db, fix=args.fix)
+    finally:
+        await dispose_engines()
+
+    drift = report["missing"] + report["mismatched"] + report["orphaned"]
+    report["users"] = report["users"][: args.show]
+    print(json.dumps(report, indent=2))
+    if drift and args.fix:
+        print(f"✅ Rewrote stats for {drift} users")
+    return 1 if drift and not args.fix else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="rewrite missing or wrong rows")
+    parser.add_argument("--show", type=int, default=20, help="user ids to list (default: 20)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
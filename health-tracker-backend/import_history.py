@@ -0,0 +1,58 @@
+"""Import a CSV or NDJSON export into a user's cycles or symptom logs.
+
+    python import_history.py user@example.com symptom-logs history.csv
+    python import_history.py user@example.com cycles cycles.ndjson --overwrite
+
+Uses the same importer as POST /api/v1/import/{kind}.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal, dispose_engines
+from app.crud import user as user_crud
+from app.services.ai_cache import ai_cache
+from app.services.calendar_cache import calendar_cache
+from app.services.importer import IMPORTERS, import_rows
+
+
+async def main(args) -> int:
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await user_crud.get_user_by_email(db, args.email)
+            if not user:
+                print(f"❌ No user with email {args.email}", file=sys.stderr)
+                return 1
+            with open(args.path, "rb") as f:
+                report = await import_rows(
+                    db,
+                    user_id=user.id,
+                    kind=args.kind,
+                    stream=f,
+                    fmt=fmt,
+                    overwrite=args.overwrite,
+                )
+            ai_cache.invalidate_user(user.id)
+            calendar_cache.invalidate_user(user.id)
+    finally:
+        await dispose_engines()
+
+    print(report.model_dump_json(indent=2))
+    if not calendar_cache.shared:
+        print(
+            "⚠️  CALENDAR_CACHE_URL is not set, so the API workers' cached calendar months "
+            f"were not cleared; imported days show up within {calendar_cache.ttl}s",
+            file=sys.stderr,
+        )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("email")
+    parser.add_argument("kind", choices=sorted(IMPORTERS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--overwrite", action="store_true", help="replace days that already exist")
+    sys.exit(asyncio.run(main(parser.parse_args())))
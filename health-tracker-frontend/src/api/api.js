@@ -59,6 +59,14 @@ export const symptomAPI = {
   getAll: (skip = 0, limit = 20) =>
     api.get(`/symptom-logs?skip=${skip}&limit=${limit}`),
 
+  // ✅ Cursor paging: pass back nextCursor until it is null
+  getPage: async (cursor = null, limit = 20) => {
+    const params = new URLSearchParams({ limit });
+    if (cursor) params.set("cursor", cursor);
+    const res = await api.get(`/symptom-logs?${params}`);
+    return { items: res.data, nextCursor: res.headers["x-next-cursor"] ?? null };
+  },
+
   create: (data) => api.post("/symptom-logs", data),
 
   update: (id, data) => api.put(`/symptom-logs/${id}`, data),
@@ -70,10 +78,48 @@ export const symptomAPI = {
 
 
 /* ================= AI ================= */
+// ✅ Read a Server-Sent Events response, calling onChunk for each text piece
+const streamAI = async (path, body, onChunk) => {
+  const res = await fetch(`${API_BASE_URL}${path}?stream=true`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Authorization: `Bearer ${localStorage.getItem("access_token")}`,
+    },
+    body: JSON.stringify(body),
+  });
+  if (!res.ok) throw new Error(`AI request failed (${res.status})`);
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+
+    const events = buffer.split("\n\n");
+    buffer = events.pop();
+    for (const event of events) {
+      const lines = event.split("\n");
+      const type = lines.find((l) => l.startsWith("event: "))?.slice(7);
+      const data = lines.find((l) => l.startsWith("data: "))?.slice(6);
+      if (type === "error") throw new Error(JSON.parse(data));
+      if (type === "done") return;
+      if (data) onChunk(JSON.parse(data));
+    }
+  }
+};
+
 export const aiAPI = {
   analyze: (days = 30, type = "comprehensive") =>
     api.post("/ai/analyze", { days, analysis_type: type }),
   ask: (question) => api.post("/ai/ask", { question }),
+  analyzeStream: (onChunk, days = 30, type = "comprehensive") =>
+    streamAI("/ai/analyze", { days, analysis_type: type }, onChunk),
+  askStream: (question, onChunk) =>
+    streamAI("/ai/ask", { question }, onChunk),
   predictCycle: () => api.get("/ai/predict-cycle"),
 };
 
@@ -82,4 +128,10 @@ export const healthAPI = {
   getHormonalRisk: () => api.get("/health/hormonal-risk"),
 };
 
+/* ================= DASHBOARD ================= */
+// ✅ Cycles, recent logs, today's log, risk and prediction in one request
+export const dashboardAPI = {
+  get: () => api.get("/dashboard"),
+};
+
 export default api;
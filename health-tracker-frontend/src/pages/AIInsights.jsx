@@ -24,9 +24,13 @@ function AIInsights() {
   const runAnalysis = async () => {
     setLoading(true);
     setError("");
+    setAnalysis("");
     try {
-      const res = await aiAPI.analyze(30, "comprehensive");
-      setAnalysis(res.data.insight);
+      await aiAPI.analyzeStream(
+        (chunk) => setAnalysis((prev) => prev + chunk),
+        30,
+        "comprehensive"
+      );
     } catch {
       setError("AI analysis failed");
     }
@@ -37,9 +41,11 @@ function AIInsights() {
     if (!question.trim()) return;
     setLoading(true);
     setError("");
+    setAnswer("");
     try {
-      const res = await aiAPI.ask(question);
-      setAnswer(res.data.answer);
+      await aiAPI.askStream(question, (chunk) =>
+        setAnswer((prev) => prev + chunk)
+      );
       setQuestion("");
     } catch {
       setError("AI could not answer");
@@ -145,7 +145,7 @@ import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import { useEffect, useState } from "react";
 
-import { cycleAPI, symptomAPI, aiAPI } from "../api/api";
+import { dashboardAPI, aiAPI } from "../api/api";
 
 function Dashboard() {
   const { user, logout } = useAuth();
@@ -163,13 +163,10 @@ function Dashboard() {
 
   const loadDashboardData = async () => {
     try {
-      // Symptoms count
-      const symRes = await symptomAPI.getAll();
-      setSymptomCount(symRes.data.length);
-
-      // Cycles count
-      const cycleRes = await cycleAPI.getAll();
-      setCycleCount(cycleRes.data.length);
+      // Symptom and cycle counts in one request
+      const dashRes = await dashboardAPI.get();
+      setSymptomCount(dashRes.data.symptom_log_count);
+      setCycleCount(dashRes.data.cycle_count);
 
       // AI insights (if available)
       try {